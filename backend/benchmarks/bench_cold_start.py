@@ -0,0 +1,101 @@
+"""
+Measure API cold start: import cost by package and time to the first healthy /api/health.
+
+The import report runs `python -X importtime -c "import main"` in a fresh interpreter and sums
+each package's self time, so the heaviest imports on the startup path stand out. The cold start
+runs then launch uvicorn repeatedly and time process spawn to the first 200 from /api/health
+(with provider warm-up running in the background, as in production).
+
+    cd backend && python benchmarks/bench_cold_start.py
+    cd backend && python benchmarks/bench_cold_start.py --runs 10 --top 20
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import httpx
+
+backend_dir = Path(__file__).resolve().parent.parent
+
+
+def import_report(module: str = "main") -> Tuple[float, Dict[str, float]]:
+    """Returns (total import seconds of module, self seconds summed per top-level package)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(backend_dir),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    per_package: Dict[str, float] = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+            self_s, cumulative_s = int(self_us) / 1e6, int(cumulative_us) / 1e6
+        except ValueError:
+            continue  # header line
+        package = name.split(".")[0]
+        per_package[package] = per_package.get(package, 0.0) + self_s
+        if name == module:
+            total = cumulative_s
+    return total, per_package
+
+
+def time_to_healthy(port: int, timeout: float = 60.0) -> float:
+    env = dict(os.environ, JOB_WORKERS="0")
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=str(backend_dir),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout:
+                if server.poll() is not None:
+                    raise RuntimeError(f"API server exited with code {server.returncode}")
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/api/health").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        raise RuntimeError(f"/api/health not healthy within {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="cold starts to time")
+    parser.add_argument("--top", type=int, default=12, help="packages to list in the import report")
+    parser.add_argument("--port", type=int, default=8902)
+    args = parser.parse_args()
+
+    total, per_package = import_report()
+    print(f"import main: {1000 * total:.0f} ms")
+    print(f"{'package':<28} {'self ms':>8}")
+    for package, seconds in sorted(per_package.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"{package:<28} {1000 * seconds:>8.1f}")
+
+    timings: List[float] = [time_to_healthy(args.port) for _ in range(max(1, args.runs))]
+    print(
+        f"\nCold start to first healthy /api/health over {len(timings)} runs: "
+        f"median {1000 * statistics.median(timings):.0f} ms, min {1000 * min(timings):.0f} ms, "
+        f"max {1000 * max(timings):.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measure how many model calls a single worker keeps in flight at once.
+
+Points every provider at the local mock (see mock_provider.py), fires N concurrent
+parse_with_model calls and reports wall time plus the mock's peak in-flight count.
+With native async clients the peak should approach min(N, provider concurrency limit)
+and wall time should stay close to a single call's latency per "wave".
+
+    cd backend && python benchmarks/bench_concurrency.py --requests 200 --latency-ms 500
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_provider import MockState, start_mock_server
+
+
+def _configure_env(port: int, concurrency: int) -> None:
+    base = f"http://127.0.0.1:{port}"
+    os.environ["OPENAI_API_KEY"] = "mock-key"
+    os.environ["OPENAI_BASE_URL"] = f"{base}/v1"
+    os.environ["HUGGINGFACE_API_KEY"] = "mock-key"
+    os.environ["HUGGINGFACE_BASE_URL"] = base
+    os.environ["GEMINI_API_KEY"] = "mock-key"
+    os.environ["GEMINI_API_BASE"] = base
+    os.environ["PARSE_CACHE_BACKEND"] = "none"
+    for provider in ("OPENAI", "HUGGINGFACE", "GEMINI"):
+        os.environ[f"PROVIDER_CONCURRENCY_{provider}"] = str(concurrency)
+
+
+async def _run(requests: int, model: str) -> float:
+    from parsers.resume_parser import parse_model_string, parse_with_model
+
+    # Per-call INFO logs would dominate the timing
+    logging.getLogger("uvicorn.error").setLevel(logging.WARNING)
+
+    text = (backend_dir.parent / "sample-resume.txt").read_text()
+    spec = parse_model_string(model)
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *[parse_with_model(text, spec, use_cache=False) for _ in range(requests)],
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - started
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        print(f"{len(failures)} calls failed, first error: {failures[0]}")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--concurrency", type=int, default=1000, help="per-provider concurrency limit")
+    parser.add_argument(
+        "--models",
+        default="openai:gpt-4o,huggingface:openai/gpt-oss-120b,gemini:gemini-3-pro-preview",
+        help="comma-separated model specs to benchmark one after another",
+    )
+    args = parser.parse_args()
+
+    _configure_env(args.port, args.concurrency)
+    state = MockState(latency_ms=args.latency_ms)
+    start_mock_server(state, args.port)
+
+    async def _run_all():
+        print(f"{'model':<45} {'requests':>8} {'wall_s':>8} {'req/s':>8} {'peak_in_flight':>15}")
+        for model in args.models.split(","):
+            state.reset()
+            elapsed = await _run(args.requests, model.strip())
+            print(
+                f"{model:<45} {args.requests:>8} {elapsed:>8.2f} {args.requests / elapsed:>8.1f} {state.peak_in_flight:>15}"
+            )
+
+    # One event loop for all runs: the async provider clients are bound to the loop that created them
+    asyncio.run(_run_all())
+
+
+if __name__ == "__main__":
+    main()
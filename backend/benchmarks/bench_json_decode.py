@@ -0,0 +1,260 @@
+"""
+Microbenchmark: CPU cost per parse result of decoding, validating and serializing model output.
+
+Model outputs are synthetic resume JSON documents of realistic size (about 20 KB by default:
+positions with achievements, projects, skills and certifications), half of them wrapped in
+```json fences and some with null or bare-item list fields, as models return them. Each stage is
+timed in CPU time (time.process_time) per result, before and after:
+
+- decode + validate: model output string to ResumeData. Before: json.loads, then validation.
+  After: json_codec.loads (orjson or pydantic-core), then validation. The decoded dict is kept
+  either way because it is returned as raw_response.
+- response: a ParseResponse holding the result to JSON bytes. Before: FastAPI's response_model
+  path (dump, re-validate, encode to JSON-able values, json.dumps). After: one model_dump_json.
+- cache hit: a stored result back to a ParsedModelResult. Before: json.loads and
+  ParsedModelResult(**dict). After: ParsedModelResult.model_validate_json.
+
+Old and new response bodies are checked to decode to the same JSON.
+
+A second table covers malformed output: the same documents behind a <think> block, followed by
+commentary, and cut off at 70% (a max_tokens stop). It compares the previous Hugging Face recovery
+(decoder retries on think-stripped text, a brace slice and a greedy regex) with
+parsers/json_recovery.py. For each it gives CPU time and how many outputs were recovered, in full
+or as a partial object, into a ResumeData that passes validation.
+
+    cd backend && python benchmarks/bench_json_decode.py
+    cd backend && python benchmarks/bench_json_decode.py --size-kb 40 --documents 50 --repeat 100
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from models.resume_models import ModelProvider, ParsedModelResult, ParseResponse, TokenUsage
+from parsers.json_recovery import REPAIRED, recover_json_object, strip_code_fences
+from parsers.resume_parser import _json_to_resume
+from resume_corpus import ACHIEVEMENTS, CITIES, COMPANIES, DEGREES, FIRST_NAMES, LAST_NAMES, SKILLS, TITLES
+from services import json_codec
+
+RESPONSE_FIELD = create_response_field(name="Response", type_=ParseResponse, mode="serialization")
+
+
+def generate_model_output(rng: random.Random, size_kb: float) -> str:
+    """A resume as a model returns it: JSON of about size_kb kilobytes, sometimes in code fences."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    document: Dict[str, Any] = {
+        "contact_info": {
+            "name": name,
+            "phone": f"+1{rng.randint(2000000000, 9899999999)}",
+            "email": f"{name.lower().replace(' ', '.')}@example.com",
+            "city": rng.choice(CITIES),
+        },
+        "total_experience_years": None,
+        "total_experience_months": None,
+        "summary": "Backend engineer designing scalable distributed systems and leading platform teams.",
+        "objective": None,
+        "education": [
+            {"degree": degree, "field_of_study": None, "institution": school, "graduation_year": rng.randint(2000, 2015)}
+            for degree, school in rng.sample(DEGREES, 2)
+        ],
+        "experience": [],
+        "skills": [{"name": skill, "category": "Technical", "proficiency": "Expert"} for skill in SKILLS],
+        "certifications": [{"name": "AWS Solutions Architect Professional", "issuer": "Amazon Web Services"}],
+        "awards": {"title": f"{rng.choice(COMPANIES)} Innovation Award", "date": str(rng.randint(2015, 2024))},
+        "projects": [],
+        "patents": None,
+        "languages": ["English", "Spanish"],
+        "references": "Available upon request",
+    }
+    end_year = 2024
+    while len(json.dumps(document, indent=2)) < size_kb * 1024:
+        start_year = end_year - rng.randint(1, 4)
+        document["experience"].append(
+            {
+                "company": rng.choice(COMPANIES),
+                "position": rng.choice(TITLES),
+                "start_date": f"{start_year}-0{rng.randint(1, 9)}",
+                "end_date": f"{end_year}-0{rng.randint(1, 9)}",
+                "is_current": not document["experience"],
+                "summary": "Owned core services of the platform team and their reliability targets.",
+                "achievements": [template.format(n=rng.randint(3, 60)) for template in rng.sample(ACHIEVEMENTS, 4)],
+            }
+        )
+        document["projects"].append(
+            {
+                "name": f"Project {len(document['projects']) + 1}",
+                "description": "Internal platform component adopted by several product teams.",
+                "technologies": rng.sample(SKILLS, 4),
+            }
+        )
+        end_year = start_year
+    content = json.dumps(document, indent=2)
+    return f"```json\n{content}\n```" if rng.random() < 0.5 else content
+
+
+def _previous_recovery(content: str) -> Dict[str, Any]:
+    """JSON recovery as the Hugging Face path did it before parsers/json_recovery.py."""
+    content = strip_code_fences(content)
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        pass
+    content_no_think = re.sub(r"<think>.*?</think>", "", content, flags=re.DOTALL).strip()
+    if content_no_think != content:
+        try:
+            return json.loads(content_no_think)
+        except json.JSONDecodeError:
+            content = content_no_think
+    first, last = content.find("{"), content.rfind("}")
+    if first != -1 and last > first:
+        try:
+            return json.loads(content[first : last + 1])
+        except json.JSONDecodeError:
+            pass
+    match = re.search(r"\{.*\}", content, re.DOTALL)
+    if match:
+        return json.loads(match.group(0))
+    raise ValueError("no JSON")
+
+
+def _recovery_outcomes(recover: Callable[[str], Any], outputs: List[str]) -> str:
+    """How many outputs became a ResumeData that passes validation; a dict that fails it still fails the call."""
+    recovered = partial = 0
+    for content in outputs:
+        try:
+            result = recover(content)
+            _json_to_resume(result[0] if isinstance(result, tuple) else result)
+        except ValueError:  # includes ValidationError
+            continue
+        recovered += 1
+        partial += isinstance(result, tuple) and result[1] == REPAIRED
+    return f"{recovered}/{len(outputs)}" + (f" ({partial} partial)" if partial else "")
+
+
+def _fastapi_response_body(response: ParseResponse) -> bytes:
+    """What FastAPI does with a model returned from a route that declares response_model."""
+    coroutine = serialize_response(field=RESPONSE_FIELD, response_content=response, is_coroutine=True)
+    try:
+        coroutine.send(None)  # never suspends with is_coroutine=True
+    except StopIteration as stop:
+        return JSONResponse(stop.value).body
+    raise RuntimeError("serialize_response suspended")
+
+
+def _result_for(content: str) -> ParsedModelResult:
+    parsed_json = json_codec.loads(strip_code_fences(content))
+    resume = _json_to_resume(parsed_json)
+    return ParsedModelResult(
+        provider=ModelProvider.OPENAI,
+        model_name="gpt-4o",
+        resume=resume,
+        confidence=resume.confidence_score,
+        latency_ms=1200,
+        api_latency_ms=1150,
+        cost_usd=0.0123,
+        usage=TokenUsage(prompt_tokens=3000, completion_tokens=5000),
+        raw_response=parsed_json,
+    )
+
+
+def _cpu_per_call(function: Callable[[Any], Any], inputs: List[Any], repeat: int) -> float:
+    """Mean CPU seconds per call over repeat passes of inputs."""
+    started = time.process_time()
+    for _ in range(repeat):
+        for item in inputs:
+            function(item)
+    return (time.process_time() - started) / (repeat * len(inputs))
+
+
+def _swallow(recover: Callable[[str], Any], content: str) -> Any:
+    try:
+        return recover(content)
+    except ValueError:
+        return None
+
+
+def _print_row(label: str, before_s: float, after_s: float) -> None:
+    print(f"{label:<20} {1e6 * before_s:>10.1f} {1e6 * after_s:>10.1f} {before_s / after_s:>7.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-kb", type=float, default=20, help="approximate size of each model output")
+    parser.add_argument("--documents", type=int, default=20, help="distinct model outputs")
+    parser.add_argument("--repeat", type=int, default=50, help="passes over the documents per stage")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    outputs = [generate_model_output(rng, args.size_kb) for _ in range(max(1, args.documents))]
+    responses = [ParseResponse(results=[_result_for(content)], extraction_ms=12) for content in outputs]
+    stored = [response.results[0].model_dump_json() for response in responses]
+
+    for response in responses:
+        if json.loads(_fastapi_response_body(response)) != json.loads(response.model_dump_json()):
+            raise SystemExit("model_dump_json and FastAPI serialization disagree")
+
+    body_kb = sum(len(response.model_dump_json()) for response in responses) / len(responses) / 1024
+    output_kb = sum(len(content) for content in outputs) / len(outputs) / 1024
+    print(
+        f"{len(outputs)} model outputs, {output_kb:.1f} KB each on average ({body_kb:.1f} KB response body); "
+        f"decoder: {'orjson' if json_codec.ORJSON_AVAILABLE else 'pydantic-core'}"
+    )
+
+    stages = [
+        (
+            "decode + validate",
+            outputs,
+            lambda content: _json_to_resume(json.loads(strip_code_fences(content))),
+            lambda content: _json_to_resume(json_codec.loads(strip_code_fences(content))),
+        ),
+        ("response", responses, _fastapi_response_body, lambda response: response.model_dump_json()),
+        (
+            "cache hit",
+            stored,
+            lambda value: ParsedModelResult(**json.loads(value)),
+            ParsedModelResult.model_validate_json,
+        ),
+    ]
+    print(f"\n{'stage':<20} {'before us':>10} {'after us':>10} {'speedup':>8}")
+    timings: Dict[str, Tuple[float, float]] = {}
+    for label, inputs, before, after in stages:
+        timings[label] = (_cpu_per_call(before, inputs, args.repeat), _cpu_per_call(after, inputs, args.repeat))
+        _print_row(label, *timings[label])
+    # A fresh result is decoded, validated and serialized; a cache hit is restored and serialized
+    for label, stage in (("fresh result", "decode + validate"), ("cached result", "cache hit")):
+        _print_row(
+            label,
+            timings[stage][0] + timings["response"][0],
+            timings[stage][1] + timings["response"][1],
+        )
+
+    malformed = {
+        "think block": [f"<think>The user wants {{json}}.</think>\n{content}" for content in outputs],
+        "trailing prose": [f"{content}\n\nNote: dates are approximate {{see above}}." for content in outputs],
+        "cut off at 70%": [content[: int(len(content) * 0.7)] for content in outputs],
+    }
+    print(f"\n{'malformed output':<18} {'before us':>10} {'after us':>10}  {'recovered before':<18} recovered after")
+    for label, inputs in malformed.items():
+        before_s = _cpu_per_call(lambda content: _swallow(_previous_recovery, content), inputs, args.repeat)
+        after_s = _cpu_per_call(lambda content: _swallow(recover_json_object, content), inputs, args.repeat)
+        print(
+            f"{label:<18} {1e6 * before_s:>10.1f} {1e6 * after_s:>10.1f}  "
+            f"{_recovery_outcomes(_previous_recovery, inputs):<18} {_recovery_outcomes(recover_json_object, inputs)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
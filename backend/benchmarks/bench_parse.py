@@ -0,0 +1,421 @@
+"""
+End-to-end /api/parse benchmark, fully offline.
+
+Starts the local mock provider (see mock_provider.py) in-process, launches the API with
+uvicorn in a subprocess pointed at the mock, and uploads a generated corpus of .txt/.docx/.pdf
+resumes (see resume_corpus.py) at a fixed client concurrency. The whole request path runs:
+upload, pooled extraction, normalization, rate limiting, model call, validation and
+response serialization.
+
+Reports:
+- throughput (requests/sec) and client-side latency p50/p95/p99, by status code
+- memory high-water mark (VmHWM) of the API process and its extraction workers
+- CPU seconds of the API process and of the extraction workers
+- where request time went: extraction, validation and model wait (API latency plus
+  rate-limiter queueing), summed from the API's own /metrics histograms
+- injected faults: 500s, 429s and cut-off (max_tokens) answers served by the mock, and parses
+  answered by the rule-based fallback
+- estimated model cost per request and, with cascade=true in --response-options, which tier
+  answered and the cost saved against running only --models
+- response bytes on the wire per request (after Content-Encoding) and decoded, for the run's
+  --accept-encoding and --response-options, then for a few files under each response option
+  (include_raw=false, exclude_none, fields=resume) and encoding (identity, gzip, br)
+
+Linux only for the memory/CPU figures (read from /proc); they print as n/a elsewhere.
+
+    cd backend && python benchmarks/bench_parse.py --requests 300 --concurrency 32
+    cd backend && python benchmarks/bench_parse.py --distribution lognormal --latency-ms 800 \\
+        --error-rate 0.02 --rate-limit-rate 0.05 --models openai:gpt-4o,gemini:gemini-3-pro-preview
+    cd backend && python benchmarks/bench_parse.py --response-options "include_raw=false&exclude_none=true"
+    cd backend && python benchmarks/bench_parse.py --models openai:gpt-4o,openai:gpt-5.1 \\
+        --response-options cascade=true --truncate-rate 0.1
+"""
+import argparse
+import asyncio
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+import httpx
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_provider import LATENCY_DISTRIBUTIONS, MockState, start_mock_server
+from resume_corpus import generate_corpus
+
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".txt": "text/plain",
+}
+
+# Histogram sums read back from /metrics for the time split
+SPLIT_METRICS = {
+    "extraction": ("resume_extraction_seconds_sum",),
+    "validation": ("resume_model_validation_seconds_sum",),
+    "model wait": ("resume_model_api_latency_seconds_sum", "resume_model_queue_wait_seconds_sum"),
+}
+METRIC_LINE_RE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{[^}]*\})?\s+(\S+)$")
+LABEL_RE = re.compile(r'(\w+)="([^"]*)"')
+
+# (label, extra /api/parse query params, Accept-Encoding) for the payload size comparison
+PAYLOAD_VARIANTS = [
+    ("full, identity", {}, "identity"),
+    ("full, gzip", {}, "gzip"),
+    ("full, br", {}, "br"),
+    ("include_raw=false, br", {"include_raw": "false"}, "br"),
+    ("+ exclude_none, br", {"include_raw": "false", "exclude_none": "true"}, "br"),
+    ("fields=resume, br", {"fields": "resume", "exclude_none": "true"}, "br"),
+]
+
+
+def _server_env(mock_port: int, args: argparse.Namespace) -> Dict[str, str]:
+    base = f"http://127.0.0.1:{mock_port}"
+    env = dict(os.environ)
+    env.update(
+        {
+            "OPENAI_API_KEY": "mock-key",
+            "OPENAI_BASE_URL": f"{base}/v1",
+            # Let the app's rate limiter handle 429s instead of the SDK's own retries
+            "OPENAI_MAX_RETRIES": "0",
+            "HUGGINGFACE_API_KEY": "mock-key",
+            "HUGGINGFACE_BASE_URL": base,
+            "GEMINI_API_KEY": "mock-key",
+            "GEMINI_API_BASE": base,
+            "PARSE_CACHE_BACKEND": "none",
+            "JOB_WORKERS": "0",
+        }
+    )
+    if args.extraction_pool_size is not None:
+        env["EXTRACTION_POOL_SIZE"] = str(args.extraction_pool_size)
+    for provider in ("OPENAI", "HUGGINGFACE", "GEMINI"):
+        env[f"PROVIDER_CONCURRENCY_{provider}"] = str(args.provider_concurrency)
+    return env
+
+
+def _wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API server exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"API server did not start on port {port}")
+
+
+def _proc_status_kib(pid: int, field: str) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _proc_cpu_seconds(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            # Fields after the parenthesised command name; utime and stime are fields 14 and 15
+            fields = stat.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _child_pids(pid: int) -> List[int]:
+    children: List[int] = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as listing:
+                children.extend(int(child) for child in listing.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def _process_report(pid: int) -> Dict[str, Optional[float]]:
+    """Memory high-water mark and CPU time for the server process and its extraction workers."""
+    workers = _child_pids(pid)
+    worker_hwm = [_proc_status_kib(child, "VmHWM") for child in workers]
+    worker_cpu = [_proc_cpu_seconds(child) for child in workers]
+    return {
+        "server_hwm_kib": _proc_status_kib(pid, "VmHWM"),
+        "server_cpu_s": _proc_cpu_seconds(pid),
+        "workers": len(workers),
+        "worker_hwm_kib": max([value for value in worker_hwm if value is not None], default=None),
+        "worker_cpu_s": sum(value for value in worker_cpu if value is not None) if workers else None,
+    }
+
+
+def _metric_sums(metrics_text: str) -> Dict[str, float]:
+    """Sum every series of each metric name (labels ignored)."""
+    sums: Dict[str, float] = {}
+    for line in metrics_text.splitlines():
+        match = METRIC_LINE_RE.match(line)
+        if match:
+            sums[match.group(1)] = sums.get(match.group(1), 0.0) + float(match.group(2))
+    return sums
+
+
+def _metric_series(metrics_text: str, name: str) -> Counter:
+    """Values of one labelled metric, keyed by its label values in order."""
+    series: Counter = Counter()
+    prefix = name + "{"
+    for line in metrics_text.splitlines():
+        if line.startswith(prefix):
+            labels, _, value = line[len(prefix) :].rpartition("} ")
+            series[tuple(label_value for _, label_value in LABEL_RE.findall(labels))] += float(value)
+    return series
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _format_mib(kib: Optional[float]) -> str:
+    return f"{kib / 1024:.1f} MiB" if kib is not None else "n/a"
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    return f"{seconds:.2f}s" if seconds is not None else "n/a"
+
+
+async def _run_load(
+    api_base: str,
+    files: List[Tuple[str, bytes]],
+    total: int,
+    concurrency: int,
+    params: Dict[str, str],
+    accept_encoding: str = "identity",
+) -> Tuple[List[float], Counter, int, float, Counter]:
+    """
+    Upload files round-robin. Returns (latencies_s, status counts, rule-fallback answers, wall seconds,
+    response byte counts: 'wire' as received, 'body' decoded, and one 'encoding:<name>' per response).
+    """
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    sizes: Counter = Counter()
+    rule_answers = 0
+    next_index = 0
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Accept-Encoding": accept_encoding}
+    async with httpx.AsyncClient(base_url=api_base, timeout=300.0, limits=limits, headers=headers) as client:
+
+        async def _worker() -> None:
+            nonlocal next_index, rule_answers
+            while next_index < total:
+                name, content = files[next_index % len(files)]
+                next_index += 1
+                content_type = CONTENT_TYPES[Path(name).suffix.lower()]
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/api/parse", params=params, files={"file": (name, content, content_type)})
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                statuses[str(response.status_code)] += 1
+                sizes["wire"] += response.num_bytes_downloaded
+                sizes["body"] += len(response.content)
+                sizes["encoding:" + response.headers.get("content-encoding", "identity")] += 1
+                if response.status_code == 200:
+                    providers = {result.get("provider") for result in response.json().get("results", [])}
+                    rule_answers += providers == {"rules"}
+
+        started = time.perf_counter()
+        await asyncio.gather(*[_worker() for _ in range(concurrency)])
+        wall = time.perf_counter() - started
+    return latencies, statuses, rule_answers, wall, sizes
+
+
+def _payload_sizes(
+    api_base: str, files: List[Tuple[str, bytes]], params: Dict[str, str]
+) -> List[Tuple[str, float, float]]:
+    """(label, wire KiB/request, decoded KiB/request) for each PAYLOAD_VARIANTS entry over files."""
+    rows = []
+    for label, extra, accept_encoding in PAYLOAD_VARIANTS:
+        _, _, _, _, sizes = asyncio.run(
+            _run_load(api_base, files, len(files), len(files), {**params, **extra}, accept_encoding)
+        )
+        rows.append((label, sizes["wire"] / len(files) / 1024, sizes["body"] / len(files) / 1024))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent client uploads")
+    parser.add_argument("--warmup", type=int, default=6, help="requests sent before measuring")
+    parser.add_argument("--models", default="openai:gpt-4o", help="models query parameter for /api/parse")
+    parser.add_argument("--corpus", help="directory of .pdf/.docx/.txt resumes (default: generated corpus)")
+    parser.add_argument("--corpus-size", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--mock-port", type=int, default=8900)
+    parser.add_argument("--api-port", type=int, default=8901)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--sigma", type=float, default=0.5, help="lognormal spread")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of model calls answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of model calls answered with a 429")
+    parser.add_argument("--retry-after-s", type=float, default=1.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="share of model answers cut off mid-JSON")
+    parser.add_argument("--provider-concurrency", type=int, default=64, help="per-provider concurrency limit")
+    parser.add_argument("--extraction-pool-size", type=int, help="EXTRACTION_POOL_SIZE for the API (0 = threads)")
+    parser.add_argument("--server-logs", action="store_true", help="show the API server's log output")
+    parser.add_argument("--accept-encoding", default="br, gzip", help="Accept-Encoding sent with each upload")
+    parser.add_argument(
+        "--response-options", default="", help="extra /api/parse query, e.g. 'include_raw=false&exclude_none=true'"
+    )
+    parser.add_argument("--payload-files", type=int, default=5, help="files per payload size variant (0 to skip)")
+    args = parser.parse_args()
+
+    state = MockState(
+        args.latency_ms,
+        args.jitter_ms,
+        distribution=args.distribution,
+        sigma=args.sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_s=args.retry_after_s,
+        truncate_rate=args.truncate_rate,
+    )
+    start_mock_server(state, args.mock_port)
+
+    with tempfile.TemporaryDirectory(prefix="resume-corpus-") as scratch:
+        if args.corpus:
+            paths = sorted(p for p in Path(args.corpus).expanduser().iterdir() if p.suffix.lower() in CONTENT_TYPES)
+        else:
+            paths = generate_corpus(scratch, args.corpus_size, args.seed)
+        files = [(path.name, path.read_bytes()) for path in paths]
+    if not files:
+        raise SystemExit("Corpus is empty")
+    mix = Counter(Path(name).suffix.lower() for name, _ in files)
+    print(f"Corpus: {len(files)} files ({', '.join(f'{n} {ext}' for ext, n in sorted(mix.items()))})")
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.api_port), "--log-level", "warning"],
+        cwd=str(backend_dir),
+        env=_server_env(args.mock_port, args),
+        stdout=None if args.server_logs else subprocess.DEVNULL,
+        stderr=None if args.server_logs else subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(args.api_port, server)
+        api_base = f"http://127.0.0.1:{args.api_port}"
+        params = {"models": args.models, "cache": "false"}
+        run_params = {**params, **dict(parse_qsl(args.response_options))}
+        if args.warmup:
+            asyncio.run(
+                _run_load(api_base, files, args.warmup, min(args.warmup, args.concurrency), run_params, args.accept_encoding)
+            )
+        metrics_text = httpx.get(f"{api_base}/metrics").text
+        metrics_before = _metric_sums(metrics_text)
+        cascade_before = _metric_series(metrics_text, "resume_cascade_requests_total")
+        cascade_cost_before = _metric_series(metrics_text, "resume_cascade_cost_usd_total")
+        process_before = _process_report(server.pid)
+        state.reset()
+
+        latencies, statuses, rule_answers, wall, sizes = asyncio.run(
+            _run_load(api_base, files, args.requests, args.concurrency, run_params, args.accept_encoding)
+        )
+
+        metrics_text = httpx.get(f"{api_base}/metrics").text
+        metrics_after = _metric_sums(metrics_text)
+        cascade_counts = _metric_series(metrics_text, "resume_cascade_requests_total") - cascade_before
+        cascade_cost = _metric_series(metrics_text, "resume_cascade_cost_usd_total") - cascade_cost_before
+        process_after = _process_report(server.pid)
+        mock_counts = (
+            state.requests,
+            state.errors_served,
+            state.rate_limited_served,
+            state.truncated_served,
+            state.peak_in_flight,
+        )
+        payload_rows = _payload_sizes(api_base, files[: args.payload_files], params) if args.payload_files else []
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    completed = len(latencies)
+    print(f"\nModels: {args.models}  concurrency: {args.concurrency}  requests: {args.requests}")
+    print(f"Throughput: {completed / wall:.1f} req/s over {wall:.2f}s")
+    print(
+        f"Latency: p50 {_percentile(latencies, 50) * 1000:.0f} ms  p95 {_percentile(latencies, 95) * 1000:.0f} ms  "
+        f"p99 {_percentile(latencies, 99) * 1000:.0f} ms  max {max(latencies, default=0) * 1000:.0f} ms"
+    )
+    print(f"Status codes: {dict(sorted(statuses.items()))}  rule-based fallback answers: {rule_answers}")
+    encodings = {key.split(":", 1)[1]: count for key, count in sorted(sizes.items()) if key.startswith("encoding:")}
+    print(
+        f"Response size: {sizes['wire'] / max(1, completed) / 1024:.1f} KiB/request on the wire, "
+        f"{sizes['body'] / max(1, completed) / 1024:.1f} KiB decoded  (Content-Encoding: {encodings})"
+    )
+    print("Mock provider: {} calls, {} 500s, {} 429s, {} cut-off answers, peak in flight {}".format(*mock_counts))
+
+    model_cost = metrics_after.get("resume_model_cost_usd_sum", 0.0) - metrics_before.get("resume_model_cost_usd_sum", 0.0)
+    print(f"Model cost (estimated): ${model_cost / max(1, completed):.5f}/request")
+    if cascade_counts:
+        tiers: Counter = Counter()
+        for (tier, _), count in cascade_counts.items():
+            tiers[tier] += int(count)
+        escalations = {reason: int(count) for (_, reason), count in sorted(cascade_counts.items()) if reason != "accepted"}
+        spent, expensive = cascade_cost[("spent",)], cascade_cost[("expensive",)]
+        print(
+            f"Cascade: answered by {dict(sorted(tiers.items()))}, escalations {escalations}; "
+            f"${spent / max(1, completed):.5f}/request spent vs ${expensive / max(1, completed):.5f} "
+            f"for --models alone (saved {100.0 * (expensive - spent) / (expensive or 1.0):.0f}%)"
+        )
+
+    print(
+        f"\nMemory high-water: API {_format_mib(process_after['server_hwm_kib'])}, "
+        f"largest of {process_after['workers']} extraction workers {_format_mib(process_after['worker_hwm_kib'])}"
+    )
+
+    def _cpu_delta(key: str) -> Optional[float]:
+        if process_after[key] is None:
+            return None
+        return process_after[key] - (process_before[key] or 0.0)
+
+    print(
+        f"CPU: API process {_format_seconds(_cpu_delta('server_cpu_s'))}, "
+        f"extraction workers {_format_seconds(_cpu_delta('worker_cpu_s'))}"
+    )
+
+    split = {
+        name: sum(metrics_after.get(metric, 0.0) - metrics_before.get(metric, 0.0) for metric in names)
+        for name, names in SPLIT_METRICS.items()
+    }
+    total = sum(split.values()) or 1.0
+    print("Time split (summed over requests):")
+    for name, seconds in split.items():
+        print(f"  {name:<11} {seconds:>9.2f}s {100.0 * seconds / total:>6.1f}%  {1000.0 * seconds / max(1, completed):>8.1f} ms/req")
+
+    if payload_rows:
+        full_wire = payload_rows[0][1] or 1.0
+        print(f"\nPayload size per request ({args.payload_files} files, {args.models}):")
+        print(f"  {'variant':<24} {'wire KiB':>9} {'decoded KiB':>12} {'vs full':>8}")
+        for label, wire_kib, body_kib in payload_rows:
+            print(f"  {label:<24} {wire_kib:>9.1f} {body_kib:>12.1f} {100.0 * wire_kib / full_wire:>7.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Compare PDF extraction engines on speed and text fidelity.
+
+Runs every registered engine (see parsers/pdf_engines.py), the automatic engine selection and
+the previous strategy (pdfplumber, then a full PyPDF2 reparse when that came back empty) over
+a PDF corpus, and reports milliseconds per document and per page plus text fidelity: word-level
+similarity to the source text for the generated corpus, or to the most expensive engine's
+output for --corpus.
+
+The generated corpus holds resumes of one to several pages, some with trailing blank
+(image-only) pages and some with no text layer at all, like scans.
+
+--shard-pages N also times one N-page PDF through the extraction pool with and without
+page-range sharding (PDF_SHARD_MIN_PAGES); the speedup depends on available cores.
+
+    cd backend && python benchmarks/bench_pdf_engines.py
+    cd backend && python benchmarks/bench_pdf_engines.py --corpus ~/resumes --repeat 5
+    cd backend && python benchmarks/bench_pdf_engines.py --shard-pages 50 --pool-size 4
+"""
+import argparse
+import asyncio
+import difflib
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import PyPDF2
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from parsers.pdf_engines import PDF_ENGINES, PDFPLUMBER_AVAILABLE, extract_pdf_pages, probe_pdf
+from resume_corpus import PDF_LINES_PER_PAGE, generate_resume_text, write_pdf
+from services.extraction_pool import ExtractionPool
+
+if PDFPLUMBER_AVAILABLE:
+    import pdfplumber
+
+
+def _previous_strategy(data: bytes) -> List[str]:
+    """What extract_text_from_pdf did before the engine registry."""
+    pages: List[str] = []
+    if PDFPLUMBER_AVAILABLE:
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            pages = [page.extract_text() or "" for page in pdf.pages]
+    if not "".join(pages).strip():
+        pages = [page.extract_text() or "" for page in PyPDF2.PdfReader(io.BytesIO(data)).pages]
+    return pages
+
+
+def _fidelity(reference: Optional[str], text: str) -> Optional[float]:
+    if reference is None:
+        return None
+    expected, actual = reference.split(), text.split()
+    if not expected:
+        return 1.0 if not actual else 0.0
+    return difflib.SequenceMatcher(None, expected, actual, autojunk=False).ratio()
+
+
+def _generated_corpus(count: int, seed: int, scratch: str) -> List[Tuple[str, bytes, Optional[str]]]:
+    rng = random.Random(seed)
+    documents = []
+    for index in range(count):
+        text = generate_resume_text(rng, rng.randint(1, 24))
+        blank_pages = rng.choice((0, 0, 0, 1, 3))
+        if index % 10 == 9:
+            # No text layer at all, as with a scanned resume
+            text, blank_pages = "", 2
+        path = Path(scratch) / f"generated-{index:03d}.pdf"
+        write_pdf(text, path, blank_pages=blank_pages)
+        documents.append((path.name, path.read_bytes(), text))
+    return documents
+
+
+def _load_corpus(corpus_dir: str) -> List[Tuple[str, bytes, Optional[str]]]:
+    paths = sorted(Path(corpus_dir).expanduser().glob("*.pdf"))
+    return [(path.name, path.read_bytes(), None) for path in paths]
+
+
+def _time_sharding(pages: int, pool_size: int, repeat: int, seed: int) -> None:
+    rng = random.Random(seed)
+    lines: List[str] = []
+    while len(lines) < pages * PDF_LINES_PER_PAGE:
+        lines.extend(generate_resume_text(rng, 24).splitlines())
+    with tempfile.TemporaryDirectory(prefix="pdf-shard-") as scratch:
+        path = Path(scratch) / "portfolio.pdf"
+        write_pdf("\n".join(lines[: pages * PDF_LINES_PER_PAGE]), path)
+        data = path.read_bytes()
+
+    print(f"\nSharded extraction: {pages}-page PDF, pool size {pool_size}")
+    for label, shard_min_pages in (("single worker", 0), ("sharded", 1)):
+        pool = ExtractionPool(
+            pool_size, queue_depth=1, timeout_seconds=0, max_jobs_per_worker=0, shard_min_pages=shard_min_pages
+        )
+
+        async def _extract() -> float:
+            await pool.extract(data, ".pdf")  # warm the worker processes
+            best = float("inf")
+            for _ in range(max(1, repeat)):
+                started = time.perf_counter()
+                await pool.extract(data, ".pdf")
+                best = min(best, time.perf_counter() - started)
+            return best
+
+        try:
+            elapsed = asyncio.run(_extract())
+        finally:
+            pool.shutdown()
+        print(f"  {label:<14} {1000 * elapsed:>8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of .pdf resumes (default: generated corpus)")
+    parser.add_argument("--count", type=int, default=40, help="size of the generated corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per document (best is kept)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--shard-pages", type=int, default=0, help="also time sharded extraction of an N-page PDF")
+    parser.add_argument("--pool-size", type=int, default=4, help="extraction workers for --shard-pages")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="pdf-corpus-") as scratch:
+        documents = _load_corpus(args.corpus) if args.corpus else _generated_corpus(args.count, args.seed, scratch)
+    if not documents:
+        raise SystemExit("No PDFs found")
+
+    strategies: Dict[str, Callable[[bytes], List[str]]] = {"auto": lambda data: extract_pdf_pages(io.BytesIO(data))}
+    for name, engine in sorted(PDF_ENGINES.items(), key=lambda item: item[1].cost):
+        strategies[name] = lambda data, engine=engine: extract_pdf_pages(io.BytesIO(data), engine=engine)
+    strategies["previous"] = _previous_strategy
+
+    if args.corpus and len(PDF_ENGINES) > 1:
+        reference_engine = max(PDF_ENGINES.values(), key=lambda engine: engine.cost)
+        documents = [
+            (name, data, "\n".join(extract_pdf_pages(io.BytesIO(data), engine=reference_engine)))
+            for name, data, _ in documents
+        ]
+
+    total_pages = text_pages = complex_docs = 0
+    probe_seconds = 0.0
+    for _, data, _ in documents:
+        started = time.perf_counter()
+        probe = probe_pdf(PyPDF2.PdfReader(io.BytesIO(data)))
+        probe_seconds += time.perf_counter() - started
+        total_pages += probe.page_count
+        text_pages += len(probe.text_pages)
+        complex_docs += probe.complex_layout
+    print(
+        f"Corpus: {len(documents)} PDFs, {total_pages} pages ({total_pages - text_pages} without a text layer), "
+        f"{complex_docs} with complex layouts"
+    )
+    print(f"Probe: {1000 * probe_seconds / len(documents):.2f} ms/doc")
+    if not PDFPLUMBER_AVAILABLE:
+        print("pdfplumber is not installed; only PyPDF2 is compared")
+
+    print(f"\n{'engine':<12} {'ms/doc':>8} {'ms/page':>8} {'fidelity':>9}")
+    for name, extract in strategies.items():
+        elapsed = 0.0
+        scores = []
+        for _, data, reference in documents:
+            best = float("inf")
+            for _ in range(max(1, args.repeat)):
+                started = time.perf_counter()
+                pages = extract(data)
+                best = min(best, time.perf_counter() - started)
+            elapsed += best
+            score = _fidelity(reference, "\n".join(pages))
+            if score is not None:
+                scores.append(score)
+        fidelity = f"{sum(scores) / len(scores):.3f}" if scores else "n/a"
+        print(
+            f"{name:<12} {1000 * elapsed / len(documents):>8.2f} {1000 * elapsed / max(1, total_pages):>8.2f} "
+            f"{fidelity:>9}"
+        )
+
+    if args.shard_pages:
+        _time_sharding(args.shard_pages, args.pool_size, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+"""
+Local mock LLM provider for benchmarks.
+
+Emulates the OpenAI-compatible chat completions endpoint (used by the OpenAI SDK and
+Hugging Face Inference clients) and the Gemini generateContent REST endpoint, returning a
+canned resume JSON after a configurable delay. Tracks peak concurrent in-flight requests.
+Latency is drawn from a fixed, uniform (latency +/- jitter) or lognormal (median latency,
+spread sigma) distribution, and a configurable share of calls fail with a 500 or a 429
+carrying Retry-After, so retry and rate-limit paths are exercised too. Another share can be
+cut off mid-JSON with a max_tokens finish reason, exercising partial-output recovery.
+Emulates prompt caching too: a repeated OpenAI prompt_cache_key, or a Gemini request that
+references a cachedContents resource, reports cached prompt tokens in its usage block.
+
+Run standalone:
+    python benchmarks/mock_provider.py --port 8900 --latency-ms 500
+    python benchmarks/mock_provider.py --latency-ms 800 --distribution lognormal --sigma 0.5 --error-rate 0.02 --rate-limit-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+MOCK_RESUME = {
+    "contact_info": {
+        "name": "John Doe",
+        "phone": "(555) 123-4567",
+        "email": "john.doe@example.com",
+        "city": "San Francisco",
+    },
+    "total_experience_years": 10,
+    "total_experience_months": 0,
+    "education": [
+        {"degree": "MS", "field_of_study": "Computer Science", "institution": "Stanford University", "graduation_year": 2013},
+        {"degree": "BS", "field_of_study": "Computer Engineering", "institution": "UCLA", "graduation_year": 2011},
+    ],
+    "experience": [
+        {
+            "company": "Acme Corp",
+            "position": "Staff Engineer",
+            "start_date": "2019",
+            "end_date": "2024",
+            "is_current": False,
+            "summary": None,
+            "achievements": ["Led migration to microservices, reducing latency by 30%."],
+        },
+        {
+            "company": "Globex Inc",
+            "position": "Senior Engineer",
+            "start_date": "2014",
+            "end_date": "2019",
+            "is_current": False,
+            "summary": None,
+            "achievements": ["Built data ingestion pipelines processing 5TB/day."],
+        },
+    ],
+    "certifications": [{"name": "AWS Solutions Architect Professional"}],
+    "awards": [{"title": "Acme Innovation Award", "date": "2022"}],
+    "projects": [],
+    "patents": [],
+    "skills": [{"name": name} for name in ["Python", "Go", "Kubernetes", "AWS", "PostgreSQL", "Terraform"]],
+    "summary": "10+ years designing scalable backend systems and leading cross-functional teams.",
+    "objective": None,
+    "languages": [],
+    "references": [],
+}
+
+
+# Prompt tokens reported as served from cache on a prompt-cache hit (about the system prompt's size)
+MOCK_CACHED_TOKENS = 640
+
+
+LATENCY_DISTRIBUTIONS = ("uniform", "lognormal")
+
+# Share of the answer kept when --truncate-rate cuts one off
+TRUNCATED_FRACTION = 0.6
+
+
+class MockState:
+    def __init__(
+        self,
+        latency_ms: float = 500.0,
+        jitter_ms: float = 0.0,
+        distribution: str = "uniform",
+        sigma: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_s: float = 1.0,
+        truncate_rate: float = 0.0,
+    ):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{distribution}', expected one of {LATENCY_DISTRIBUTIONS}")
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.distribution = distribution
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after_s = retry_after_s
+        self.truncate_rate = truncate_rate
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.errors_served = 0
+        self.rate_limited_served = 0
+        self.truncated_served = 0
+        self.prompt_cache_keys = set()
+        self.cached_contents = {}
+        self._lock = threading.Lock()
+
+    def enter(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def exit(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.requests = 0
+            self.errors_served = 0
+            self.rate_limited_served = 0
+            self.truncated_served = 0
+
+    def delay_seconds(self) -> float:
+        if self.distribution == "lognormal":
+            # latency_ms is the median; sigma controls the tail (0.5 puts p99 at ~3.2x the median)
+            return self.latency_ms * random.lognormvariate(0.0, self.sigma) / 1000.0
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000.0
+
+    def fault(self) -> Optional[JSONResponse]:
+        """Pick an injected failure for this call, if any: a 429 with Retry-After or a 500."""
+        roll = random.random()
+        if roll < self.rate_limit_rate:
+            with self._lock:
+                self.rate_limited_served += 1
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit reached (mock)", "type": "rate_limit_exceeded"}},
+                headers={"retry-after": f"{self.retry_after_s:g}"},
+            )
+        if roll < self.rate_limit_rate + self.error_rate:
+            with self._lock:
+                self.errors_served += 1
+            return JSONResponse(status_code=500, content={"error": {"message": "Internal error (mock)"}})
+        return None
+
+    def completion(self, content: str) -> Tuple[str, bool]:
+        """The content to answer with and whether it was cut off, as a max_tokens stop would."""
+        if random.random() >= self.truncate_rate:
+            return content, False
+        with self._lock:
+            self.truncated_served += 1
+        return content[: int(len(content) * TRUNCATED_FRACTION)], True
+
+
+def create_mock_app(state: MockState) -> FastAPI:
+    app = FastAPI(title="Mock LLM Provider")
+    content = json.dumps(MOCK_RESUME)
+
+    async def _respond():
+        state.enter()
+        try:
+            await asyncio.sleep(state.delay_seconds())
+        finally:
+            state.exit()
+
+    async def _stream_chunks(model: str, include_usage: bool = False, chunk_chars: int = 64):
+        # Spread the configured latency across the chunks so time-to-first-token is realistic
+        state.enter()
+        try:
+            answer, truncated = state.completion(content)
+            pieces = [answer[i : i + chunk_chars] for i in range(0, len(answer), chunk_chars)]
+            delay = state.delay_seconds() / max(1, len(pieces))
+            for piece in pieces:
+                await asyncio.sleep(delay)
+                chunk = {
+                    "id": "mock-1",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+            if truncated:
+                chunk["choices"] = [{"index": 0, "delta": {}, "finish_reason": "length"}]
+                yield f"data: {json.dumps(chunk)}\n\n"
+            if include_usage:
+                usage_chunk = {
+                    "id": "mock-1",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [],
+                    "usage": {"prompt_tokens": 900, "completion_tokens": 400, "total_tokens": 1300},
+                }
+                yield f"data: {json.dumps(usage_chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+        finally:
+            state.exit()
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        failure = state.fault()
+        if failure is not None:
+            return failure
+        if body.get("stream"):
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            return StreamingResponse(
+                _stream_chunks(body.get("model", "mock"), include_usage), media_type="text/event-stream"
+            )
+        cache_key = body.get("prompt_cache_key")
+        cached_tokens = MOCK_CACHED_TOKENS if cache_key in state.prompt_cache_keys else 0
+        if cache_key:
+            state.prompt_cache_keys.add(cache_key)
+        await _respond()
+        answer, truncated = state.completion(content)
+        return {
+            "id": "mock-1",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": answer},
+                    "finish_reason": "length" if truncated else "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": 900,
+                "completion_tokens": 400,
+                "total_tokens": 1300,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            },
+        }
+
+    @app.post("/v1/publishers/google/models/{model_action}")
+    async def gemini_generate(model_action: str, request: Request):
+        body = await request.json()
+        cached_content = body.get("cachedContent")
+        if cached_content and cached_content not in state.cached_contents:
+            return JSONResponse(status_code=404, content={"error": {"message": "cached content not found"}})
+        failure = state.fault()
+        if failure is not None:
+            return failure
+        await _respond()
+        answer, truncated = state.completion(content)
+        usage = {"promptTokenCount": 900, "candidatesTokenCount": 400, "totalTokenCount": 1300}
+        if cached_content:
+            usage["cachedContentTokenCount"] = MOCK_CACHED_TOKENS
+        return {
+            "candidates": [
+                {
+                    "content": {"role": "model", "parts": [{"text": answer}]},
+                    "finishReason": "MAX_TOKENS" if truncated else "STOP",
+                }
+            ],
+            "usageMetadata": usage,
+        }
+
+    @app.post("/v1/{parent:path}/cachedContents")
+    async def gemini_create_cached_content(parent: str, request: Request):
+        body = await request.json()
+        name = f"{parent}/cachedContents/mock-{len(state.cached_contents) + 1}"
+        state.cached_contents[name] = body
+        return {"name": name, "model": body.get("model"), "expireTime": None}
+
+    @app.get("/stats")
+    async def stats():
+        return {
+            "requests": state.requests,
+            "in_flight": state.in_flight,
+            "peak_in_flight": state.peak_in_flight,
+            "errors_served": state.errors_served,
+            "rate_limited_served": state.rate_limited_served,
+            "truncated_served": state.truncated_served,
+        }
+
+    return app
+
+
+def start_mock_server(state: MockState, port: int) -> threading.Thread:
+    """Run the mock provider with uvicorn in a daemon thread and wait until it accepts connections."""
+    import socket
+    import uvicorn
+
+    config = uvicorn.Config(
+        create_mock_app(state),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+        backlog=4096,
+        limit_concurrency=None,
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return thread
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Mock provider did not start on port {port}")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock OpenAI/HF/Gemini provider")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--sigma", type=float, default=0.5, help="lognormal spread")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of calls answered with a 429")
+    parser.add_argument("--retry-after-s", type=float, default=1.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="share of answers cut off mid-JSON")
+    args = parser.parse_args()
+    state = MockState(
+        args.latency_ms,
+        args.jitter_ms,
+        distribution=args.distribution,
+        sigma=args.sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_s=args.retry_after_s,
+        truncate_rate=args.truncate_rate,
+    )
+    uvicorn.run(create_mock_app(state), host="127.0.0.1", port=args.port)
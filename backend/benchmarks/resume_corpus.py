@@ -0,0 +1,173 @@
+"""
+Generate a corpus of synthetic resumes as .txt, .docx and .pdf files.
+
+Each resume follows the layout of sample-resume.txt (contact header, summary, experience,
+education, skills, certifications, awards) with randomized names, employers, dates and a
+varying number of positions, so documents range from one to several pages. DOCX files are
+written with python-docx; PDFs are written directly (single-font text pages with a real text
+layer), so no PDF library is needed.
+
+    cd backend && python benchmarks/resume_corpus.py --out /tmp/resumes --count 30
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+FIRST_NAMES = ["John", "Maria", "Wei", "Aisha", "Carlos", "Priya", "Liam", "Sofia", "Kenji", "Olga", "Noah", "Fatima"]
+LAST_NAMES = ["Doe", "Garcia", "Chen", "Okafor", "Silva", "Patel", "Murphy", "Rossi", "Tanaka", "Ivanova", "Smith"]
+CITIES = ["San Francisco, CA", "Austin, TX", "Seattle, WA", "New York, NY", "Chicago, IL", "Boston, MA", "Denver, CO"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Staff Engineer", "Data Engineer", "Engineering Manager"]
+COMPANIES = ["Acme Corp", "Globex Inc", "Initech", "Umbrella Labs", "Stark Industries", "Hooli", "Wayne Systems"]
+ACHIEVEMENTS = [
+    "Led migration to microservices, reducing latency by {n}%.",
+    "Mentored {n} engineers and drove adoption of Kubernetes.",
+    "Built data ingestion pipelines processing {n}TB/day.",
+    "Introduced automated testing, cutting regressions by {n}%.",
+    "Designed a caching layer that lowered infrastructure cost by {n}%.",
+    "Owned the on-call rotation for a service handling {n}k requests per second.",
+    "Shipped a real-time analytics dashboard used by {n} internal teams.",
+]
+SKILLS = ["Python", "Go", "Kubernetes", "AWS", "PostgreSQL", "Terraform", "Kafka", "React", "Rust", "Spark", "gRPC"]
+DEGREES = [
+    ("MS Computer Science", "Stanford University"),
+    ("BS Computer Engineering", "UCLA"),
+    ("BS Mathematics", "University of Texas"),
+    ("MEng Software Engineering", "MIT"),
+]
+FILE_TYPES = (".txt", ".docx", ".pdf")
+
+# PDF page geometry (US Letter, points)
+PDF_PAGE_WIDTH = 612
+PDF_PAGE_HEIGHT = 792
+PDF_MARGIN = 54
+PDF_FONT_SIZE = 10
+PDF_LEADING = 13
+PDF_LINES_PER_PAGE = (PDF_PAGE_HEIGHT - 2 * PDF_MARGIN) // PDF_LEADING
+
+
+def generate_resume_text(rng: random.Random, positions: int) -> str:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = f"{name.lower().replace(' ', '.')}@example.com"
+    phone = f"({rng.randint(201, 989)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}"
+    lines = [name, rng.choice(TITLES), rng.choice(CITIES), f"{email} | {phone}", ""]
+    lines += ["Summary:", f"{positions * 3}+ years designing scalable backend systems and leading teams.", ""]
+
+    lines.append("Experience:")
+    end_year = 2024
+    for _ in range(positions):
+        start_year = end_year - rng.randint(2, 5)
+        lines.append(f"{rng.choice(COMPANIES)} - {rng.choice(TITLES)} ({start_year}-{end_year})")
+        for template in rng.sample(ACHIEVEMENTS, rng.randint(2, 4)):
+            lines.append("- " + template.format(n=rng.randint(3, 60)))
+        lines.append("")
+        end_year = start_year
+
+    lines.append("Education:")
+    for degree, school in rng.sample(DEGREES, rng.randint(1, 2)):
+        lines.append(f"{degree}, {school}, {end_year - rng.randint(0, 3)}")
+    lines += ["", "Skills:", ", ".join(rng.sample(SKILLS, rng.randint(4, 9))), ""]
+    lines += ["Certifications:", "AWS Solutions Architect Professional", ""]
+    lines += ["Awards:", f"{rng.choice(COMPANIES)} Innovation Award {rng.randint(2015, 2024)}"]
+    return "\n".join(lines) + "\n"
+
+
+def _pdf_escape(line: str) -> str:
+    # Standard 14 fonts use WinAnsiEncoding; keep the text layer to Latin-1
+    line = line.encode("latin-1", "replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(text: str, path: Path, blank_pages: int = 0) -> None:
+    """
+    Write text as a minimal PDF: one Helvetica text object per page, lines set with T*.
+    blank_pages appends pages with no text layer (what a scanned page looks like to an extractor).
+    """
+    lines = text.splitlines()
+    pages = [lines[i : i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)]
+    pages += [[] for _ in range(blank_pages)]
+    pages = pages or [[]]
+
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then (page, content) pairs
+    objects: List[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_refs = []
+    for page_lines in pages:
+        # Blank pages get no font resource, like the image-only pages of a scan
+        resources = "<< /Font << /F1 3 0 R >> >>" if page_lines else "<< >>"
+        body = []
+        if page_lines:
+            body.append(f"BT /F1 {PDF_FONT_SIZE} Tf {PDF_LEADING} TL {PDF_MARGIN} {PDF_PAGE_HEIGHT - PDF_MARGIN} Td")
+            body += [f"({_pdf_escape(line)}) Tj T*" for line in page_lines]
+            body.append("ET")
+        stream = "\n".join(body).encode("latin-1")
+        page_number = len(objects) + 1
+        page_refs.append(f"{page_number} 0 R")
+        objects.append(
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PDF_PAGE_WIDTH} {PDF_PAGE_HEIGHT}] "
+                f"/Resources {resources} /Contents {page_number + 1} 0 R >>"
+            ).encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(pages)} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    path.write_bytes(bytes(output))
+
+
+def write_docx(text: str, path: Path) -> None:
+    from docx import Document
+
+    document = Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    document.save(str(path))
+
+
+def generate_corpus(out_dir: str, count: int, seed: int = 7, max_positions: int = 12) -> List[Path]:
+    """
+    Write count resumes to out_dir, rotating through .txt, .docx and .pdf.
+    Returns the file paths in generation order.
+    """
+    rng = random.Random(seed)
+    directory = Path(out_dir).expanduser()
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(count):
+        text = generate_resume_text(rng, rng.randint(1, max_positions))
+        suffix = FILE_TYPES[index % len(FILE_TYPES)]
+        path = directory / f"resume-{index:04d}{suffix}"
+        if suffix == ".pdf":
+            write_pdf(text, path)
+        elif suffix == ".docx":
+            write_docx(text, path)
+        else:
+            path.write_text(text)
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--count", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--max-positions", type=int, default=12, help="upper bound on experience entries")
+    args = parser.parse_args()
+    paths = generate_corpus(args.out, args.count, args.seed, args.max_positions)
+    total_bytes = sum(path.stat().st_size for path in paths)
+    print(f"Wrote {len(paths)} resumes ({total_bytes / 1024:.0f} KiB) to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Set, Tuple
 import asyncio
+import io
 import os
+import shutil
+import tempfile
+import time
+import zipfile
 import logging
 from dotenv import load_dotenv
 from pathlib import Path
+from pydantic import BaseModel
 
 import sys
 from pathlib import Path
@@ -16,9 +22,37 @@ from pathlib import Path
 backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
-from parsers.text_extractor import extract_text_from_file
-from parsers.resume_parser import parse_with_model, parse_model_specs
-from models.resume_models import ParseResponse, ModelError
+from parsers.resume_parser import (
+    cascade_enabled,
+    parse_with_cascade,
+    parse_with_model,
+    parse_with_models,
+    parse_with_rules,
+    parse_model_specs,
+    rule_fallback_enabled,
+    provider_warmup_enabled,
+    warm_up_providers,
+)
+from parsers.text_normalizer import normalization_enabled, normalize_resume_text
+from models.resume_models import (
+    ParsedModelResult,
+    ParseResponse,
+    ModelError,
+    ModelSpec,
+    CascadeReport,
+    BatchFileResult,
+    BatchParseResponse,
+    JobState,
+    JobStatus,
+    TextNormalization,
+)
+from services.result_cache import get_result_cache
+from services.extraction_pool import get_extraction_pool, shutdown_extraction_pool, ExtractionQueueFull
+from services.job_queue import get_job_scheduler
+from services.http_clients import close_clients
+from services.provider_limits import rate_limiter_stats
+from services.compression import CompressionMiddleware, compression_settings
+from services import json_codec, metrics
 
 load_dotenv()
 
@@ -35,46 +69,193 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for complete JSON responses; SSE streams pass through uncompressed
+_compression = compression_settings()
+if _compression:
+    app.add_middleware(CompressionMiddleware, **_compression)
+
 @app.get("/")
 async def root():
     return {"message": "Resume Parser API"}
 
-@app.post("/api/parse", response_model=ParseResponse)
-async def parse_resume_endpoint(
-    file: UploadFile = File(...),
-    models: Optional[str] = Query(
-        None,
-        description="Comma-separated list of provider:model (e.g., openai:gpt-4o,gemini:gemini-1.5-pro-latest)",
-    ),
-):
+ALLOWED_EXTENSIONS = {'.pdf', '.doc', '.docx', '.txt'}
+
+# Batch limits: files per request (after zip expansion), bytes per file (uploaded, or uncompressed for a
+# zip entry) and total bytes per request (uploads as received plus zip entries uncompressed)
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+BATCH_MAX_FILE_BYTES = int(os.getenv("BATCH_MAX_FILE_BYTES", str(20 * 1024 * 1024)))
+BATCH_MAX_TOTAL_BYTES = int(os.getenv("BATCH_MAX_TOTAL_BYTES", str(200 * 1024 * 1024)))
+
+# Uploads up to this size are extracted straight from memory; larger ones are spooled to a unique temp file
+UPLOAD_MAX_IN_MEMORY_BYTES = int(os.getenv("UPLOAD_MAX_IN_MEMORY_BYTES", str(10 * 1024 * 1024)))
+
+
+async def _load_upload(file: UploadFile, file_ext: str) -> Tuple[object, Optional[str]]:
     """
-    Parse a resume file and extract structured data
+    Return (source, temp_path) for text extraction.
+    Small uploads are returned as bytes; large ones are copied to a uniquely named temp file,
+    whose path the caller must remove.
+    """
+    size = getattr(file, "size", None)
+    if size is not None and size > UPLOAD_MAX_IN_MEMORY_BYTES:
+        fd, temp_path = tempfile.mkstemp(prefix="resume-", suffix=file_ext)
+        with os.fdopen(fd, "wb") as buffer:
+            await file.seek(0)
+            await asyncio.get_running_loop().run_in_executor(None, shutil.copyfileobj, file.file, buffer)
+        return temp_path, temp_path
+    return await file.read(), None
+
+
+def _normalize_text(text: str, file_ext: str) -> Tuple[str, Optional[TextNormalization]]:
+    """Compact extracted text before model calls (TEXT_NORMALIZATION=false disables it)."""
+    if not normalization_enabled():
+        return text, None
+    # Page headers, footers and numbers are only looked for in paged formats
+    normalized, report = normalize_resume_text(text, paged=file_ext == ".pdf")
+    logger.info(
+        "Normalized resume text: %s -> %s chars (~%s tokens saved)",
+        report.original_chars,
+        report.normalized_chars,
+        report.tokens_saved,
+    )
+    return normalized, report
+
+
+async def _extract_upload_text(file: UploadFile) -> Tuple[str, int, Optional[TextNormalization]]:
+    """
+    Validate an uploaded resume, extract its text in the extraction pool and normalize it.
+    Returns (text, extraction_ms, normalization); raises HTTPException for client-visible failures.
     """
     # Validate file type
-    allowed_extensions = {'.pdf', '.doc', '.docx', '.txt'}
     file_ext = os.path.splitext(file.filename)[1].lower()
     
-    if file_ext not in allowed_extensions:
+    if file_ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
+            detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
         )
     
+    temp_path = None
     try:
-        # Save uploaded file temporarily
-        temp_path = f"/tmp/{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Extract text from file
-        text = extract_text_from_file(temp_path, file_ext)
+        source, temp_path = await _load_upload(file, file_ext)
         
-        if not text or len(text.strip()) < 50:
+        # Extract text from file in the extraction worker pool
+        try:
+            text, extraction_ms = await get_extraction_pool().extract(source, file_ext)
+        except ExtractionQueueFull as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Text extraction timed out. The file may be too large or malformed.")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
+    finally:
+        # Clean up temp file (only created for large uploads)
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+    
+    if not text or len(text.strip()) < 50:
+        raise HTTPException(
+            status_code=400,
+            detail="Could not extract sufficient text from the file. File may be corrupted or empty."
+        )
+    text, normalization = _normalize_text(text, file_ext)
+    return text, extraction_ms, normalization
+
+
+def _json_response(
+    model: BaseModel, status_code: int = 200, exclude: Optional[Dict[str, Any]] = None, exclude_none: bool = False
+) -> Response:
+    """
+    Serialize a response model once, in pydantic-core. Returning the model itself would have FastAPI
+    dump it, re-validate the dump against response_model and encode it again; response_model stays
+    on the routes for the OpenAPI schema.
+    """
+    return Response(
+        content=model.model_dump_json(exclude=exclude, exclude_none=exclude_none),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+async def _parse_text(
+    text: str,
+    model_specs: List[ModelSpec],
+    use_cache: bool,
+    fallback: Optional[bool],
+    sectioned: Optional[bool] = None,
+    cascade: Optional[bool] = None,
+) -> Tuple[List[ParsedModelResult], List[ModelError], Optional[CascadeReport]]:
+    """Run the requested models, as a cheap-first cascade when cascade (default: CASCADE_ENABLED env) is on."""
+    if cascade_enabled() if cascade is None else cascade:
+        return await parse_with_cascade(text, model_specs, use_cache, fallback, sectioned)
+    results, errors = await parse_with_models(text, model_specs, use_cache, fallback, sectioned)
+    return results, errors, None
+
+
+def _excluded_result_fields(include_raw: bool, fields: Optional[str]) -> Set[str]:
+    """ParsedModelResult fields to leave out of responses, from the include_raw and fields query params."""
+    excluded = set() if include_raw else {"raw_response"}
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if requested:
+        available = set(ParsedModelResult.model_fields)
+        unknown = requested - available
+        if unknown:
             raise HTTPException(
                 status_code=400,
-                detail="Could not extract sufficient text from the file. File may be corrupted or empty."
+                detail=f"Unknown result fields: {', '.join(sorted(unknown))}. Available: {', '.join(sorted(available))}",
             )
+        excluded |= available - requested
+    return excluded
+
+
+@app.post("/api/parse", response_model=ParseResponse)
+async def parse_resume_endpoint(
+    file: UploadFile = File(...),
+    models: Optional[str] = Query(
+        None,
+        description="Comma-separated list of provider:model (e.g., openai:gpt-4o,gemini:gemini-1.5-pro-latest)",
+    ),
+    use_cache: bool = Query(
+        True,
+        alias="cache",
+        description="Set to false to bypass the parse result cache and force fresh model calls",
+    ),
+    fallback: Optional[bool] = Query(
+        None,
+        description="Return the rule-based extraction if every model fails (default: RULE_BASED_FALLBACK env, on)",
+    ),
+    sectioned: Optional[bool] = Query(
+        None,
+        description="Split the resume by section and extract sections in parallel (default: automatic for long resumes)",
+    ),
+    cascade: Optional[bool] = Query(
+        None,
+        description="Try the cheap model (CASCADE_CHEAP_MODEL) first and run the requested models only if its "
+        "result falls short (default: CASCADE_ENABLED env, off)",
+    ),
+    include_raw: bool = Query(
+        True,
+        description="Set to false to omit each result's raw_response (the model's JSON before validation)",
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated result fields to return (e.g. provider,model_name,resume); others are omitted",
+    ),
+    exclude_none: bool = Query(False, description="Omit null values from the response"),
+):
+    """
+    Parse a resume file and extract structured data
+    """
+    started = time.perf_counter()
+    file_type = os.path.splitext(file.filename or "")[1].lower()
+    # Failed requests are timed too, so slow timeouts and errors show up in the latency histogram
+    status_code = 500
+    try:
+        excluded = _excluded_result_fields(include_raw, fields)
+        exclude = {"results": {"__all__": excluded}} if excluded else None
+        text, extraction_ms, normalization = await _extract_upload_text(file)
         
         # Determine model specs
         try:
@@ -82,30 +263,24 @@ async def parse_resume_endpoint(
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
-        # Parse resume using all requested models concurrently
-        parse_tasks = [parse_with_model(text, spec) for spec in model_specs]
-        responses = await asyncio.gather(*parse_tasks, return_exceptions=True)
-
-        results = []
-        errors = []
-        for spec, result in zip(model_specs, responses):
-            if isinstance(result, Exception):
-                logger.error("Model call failed for provider=%s model=%s: %s", spec.provider, spec.model_name, result)
-                errors.append(
-                    ModelError(
-                        provider=spec.provider,
-                        model_name=spec.model_name,
-                        message=str(result),
-                    )
-                )
-            else:
-                results.append(result)
+        # Parse resume using all requested models concurrently (or cheap model first, in cascade mode)
+        results, errors, cascade_report = await _parse_text(
+            text, model_specs, use_cache, fallback, sectioned, cascade
+        )
 
         if not results and errors:
             # Surface per-model errors instead of a generic 500 so clients can act on them
-            return JSONResponse(
+            status_code = 502
+            return _json_response(
+                ParseResponse(
+                    results=[],
+                    errors=errors,
+                    extraction_ms=extraction_ms,
+                    normalization=normalization,
+                    cascade=cascade_report,
+                ),
                 status_code=502,
-                content=ParseResponse(results=[], errors=errors).model_dump(),
+                exclude_none=exclude_none,
             )
         elif not results:
             # No errors recorded (unexpected) but also no results
@@ -114,25 +289,412 @@ async def parse_resume_endpoint(
                 detail="All model calls failed. Check API keys and model availability.",
             )
         
-        # Clean up temp file
-        os.remove(temp_path)
-        
-        print(f"Returning {len(results)} results and {len(errors)} errors")
-        if results:
-            print(f"First result preview: {str(results[0])[:200]}...")
-        
-        return ParseResponse(results=results, errors=errors)
+        logger.info("Returning %s results and %s errors", len(results), len(errors))
+        response = _json_response(
+            ParseResponse(
+                results=results,
+                errors=errors,
+                extraction_ms=extraction_ms,
+                normalization=normalization,
+                cascade=cascade_report,
+            ),
+            exclude=exclude,
+            exclude_none=exclude_none,
+        )
+        status_code = 200
+        return response
         
+    except HTTPException as e:
+        status_code = e.status_code
+        raise
     except Exception as e:
-        # Clean up temp file on error
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
         raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
+    finally:
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, file_type=file_type, status=str(status_code))
+
+
+def _sse_event(event: str, data) -> str:
+    """Format one Server-Sent Event; data (a pydantic model or a JSON value) is encoded on a single line."""
+    payload = data.model_dump_json() if isinstance(data, BaseModel) else json_codec.dumps(data).decode()
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+@app.post("/api/parse/stream")
+async def parse_resume_stream_endpoint(
+    file: UploadFile = File(...),
+    models: Optional[str] = Query(
+        None,
+        description="Comma-separated list of provider:model (e.g., openai:gpt-4o,gemini:gemini-1.5-pro-latest)",
+    ),
+    use_cache: bool = Query(
+        True,
+        alias="cache",
+        description="Set to false to bypass the parse result cache and force fresh model calls",
+    ),
+    partial: bool = Query(
+        False,
+        description="Also stream raw partial output tokens as 'delta' events (OpenAI and Hugging Face models)",
+    ),
+    fast: bool = Query(
+        False,
+        description="Emit the instant rule-based extraction as the first 'result' event",
+    ),
+    fallback: Optional[bool] = Query(
+        None,
+        description="Emit the rule-based extraction if every model fails (default: RULE_BASED_FALLBACK env, on)",
+    ),
+):
+    """
+    Parse a resume and stream each model's outcome as a Server-Sent Event as soon as it finishes.
+
+    Events: 'start' (extraction_ms, normalization, models), optional 'delta' ({provider, model_name, delta}),
+    'result' (ParsedModelResult), 'error' (ModelError) and a final 'done' with counts.
+    Deltas are a best-effort preview: a Hugging Face provider fallback restarts the output.
+    With fast=true the rule-based tier (provider 'rules') is sent as a 'result' right after 'start'.
+    """
+    text, extraction_ms, normalization = await _extract_upload_text(file)
+    try:
+        model_specs = parse_model_specs(models)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def _events():
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def _run(spec):
+            on_delta = None
+            if partial:
+                def on_delta(delta: str, spec=spec):
+                    queue.put_nowait(("delta", spec, delta))
+            try:
+                result = await parse_with_model(text, spec, use_cache=use_cache, on_delta=on_delta)
+                queue.put_nowait(("result", spec, result))
+            except Exception as e:
+                logger.error("Model call failed for provider=%s model=%s: %s", spec.provider, spec.model_name, e)
+                queue.put_nowait(("error", spec, e))
+
+        tasks = [asyncio.create_task(_run(spec)) for spec in model_specs]
+        results = errors = 0
+        try:
+            yield _sse_event(
+                "start",
+                {
+                    "extraction_ms": extraction_ms,
+                    "normalization": normalization.model_dump() if normalization else None,
+                    "models": [spec.model_dump(mode="json") for spec in model_specs],
+                },
+            )
+            rule_results = 0
+            if fast:
+                rule_results += 1
+                yield _sse_event("result", parse_with_rules(text))
+            while results + errors < len(tasks):
+                kind, spec, payload = await queue.get()
+                if kind == "delta":
+                    yield _sse_event(
+                        "delta",
+                        {"provider": spec.provider.value, "model_name": spec.model_name, "delta": payload},
+                    )
+                elif kind == "result":
+                    results += 1
+                    yield _sse_event("result", payload)
+                else:
+                    errors += 1
+                    error = ModelError(provider=spec.provider, model_name=spec.model_name, message=str(payload))
+                    yield _sse_event("error", error)
+            use_fallback = rule_fallback_enabled() if fallback is None else fallback
+            if not results and errors and use_fallback and not fast:
+                rule_results += 1
+                metrics.RULE_FALLBACKS.inc()
+                yield _sse_event("result", parse_with_rules(text))
+            yield _sse_event("done", {"results": results + rule_results, "errors": errors})
+        finally:
+            # Client disconnected (or stream finished): stop any model calls still running
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _read_batch_upload(upload: UploadFile, filename: str, limit: int) -> bytes:
+    """Read an upload, refusing it with 413 once it is known to exceed limit bytes."""
+    size = getattr(upload, "size", None)
+    if size is None or size <= limit:
+        # Read one byte past the limit: the declared size may be missing or wrong
+        content = await upload.read(limit + 1)
+        if len(content) <= limit:
+            return content
+    raise HTTPException(status_code=413, detail=f"{filename} exceeds {limit} bytes")
+
+
+def _expand_batch_upload(
+    filename: str, content: bytes, max_files: int = BATCH_MAX_FILES, max_bytes: int = BATCH_MAX_TOTAL_BYTES
+) -> List[Tuple[str, bytes]]:
+    """
+    Return (filename, bytes) pairs for an uploaded file, expanding zip archives.
+    max_files and max_bytes are what is left of the batch's budgets. A zip archive's entry count and
+    declared uncompressed sizes are checked against them before any entry is decompressed.
+    """
+    if not filename.lower().endswith(".zip"):
+        return [(filename, content)]
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            infos = []
+            for info in archive.infolist():
+                name = info.filename
+                if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+                    continue
+                if os.path.splitext(name)[1].lower() not in ALLOWED_EXTENSIONS:
+                    continue
+                if info.file_size > BATCH_MAX_FILE_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"{filename}:{name} exceeds {BATCH_MAX_FILE_BYTES} bytes uncompressed",
+                    )
+                infos.append(info)
+            if len(infos) > max_files:
+                raise HTTPException(status_code=413, detail=f"Batch exceeds BATCH_MAX_FILES ({BATCH_MAX_FILES})")
+            if sum(info.file_size for info in infos) > max_bytes:
+                raise HTTPException(
+                    status_code=413, detail=f"Batch exceeds BATCH_MAX_TOTAL_BYTES ({BATCH_MAX_TOTAL_BYTES})"
+                )
+            # zipfile stops decompressing an entry at its declared size, so these reads stay within budget
+            return [(f"{filename}:{info.filename}", archive.read(info)) for info in infos]
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail=f"{filename} is not a valid zip archive")
+
+
+async def _parse_batch_item(
+    filename: str,
+    content: bytes,
+    model_specs,
+    use_cache: bool,
+    fallback: Optional[bool] = None,
+    cascade: Optional[bool] = None,
+) -> BatchFileResult:
+    file_ext = os.path.splitext(filename)[1].lower()
+    try:
+        text, extraction_ms = await get_extraction_pool().extract(content, file_ext, block=True)
+    except asyncio.TimeoutError:
+        return BatchFileResult(filename=filename, errors=[ModelError(message="Text extraction timed out")])
+    except Exception as e:
+        return BatchFileResult(filename=filename, errors=[ModelError(message=str(e))])
+
+    if not text or len(text.strip()) < 50:
+        return BatchFileResult(
+            filename=filename,
+            extraction_ms=extraction_ms,
+            errors=[ModelError(message="Could not extract sufficient text from the file. File may be corrupted or empty.")],
+        )
+
+    text, normalization = _normalize_text(text, file_ext)
+    results, errors, cascade_report = await _parse_text(text, model_specs, use_cache, fallback, cascade=cascade)
+    return BatchFileResult(
+        filename=filename,
+        results=results,
+        errors=errors,
+        extraction_ms=extraction_ms,
+        normalization=normalization,
+        cascade=cascade_report,
+    )
+
+
+@app.post("/api/parse/batch", response_model=BatchParseResponse)
+async def parse_batch_endpoint(
+    files: List[UploadFile] = File(...),
+    models: Optional[str] = Query(
+        None,
+        description="Comma-separated list of provider:model applied to every file",
+    ),
+    use_cache: bool = Query(
+        True,
+        alias="cache",
+        description="Set to false to bypass the parse result cache and force fresh model calls",
+    ),
+    fallback: Optional[bool] = Query(
+        None,
+        description="Return the rule-based extraction for files where every model fails",
+    ),
+    cascade: Optional[bool] = Query(
+        None, description="Parse each file cheap model first, as in /api/parse (default: CASCADE_ENABLED env, off)"
+    ),
+    include_raw: bool = Query(True, description="Set to false to omit each result's raw_response"),
+    fields: Optional[str] = Query(None, description="Comma-separated result fields to return; others are omitted"),
+    exclude_none: bool = Query(False, description="Omit null values from the response"),
+):
+    """
+    Parse many resumes in one request. Accepts multiple files and/or zip archives of resumes.
+    Model calls across all files share the global per-provider concurrency limits.
+    """
+    excluded = _excluded_result_fields(include_raw, fields)
+    try:
+        model_specs = parse_model_specs(models)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    items: List[Tuple[str, bytes]] = []
+    total_bytes = 0
+    rejected: List[BatchFileResult] = []
+    for upload in files:
+        filename = upload.filename or "upload"
+        file_ext = os.path.splitext(filename)[1].lower()
+        if file_ext != ".zip" and file_ext not in ALLOWED_EXTENSIONS:
+            rejected.append(
+                BatchFileResult(
+                    filename=filename,
+                    errors=[ModelError(message=f"Unsupported file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}, .zip")],
+                )
+            )
+            continue
+        remaining_bytes = BATCH_MAX_TOTAL_BYTES - total_bytes
+        if file_ext == ".zip":
+            content = await _read_batch_upload(upload, filename, remaining_bytes)
+        else:
+            content = await _read_batch_upload(upload, filename, min(BATCH_MAX_FILE_BYTES, remaining_bytes))
+        expanded = _expand_batch_upload(filename, content, BATCH_MAX_FILES - len(items), remaining_bytes)
+        if len(items) + len(expanded) > BATCH_MAX_FILES:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds BATCH_MAX_FILES ({BATCH_MAX_FILES})")
+        total_bytes += sum(len(item_content) for _, item_content in expanded)
+        items.extend(expanded)
+
+    file_results = await asyncio.gather(
+        *[
+            _parse_batch_item(filename, content, model_specs, use_cache, fallback, cascade)
+            for filename, content in items
+        ]
+    )
+    file_results = rejected + list(file_results)
+    failed = sum(1 for item in file_results if not item.results)
+    logger.info("Batch parsed %s files (%s failed)", len(file_results), failed)
+    return _json_response(
+        BatchParseResponse(
+            files=file_results,
+            total_files=len(file_results),
+            succeeded=len(file_results) - failed,
+            failed=failed,
+        ),
+        exclude={"files": {"__all__": {"results": {"__all__": excluded}}}} if excluded else None,
+        exclude_none=exclude_none,
+    )
+
+@app.post("/api/jobs", response_model=JobStatus, status_code=202)
+async def submit_job(
+    file: UploadFile = File(...),
+    models: Optional[str] = Query(
+        None,
+        description="Comma-separated list of provider:model (e.g., openai:gpt-4o,gemini:gemini-1.5-pro-latest)",
+    ),
+    priority: int = Query(0, description="Higher priority jobs run first"),
+    use_cache: bool = Query(
+        True,
+        alias="cache",
+        description="Set to false to bypass the parse result cache and force fresh model calls",
+    ),
+):
+    """
+    Submit a resume for background parsing. Poll GET /api/jobs/{job_id} for the result.
+    """
+    # Validate model specs now so bad requests fail fast instead of as failed jobs
+    try:
+        parse_model_specs(models)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    text, extraction_ms, _ = await _extract_upload_text(file)
+
+    scheduler = get_job_scheduler()
+    job_id = await asyncio.to_thread(
+        scheduler.store.create,
+        text,
+        models,
+        priority,
+        file.filename,
+        use_cache,
+        extraction_ms,
+    )
+    scheduler.notify()
+    return _json_response(await asyncio.to_thread(scheduler.store.get, job_id), status_code=202)
+
+@app.get("/api/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    job = await asyncio.to_thread(get_job_scheduler().store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _json_response(job)
+
+@app.delete("/api/jobs/{job_id}", response_model=JobStatus)
+async def cancel_job(job_id: str):
+    scheduler = get_job_scheduler()
+    previous = await scheduler.cancel(job_id)
+    if previous is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if previous not in (JobState.QUEUED, JobState.RUNNING):
+        raise HTTPException(status_code=409, detail=f"Job already {previous.value}")
+    return _json_response(await asyncio.to_thread(scheduler.store.get, job_id))
+
+@app.get("/api/jobs")
+async def job_stats():
+    return await asyncio.to_thread(get_job_scheduler().stats)
+
+@app.on_event("startup")
+async def start_workers():
+    await get_job_scheduler().start()
+
+async def _warm_up_providers():
+    try:
+        specs = parse_model_specs(os.getenv("WARMUP_MODELS"))
+        warmed = await warm_up_providers(specs)
+        logger.info("Provider clients warmed up for: %s", ", ".join(warmed) or "none")
+    except Exception as e:
+        logger.warning("Provider warm-up failed: %s", e)
+
+@app.on_event("startup")
+async def start_warm_up():
+    if provider_warmup_enabled():
+        # In the background so health checks are answered while SDKs load
+        app.state.warm_up_task = asyncio.create_task(_warm_up_providers())
+
+@app.on_event("shutdown")
+async def shutdown_workers():
+    await get_job_scheduler().stop()
+    shutdown_extraction_pool()
+    await close_clients()
+
+@app.get("/api/limits")
+async def limits_stats():
+    return {"limiters": rate_limiter_stats()}
+
+@app.get("/api/extraction/stats")
+async def extraction_stats():
+    return get_extraction_pool().stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus scrape endpoint: latency, token, cost and error metrics for this worker."""
+    return PlainTextResponse(metrics.render_metrics(), media_type="text/plain; version=0.0.4")
 
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    cache = get_result_cache()
+    if cache is None:
+        return {"backend": "disabled"}
+    return cache.stats()
+
+@app.delete("/api/cache")
+async def clear_cache():
+    cache = get_result_cache()
+    if cache is not None:
+        cache.clear()
+    return {"status": "cleared"}
+
 # Serve frontend static files if they exist (for combined deployment)
 frontend_dist = Path(__file__).parent.parent / "frontend" / "dist"
 if frontend_dist.exists():
@@ -91,12 +91,14 @@ class ResumeData(BaseModel):
     # Metadata
     confidence_score: Optional[float] = Field(None, ge=0.0, le=1.0)
     extraction_notes: Optional[str] = None
+    output_truncated: bool = False  # the model's output was cut off at max_tokens; later fields are missing
 
 
 class ModelProvider(str, Enum):
     OPENAI = "openai"
     HUGGINGFACE = "huggingface"
     GEMINI = "gemini"
+    RULES = "rules"  # local regex/heuristic extraction, no model call
 
 
 class ModelSpec(BaseModel):
@@ -107,6 +109,13 @@ class ModelSpec(BaseModel):
     inference_provider: Optional[str] = None
 
 
+class TokenUsage(BaseModel):
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # prompt tokens served from the provider's prompt cache (subset of prompt_tokens)
+    estimated: bool = False  # provider reported no usage; counts are a ~4 chars/token estimate
+
+
 class ParsedModelResult(BaseModel):
     provider: ModelProvider
     model_name: str
@@ -115,7 +124,9 @@ class ParsedModelResult(BaseModel):
     latency_ms: Optional[int] = None  # end-to-end parse latency
     api_latency_ms: Optional[int] = None  # model API call latency only
     cost_usd: Optional[float] = None
+    usage: Optional[TokenUsage] = None  # tokens billed for this result (None for cache hits and rule-based results)
     raw_response: Optional[Dict[str, Any]] = None
+    cache_hit: bool = False  # served from the parse result cache (no model call, no cost)
 
 
 class ModelError(BaseModel):
@@ -124,6 +135,75 @@ class ModelError(BaseModel):
     message: str
 
 
+class TextNormalization(BaseModel):
+    """What the normalization stage removed from the extracted text before model calls."""
+    original_chars: int
+    normalized_chars: int
+    tokens_before: int  # approximate (~4 chars per token)
+    tokens_after: int
+    tokens_saved: int
+    header_footer_lines_removed: int = 0
+    boilerplate_lines_removed: int = 0  # page numbers, rules, 'References available upon request', ...
+    hyphenations_rejoined: int = 0
+    normalization_ms: float = 0.0
+
+
+class CascadeTier(str, Enum):
+    CHEAP = "cheap"
+    EXPENSIVE = "expensive"
+
+
+class CascadeReport(BaseModel):
+    """How a cheap-first cascade answered: which tier's results were returned and what that cost."""
+    tier: Optional[CascadeTier] = None  # None when neither tier answered
+    cheap_model: str
+    expensive_models: List[str] = []
+    escalated: bool = False
+    escalation_reason: Optional[str] = None  # error, truncated, confidence or completeness
+    cheap_confidence: Optional[float] = None
+    cheap_completeness: Optional[float] = None
+    cost_usd: Optional[float] = None  # spent on both tiers
+    expensive_cost_usd: Optional[float] = None  # what running only the expensive models cost, or would have
+    cost_saved_usd: Optional[float] = None  # expensive_cost_usd - cost_usd; negative when the cheap call was wasted
+
+
 class ParseResponse(BaseModel):
     results: List[ParsedModelResult] = []
     errors: List[ModelError] = []
+    extraction_ms: Optional[int] = None  # text extraction time, reported separately from model latency
+    normalization: Optional[TextNormalization] = None
+    cascade: Optional[CascadeReport] = None  # set when the request ran as a cheap-first cascade
+
+
+class BatchFileResult(ParseResponse):
+    filename: str
+
+
+class BatchParseResponse(BaseModel):
+    files: List[BatchFileResult] = []
+    total_files: int = 0
+    succeeded: int = 0
+    failed: int = 0
+
+
+class JobState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: JobState
+    priority: int = 0
+    filename: Optional[str] = None
+    models: Optional[str] = None
+    attempts: int = 0
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    extraction_ms: Optional[int] = None
+    result: Optional[ParseResponse] = None
+    error: Optional[str] = None
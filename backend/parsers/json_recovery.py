@@ -0,0 +1,175 @@
+"""
+Tolerant decoding of the JSON object in a model's output.
+
+Models wrap JSON in code fences, prepend <think> blocks or prose, append commentary, and stop
+mid-object when they hit max_tokens. recover_json_object handles all of these without retrying the
+decoder on successively different slices. It decodes straight from the first opening brace, which
+ignores whatever follows the object, in C. A token scan in Python only runs to skip past a candidate
+that is not JSON at all, such as a brace in prose.
+
+A cut-off object is decoded member by member, each complete member in one C call, keeping only
+complete values. A number cut short ("graduation_year": 20) is dropped rather than kept, and so is
+a list item still being written when the output stopped: it may lack required fields, which would
+fail validation of the whole resume.
+"""
+import json
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from services import json_codec
+
+# How the object was obtained
+EXACT = "exact"  # the output (less code fences) was the JSON object
+EXTRACTED = "extracted"  # a complete object was found inside surrounding text
+REPAIRED = "repaired"  # the output was cut off; incomplete trailing values were dropped and containers closed
+
+# Tokens the scanner stops at: a whole string literal (matched by the regex engine, escapes included,
+# possibly unterminated at a cutoff, even one that falls between a backslash and the character it
+# escapes), a bracket or a comma. Everything else is skipped
+_TOKEN_RE = re.compile(r'"(?:[^"\\]+|\\.)*(?:\\\Z)?"?|[{}\[\],]')
+_OPENERS = "{["
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+# A failed number or literal followed by one of these was malformed rather than cut off
+_SCALAR_END_RE = re.compile(r"[\s,}\]]")
+_DECODER = json.JSONDecoder()
+# Opening braces tried as the start of the object before giving up (prose can contain braces)
+MAX_START_CANDIDATES = 16
+
+
+def strip_code_fences(content: str) -> str:
+    content = content.strip()
+    if content.startswith("```json"):
+        content = content[7:]
+    if content.startswith("```"):
+        content = content[3:]
+    if content.endswith("```"):
+        content = content[:-3]
+    return content.strip()
+
+
+def _strip_think(content: str) -> str:
+    """Drop reasoning blocks some models emit before the answer. An unclosed block leaves nothing."""
+    if "<think>" not in content:
+        return content
+    end = content.rfind("</think>")
+    return content[end + len("</think>") :] if end != -1 else ""
+
+
+def _object_end(content: str, start: int) -> Optional[int]:
+    """
+    Index just past the balanced braces/brackets opening at content[start], or past the first
+    mismatched closer; None if the text ends first. Brackets inside strings are ignored.
+    """
+    depth = 0
+    for match in _TOKEN_RE.finditer(content, start):
+        char = match.group()[0]
+        if char in _OPENERS:
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth <= 0:
+                return match.end()
+    return None
+
+
+def _skip_whitespace(content: str, pos: int) -> int:
+    return _WHITESPACE_RE.match(content, pos).end()
+
+
+def _decode_truncated(content: str, pos: int) -> Any:
+    """
+    Decode the object or array opening at content[pos] whose text was cut off, keeping only complete
+    values. Complete members are decoded in C one at a time; the member the text ends in is descended
+    into if it is an object's value, and dropped if it is a list item (it may lack required fields)
+    or a scalar. A number at the very end is dropped too, as it may have been cut short. Raises
+    ValueError if the text is not a valid but unfinished document.
+    """
+    is_object = content[pos] == "{"
+    members: Any = {} if is_object else []
+    pos += 1
+    while True:
+        pos = _skip_whitespace(content, pos)
+        if pos == len(content):
+            return members
+        key = None
+        if is_object:
+            if content[pos] != '"':
+                raise ValueError(f"Expected a key at {pos}")
+            try:
+                key, pos = _DECODER.raw_decode(content, pos)
+            except ValueError:
+                return members  # cut off inside the key
+            pos = _skip_whitespace(content, pos)
+            if pos == len(content):
+                return members
+            if content[pos] != ":":
+                raise ValueError(f"Expected ':' at {pos}")
+            pos = _skip_whitespace(content, pos + 1)
+            if pos == len(content):
+                return members
+        try:
+            value, end = _DECODER.raw_decode(content, pos)
+        except ValueError:
+            if content[pos] in _OPENERS:
+                if is_object:
+                    members[key] = _decode_truncated(content, pos)
+                else:
+                    _decode_truncated(content, pos)  # still checked, so malformed JSON is rejected
+                return members
+            if content[pos] == '"':
+                cut_off = _TOKEN_RE.match(content, pos).end() == len(content)
+            else:
+                cut_off = not _SCALAR_END_RE.search(content, pos)
+            if not cut_off:
+                raise
+            return members  # cut off inside a string or literal
+        if end == len(content) and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return members  # a number that runs to the cutoff may have been cut short
+        if is_object:
+            members[key] = value
+        else:
+            members.append(value)
+        pos = _skip_whitespace(content, end)
+        if pos < len(content):
+            if content[pos] != ",":
+                raise ValueError(f"Expected ',' at {pos}")
+            pos += 1
+
+
+def recover_json_object(content: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Decode the JSON object in a model's output. Returns (object, how), how being EXACT,
+    EXTRACTED or REPAIRED. Raises ValueError when the output holds no recoverable object.
+    """
+    content = strip_code_fences(content or "")
+    try:
+        value = json_codec.loads(content)
+        if isinstance(value, dict):
+            return value, EXACT
+    except ValueError:
+        pass
+
+    content = _strip_think(content)
+    start = content.find("{")
+    for _ in range(MAX_START_CANDIDATES):
+        if start == -1:
+            break
+        try:
+            # Decodes one value from start and ignores whatever follows it
+            value, _ = _DECODER.raw_decode(content, start)
+            if isinstance(value, dict) and value:
+                return value, EXTRACTED
+        except ValueError:
+            try:
+                # Succeeds only if the rest of the text is a valid but unfinished document
+                value = _decode_truncated(content, start)
+                if isinstance(value, dict) and value:
+                    return value, REPAIRED
+            except ValueError:
+                pass
+        end = _object_end(content, start)
+        if end is None:
+            # The text ran out inside this candidate; any later brace is nested in it
+            break
+        start = content.find("{", end)
+    raise ValueError("No JSON object found in model output")
@@ -0,0 +1,200 @@
+import importlib.util
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# pdfplumber is optional (requires Rust compilation, may fail on some platforms).
+# PDF libraries are imported on first use: the API process itself never extracts when the
+# extraction pool runs in worker processes.
+PDFPLUMBER_AVAILABLE = importlib.util.find_spec("pdfplumber") is not None
+
+# A PyPDF2.PdfReader
+PdfReader = Any
+
+logger = logging.getLogger("uvicorn.error")
+
+# Pages past this are not extracted (portfolio PDFs can run to hundreds of pages of images)
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "100"))
+
+# Pages with at least this many distinct fonts are treated as complex layouts (tables, columns, sidebars)
+PDF_COMPLEX_FONTS = int(os.getenv("PDF_COMPLEX_FONTS", "4"))
+
+# Engine callables get the open file, the reader the probe already built, and the page indices to extract;
+# they yield text per requested page, in order, so callers can stop early
+PageExtractor = Callable[[BinaryIO, PdfReader, Sequence[int]], Iterable[str]]
+
+
+@dataclass
+class PdfProbe:
+    """Cheap structural facts about a PDF, read from page dictionaries without decoding content streams."""
+
+    page_count: int
+    text_pages: List[int] = field(default_factory=list)  # pages whose resources can draw text
+    max_fonts_per_page: int = 0
+    has_form_xobjects: bool = False
+
+    @property
+    def has_text_layer(self) -> bool:
+        return bool(self.text_pages)
+
+    @property
+    def complex_layout(self) -> bool:
+        return self.has_form_xobjects or self.max_fonts_per_page >= PDF_COMPLEX_FONTS
+
+
+@dataclass
+class PdfEngine:
+    name: str
+    cost: int  # relative cost per page; the cheapest adequate engine wins
+    extract_pages: PageExtractor
+    handles_complex_layout: bool = False
+
+
+PDF_ENGINES: Dict[str, PdfEngine] = {}
+
+
+def register_pdf_engine(engine: PdfEngine) -> None:
+    PDF_ENGINES[engine.name] = engine
+
+
+def _resource_dict(page, name: str) -> dict:
+    resources = page.get("/Resources")
+    resources = resources.get_object() if resources is not None else {}
+    entry = resources.get(name)
+    return entry.get_object() if entry is not None else {}
+
+
+def open_pdf(file: BinaryIO) -> PdfReader:
+    import PyPDF2
+
+    return PyPDF2.PdfReader(file)
+
+
+def pdf_page_count(reader: PdfReader) -> int:
+    """Pages that will be extracted, after the PDF_MAX_PAGES cap."""
+    return min(len(reader.pages), PDF_MAX_PAGES)
+
+
+def probe_pdf(reader: PdfReader, pages: Optional[range] = None) -> PdfProbe:
+    """
+    Inspect page resources: a page without fonts (directly or in a form XObject) has no text
+    layer, so scanned or blank pages are known to be empty before any text is extracted.
+    Only the given page range is inspected (default: every page up to PDF_MAX_PAGES).
+    """
+    probe = PdfProbe(page_count=len(reader.pages))
+    for index in pages if pages is not None else range(pdf_page_count(reader)):
+        page = reader.pages[index]
+        fonts = _resource_dict(page, "/Font")
+        forms = [
+            name
+            for name, xobject in _resource_dict(page, "/XObject").items()
+            if xobject.get_object().get("/Subtype") == "/Form"
+        ]
+        if fonts or forms:
+            probe.text_pages.append(index)
+        probe.max_fonts_per_page = max(probe.max_fonts_per_page, len(fonts))
+        probe.has_form_xobjects = probe.has_form_xobjects or bool(forms)
+    return probe
+
+
+def _pypdf2_pages(file: BinaryIO, reader: PdfReader, pages: Sequence[int]) -> Iterator[str]:
+    for index in pages:
+        yield reader.pages[index].extract_text() or ""
+
+
+def _pdfplumber_pages(file: BinaryIO, reader: PdfReader, pages: Sequence[int]) -> Iterator[str]:
+    import pdfplumber
+
+    file.seek(0)
+    with pdfplumber.open(file) as pdf:
+        for index in pages:
+            page = pdf.pages[index]
+            yield page.extract_text() or ""
+            # pdfplumber caches parsed layout objects per page; drop them so memory stays flat
+            page.close()
+
+
+register_pdf_engine(PdfEngine("pypdf2", cost=1, extract_pages=_pypdf2_pages))
+if PDFPLUMBER_AVAILABLE:
+    register_pdf_engine(PdfEngine("pdfplumber", cost=5, extract_pages=_pdfplumber_pages, handles_complex_layout=True))
+
+
+def engine_candidates(probe: PdfProbe) -> List[PdfEngine]:
+    """
+    Engines to try, best first. PDF_ENGINE forces one engine; otherwise simple layouts go to
+    the cheapest engine and complex layouts to the cheapest one that handles them, with the
+    rest kept as fallbacks in cost order.
+    """
+    forced = os.getenv("PDF_ENGINE", "auto").lower()
+    if forced != "auto":
+        if forced not in PDF_ENGINES:
+            raise ValueError(f"Unknown PDF_ENGINE '{forced}'. Available: {', '.join(sorted(PDF_ENGINES))}")
+        return [PDF_ENGINES[forced]]
+    engines = sorted(PDF_ENGINES.values(), key=lambda engine: engine.cost)
+    if probe.complex_layout:
+        engines.sort(key=lambda engine: not engine.handles_complex_layout)
+    return engines
+
+
+def iter_pdf_pages(
+    file: BinaryIO,
+    engine: Optional[PdfEngine] = None,
+    start: int = 0,
+    stop: Optional[int] = None,
+    reader: Optional[PdfReader] = None,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page_index, text) for pages in [start, stop) that have text, in page order, using the
+    cheapest adequate engine; stop defaults to the last page, and pages past PDF_MAX_PAGES are
+    never extracted. Pages without a text layer are skipped without being handed to any engine;
+    a PDF with no text layer at all (e.g. scanned) is parsed once, by the probe.
+    An engine that yields no text falls through to the next one. Pass reader to reuse an
+    already opened PDF.
+    """
+    reader = reader or open_pdf(file)
+    if len(reader.pages) > PDF_MAX_PAGES and start == 0:
+        logger.warning(
+            "PDF has %s pages; extracting only the first %s (PDF_MAX_PAGES)", len(reader.pages), PDF_MAX_PAGES
+        )
+    stop = pdf_page_count(reader) if stop is None else min(stop, pdf_page_count(reader))
+    probe = probe_pdf(reader, range(start, stop))
+    if not probe.has_text_layer:
+        return
+
+    engines = [engine] if engine else engine_candidates(probe)
+    errors: List[Exception] = []
+    for candidate in engines:
+        yielded = False
+        try:
+            for index, text in zip(probe.text_pages, candidate.extract_pages(file, reader, probe.text_pages)):
+                if text.strip():
+                    yielded = True
+                    yield index, text
+        except Exception as e:
+            if yielded:
+                # Pages already went downstream; switching engines now would duplicate them
+                raise
+            logger.warning("PDF engine %s failed: %s", candidate.name, e)
+            errors.append(e)
+            continue
+        if yielded:
+            return
+    if len(errors) == len(engines):
+        raise errors[-1]
+
+
+def extract_pdf_pages(
+    file: BinaryIO,
+    engine: Optional[PdfEngine] = None,
+    start: int = 0,
+    stop: Optional[int] = None,
+    reader: Optional[PdfReader] = None,
+) -> List[str]:
+    """Text of every page in [start, stop) (see iter_pdf_pages); pages without text are empty strings."""
+    reader = reader or open_pdf(file)
+    stop = pdf_page_count(reader) if stop is None else min(stop, pdf_page_count(reader))
+    pages = [""] * max(0, stop - start)
+    for index, text in iter_pdf_pages(file, engine, start, stop, reader):
+        pages[index - start] = text
+    return pages
@@ -1,18 +1,13 @@
 import os
-import json
 import asyncio
+import importlib
 import time
-from openai import OpenAI
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple, Callable
 import sys
 from pathlib import Path
 import logging
 from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
-import google.generativeai as genai
-import google.auth
-import requests
-import re
 
 # Load environment variables
 load_dotenv()
@@ -39,23 +34,36 @@ from models.resume_models import (
     ModelProvider,
     ParsedModelResult,
     ModelError,
+    TokenUsage,
+    CascadeReport,
+    CascadeTier,
 )
-from dateutil import parser as date_parser
-import re
-
-# Initialize OpenAI client (will use OPENAI_API_KEY from env)
-client = None
+from services.result_cache import get_result_cache, make_cache_key, prompt_version
+from services.provider_limits import (
+    DEFAULT_OUTPUT_TOKEN_ESTIMATE,
+    get_rate_limiter,
+    is_transient_error,
+    rate_limit_retry_after,
+    transient_retry_delay,
+)
+from services.http_clients import client_registry, get_http_client, install_hf_client_factory, pool_limits
+from services import metrics
+from parsers.json_recovery import EXACT, REPAIRED, recover_json_object
+from parsers.rule_extractor import extract_with_rules
+from parsers.section_chunker import SECTION_PROMPTS, SectionChunk, merge_section_results, plan_section_chunks
+from pydantic import ValidationError
 
 DEFAULT_MODEL_STRINGS = [
     "openai:gpt-4o",
     "openai:gpt-5.1",
 ]
 
-# Approximate $/1k token rates for cost estimation (update as needed)
+# Approximate $/1k token rates for cost estimation (update as needed).
+# "cached_input" prices prompt tokens served from the provider's prompt cache (defaults to "input").
 MODEL_RATES_USD = {
-    ("openai", "gpt-4o", None): {"input": 0.005, "output": 0.015},
-    ("openai", "gpt-5.1", None): {"input": 0.003, "output": 0.01},
-    ("gemini", "gemini-3-pro-preview", None): {"input": 0.001, "output": 0.005},
+    ("openai", "gpt-4o", None): {"input": 0.005, "cached_input": 0.0025, "output": 0.015},
+    ("openai", "gpt-5.1", None): {"input": 0.003, "cached_input": 0.0003, "output": 0.01},
+    ("gemini", "gemini-3-pro-preview", None): {"input": 0.001, "cached_input": 0.0001, "output": 0.005},
     # Hugging Face OSS via providers (per-model, per-provider)
     ("huggingface", "openai/gpt-oss-120b", "groq"): {"input": 0.00027, "output": 0.00027},  # $0.27 / 1M
     ("huggingface", "deepseek-ai/deepseek-v3", "together"): {"input": 0.0003, "output": 0.0003},  # $0.20–0.40 / 1M
@@ -71,8 +79,18 @@ MODEL_DISPLAY_NAMES = {
     "huggingface:Qwen/Qwen3-235B-A22B": "Qwen3-235B-A22B",
     "huggingface:openai/gpt-oss-120b": "GPT-OSS-120B",
     "gemini:gemini-3-pro-preview": "Gemini 3 Pro Preview",
+    "rules:rule-based": "Rule-based (fast)",
 }
 
+# Spec for the local rule-based tier (instant preview and fallback when every model fails)
+RULES_MODEL_STRING = "rules:rule-based"
+
+# Cheap-first cascade: this model answers first, and the requested models only run when its result
+# falls short of the thresholds (see parse_with_cascade)
+DEFAULT_CASCADE_CHEAP_MODEL = "huggingface+groq:openai/gpt-oss-120b"
+DEFAULT_CASCADE_MIN_CONFIDENCE = 0.75
+DEFAULT_CASCADE_MIN_COMPLETENESS = 0.8
+
 # Some hosted models require a specific provider on Hugging Face Inference
 MODEL_PROVIDER_HINTS = {
     "deepseek-ai/deepseek-v3": "together",
@@ -83,19 +101,29 @@ MODEL_PROVIDER_HINTS = {
 }
 
 def get_client():
-    """Lazy initialization of OpenAI client"""
-    global client
-    if client is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key or api_key == "your_openai_api_key_here":
-            raise ValueError("OPENAI_API_KEY not set. Please set it in backend/.env file")
+    """
+    Lazy initialization of the shared async OpenAI client (honours OPENAI_BASE_URL for compatible endpoints).
+    The client lives in the pooled client registry so keep-alive connections are reused across requests.
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key or api_key == "your_openai_api_key_here":
+        raise ValueError("OPENAI_API_KEY not set. Please set it in backend/.env file")
+
+    def _build():
+        # Imported on first use: the SDK adds ~0.5s to cold start and may not be needed at all
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        # _call_provider retries 429s (through the rate limiter) and transient failures itself; SDK
+        # retries on top would multiply the attempts and bypass the limiter's budgets
         # Initialize client with explicit parameters to avoid proxy issues
-        client = OpenAI(
+        return AsyncOpenAI(
             api_key=api_key,
             timeout=60.0,
-            max_retries=3
+            max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "0")),
+            http_client=DefaultAsyncHttpxClient(limits=pool_limits("openai")),
         )
-    return client
+
+    return client_registry.get_or_create(("openai",), _build)
 
 
 def _normalize_provider_name(name: Optional[str]) -> Optional[str]:
@@ -106,21 +134,31 @@ def _normalize_provider_name(name: Optional[str]) -> Optional[str]:
 
 def get_hf_client(inference_provider: Optional[str] = None):
     """
-    Build a fresh Hugging Face Inference client per call.
-    Some providers are not thread-safe, so we avoid sharing a global client across concurrent requests.
+    Shared async Hugging Face Inference client for an inference provider, kept in the pooled client
+    registry so its connections are reused across calls and fallback attempts.
+    HUGGINGFACE_BASE_URL points the client at a custom (e.g. local mock) OpenAI-compatible endpoint.
     """
     api_key = os.getenv("HUGGINGFACE_API_KEY")
     if not api_key or api_key == "your_huggingface_token_here":
         raise ValueError("HUGGINGFACE_API_KEY not set. Please set it in backend/.env file")
 
     provider = _normalize_provider_name(inference_provider or os.getenv("HUGGINGFACE_PROVIDER"))
-    client_kwargs: Dict[str, Any] = {"token": api_key}
-    if provider:
+    client_kwargs: Dict[str, Any] = {"token": api_key, "timeout": 120}
+    base_url = os.getenv("HUGGINGFACE_BASE_URL")
+    if base_url:
+        client_kwargs["base_url"] = base_url
+    elif provider:
         client_kwargs["provider"] = provider
 
-    logger.info("Initializing Hugging Face InferenceClient with provider=%s", provider or "default")
+    def _build():
+        from huggingface_hub import AsyncInferenceClient
+
+        install_hf_client_factory()
+        logger.info("Initializing Hugging Face AsyncInferenceClient with provider=%s", provider or "default")
+        return AsyncInferenceClient(**client_kwargs)
+
     try:
-        return InferenceClient(**client_kwargs)
+        return client_registry.get_or_create(("huggingface", provider or "default"), _build)
     except Exception as e:
         logger.exception("Failed to initialize Hugging Face InferenceClient: %s", e)
         raise
@@ -274,22 +312,17 @@ Return ONLY valid JSON matching this structure:
 
 Return ONLY the JSON object, no additional text or markdown formatting."""
 
-def _strip_code_fences(content: str) -> str:
-    content = content.strip()
-    if content.startswith("```json"):
-        content = content[7:]
-    if content.startswith("```"):
-        content = content[3:]
-    if content.endswith("```"):
-        content = content[:-3]
-    return content.strip()
-
+# Cache-key prompt identity for sectioned parses (changes whenever any section prompt changes)
+SECTIONED_PROMPT_VERSION = "sectioned\n" + "\n".join(SECTION_PROMPTS[group] for group in sorted(SECTION_PROMPTS))
 
 def _estimate_tokens_from_text(text: str) -> int:
     # Rough heuristic: ~4 characters per token
     return max(1, int(len(text) / 4))
 
 
+# extraction_notes of a resume recovered from output cut off at max_tokens
+TRUNCATED_OUTPUT_NOTE = "Model output was cut off; fields after the cutoff are missing."
+
 LIST_FIELDS = [
     "education",
     "experience",
@@ -313,11 +346,18 @@ PROVIDER_ALIASES = {
 
 DEFAULT_HF_PROVIDER_PRIORITY = ["groq", "together", "fireworks-ai", "hf-inference"]
 
+# Hedged Hugging Face calls: HUGGINGFACE_HEDGE_MODE is 'off' (sequential fallback), 'fixed' (start the next
+# provider after HUGGINGFACE_HEDGE_DELAY_MS) or 'p95' (after the running provider's recent p95 latency)
+HF_HEDGE_MIN_SAMPLES = 20
+_hf_latencies: Dict[Tuple[str, Optional[str]], deque] = {}
+
 
 def _normalize_parsed_json(parsed_json: Dict[str, Any]) -> Dict[str, Any]:
     """
     Guard against providers returning null/atoms for list fields by coercing to lists.
     This avoids pydantic validation errors when multiple model results are aggregated.
+    Done on the decoded dict rather than in a ResumeData validator: a Python-level validator
+    would make model_validate_json materialize the document first, slowing every cache hit.
     """
     for field in LIST_FIELDS:
         if field not in parsed_json or parsed_json[field] is None:
@@ -327,49 +367,189 @@ def _normalize_parsed_json(parsed_json: Dict[str, Any]) -> Dict[str, Any]:
     return parsed_json
 
 
+def _loads_model_json(content: str, provider: str, model_name: str) -> Dict[str, Any]:
+    """
+    Decode a model's JSON output, recovering it from think blocks, surrounding text or a
+    max_tokens cutoff (see parsers/json_recovery.py). A cut-off output becomes a partial
+    resume, flagged by output_truncated and in extraction_notes, rather than a failed call.
+    """
+    if not content or not content.strip():
+        raise ValueError(f"Empty response from {provider} model '{model_name}'")
+    try:
+        parsed_json, how = recover_json_object(content)
+    except ValueError as e:
+        raise ValueError(
+            f"Failed to parse JSON from {provider} response. Raw content (truncated): {content[:500]}"
+        ) from e
+    if how != EXACT:
+        logger.warning("Recovered JSON (%s) from %s response for model '%s'", how, provider, model_name)
+        metrics.MODEL_JSON_RECOVERIES.inc(provider=provider, model=model_name, method=how)
+    # Set here only: a model echoing the field back must not mark a complete answer as cut off
+    parsed_json["output_truncated"] = how == REPAIRED
+    if how == REPAIRED:
+        # The cutoff may have come before contact_info, which ResumeData requires
+        parsed_json.setdefault("contact_info", {})
+        notes = parsed_json.get("extraction_notes")
+        parsed_json["extraction_notes"] = f"{notes} {TRUNCATED_OUTPUT_NOTE}" if notes else TRUNCATED_OUTPUT_NOTE
+    return parsed_json
+
+
 def _json_to_resume(parsed_json: Dict[str, Any]) -> ResumeData:
     parsed_json = _normalize_parsed_json(parsed_json)
-    resume_data = ResumeData(**parsed_json)
+    resume_data = ResumeData.model_validate(parsed_json)
     # Ensure confidence score is populated
     if not resume_data.confidence_score:
         resume_data.confidence_score = calculate_confidence_score(resume_data)
     return resume_data
 
 
-def _estimate_cost(provider: str, model_name: str, inference_provider: Optional[str], prompt_text: str, parsed_json: Dict[str, Any]) -> Optional[float]:
+def _estimate_cost(
+    provider: str, model_name: str, inference_provider: Optional[str], usage: TokenUsage
+) -> Optional[float]:
+    """Cost of one call from its token usage, pricing cached prompt tokens at the cached rate."""
     key = (provider.lower(), model_name.lower(), inference_provider.lower() if inference_provider else None)
     rates = MODEL_RATES_USD.get(key)
     if not rates:
         return None
-    input_tokens = _estimate_tokens_from_text(prompt_text)
-    output_tokens = _estimate_tokens_from_text(json.dumps(parsed_json))
-    cost = (input_tokens / 1000.0) * rates["input"] + (output_tokens / 1000.0) * rates["output"]
+    cached_tokens = min(usage.cached_tokens, usage.prompt_tokens)
+    input_tokens = usage.prompt_tokens - cached_tokens
+    output_tokens = usage.completion_tokens
+    cost = (
+        (input_tokens / 1000.0) * rates["input"]
+        + (cached_tokens / 1000.0) * rates.get("cached_input", rates["input"])
+        + (output_tokens / 1000.0) * rates["output"]
+    )
     return round(cost, 6)
 
 
-def _call_openai(text: str, model_name: str) -> Dict[str, Any]:
+def _usage_field(obj: Any, name: str) -> Any:
+    # SDK usage objects are attribute-based; HF outputs and raw JSON are dicts
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _openai_usage(usage: Any) -> Optional[TokenUsage]:
+    """TokenUsage from an OpenAI-compatible usage block (OpenAI SDK or Hugging Face output)."""
+    if usage is None or _usage_field(usage, "prompt_tokens") is None:
+        return None
+    details = _usage_field(usage, "prompt_tokens_details")
+    return TokenUsage(
+        prompt_tokens=_usage_field(usage, "prompt_tokens") or 0,
+        completion_tokens=_usage_field(usage, "completion_tokens") or 0,
+        cached_tokens=_usage_field(details, "cached_tokens") or 0,
+    )
+
+
+def _estimated_usage(prompt: str, text: str, content: str) -> TokenUsage:
+    """Heuristic usage for providers that report none (~4 chars/token over what was actually sent and received)."""
+    return TokenUsage(
+        prompt_tokens=_estimate_tokens_from_text(prompt) + _estimate_tokens_from_text(_user_message(text)),
+        completion_tokens=_estimate_tokens_from_text(content or ""),
+        estimated=True,
+    )
+
+
+def sum_usage(usages: List[TokenUsage]) -> TokenUsage:
+    return TokenUsage(
+        prompt_tokens=sum(usage.prompt_tokens for usage in usages),
+        completion_tokens=sum(usage.completion_tokens for usage in usages),
+        cached_tokens=sum(usage.cached_tokens for usage in usages),
+        estimated=any(usage.estimated for usage in usages),
+    )
+
+
+def _gemini_usage(metadata: Optional[Dict[str, Any]]) -> Optional[TokenUsage]:
+    if not metadata or metadata.get("promptTokenCount") is None:
+        return None
+    return TokenUsage(
+        prompt_tokens=metadata.get("promptTokenCount") or 0,
+        # Thinking tokens are billed as output
+        completion_tokens=(metadata.get("candidatesTokenCount") or 0) + (metadata.get("thoughtsTokenCount") or 0),
+        cached_tokens=metadata.get("cachedContentTokenCount") or 0,
+    )
+
+
+# Receives partial output text as it streams from providers that support token streaming
+DeltaCallback = Callable[[str], None]
+
+
+async def _collect_stream(stream, on_delta: DeltaCallback) -> Tuple[str, Optional[TokenUsage]]:
+    """
+    Drain an OpenAI-compatible chat completion stream, forwarding each text delta.
+    Returns (content, usage); usage comes from the final chunk when requested via stream_options.
+    """
+    parts: List[str] = []
+    usage = None
+    async for chunk in stream:
+        if getattr(chunk, "usage", None):
+            usage = _openai_usage(chunk.usage)
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            on_delta(delta)
+    return "".join(parts), usage
+
+
+# Ask streaming endpoints to append a usage chunk so streamed calls are metered like the others
+STREAM_OPTIONS = {"include_usage": True}
+
+
+def _user_message(text: str) -> str:
+    # The static system prompt always comes first and the resume last, so every request for a
+    # given prompt shares a byte-identical prefix that provider-side prompt caches can reuse
+    return f"Parse this resume:\n\n{text}"
+
+
+async def _call_openai(
+    text: str, model_name: str, on_delta: Optional[DeltaCallback] = None, prompt: str = EXTRACTION_PROMPT
+) -> Tuple[Dict[str, Any], TokenUsage]:
     client = get_client()
-    response = client.chat.completions.create(
+    create_kwargs = dict(
         model=model_name,
         messages=[
-            {"role": "system", "content": EXTRACTION_PROMPT},
-            {"role": "user", "content": f"Parse this resume:\n\n{text}"},
+            {"role": "system", "content": prompt},
+            {"role": "user", "content": _user_message(text)},
         ],
         temperature=0.1,
         response_format={"type": "json_object"},
     )
-    content = response.choices[0].message.content
-    content = _strip_code_fences(content)
-    parsed_json = json.loads(content)
-    return parsed_json
-
-
-def _hf_chat_completion(text: str, model_name: str, provider_for_call: Optional[str]) -> Dict[str, Any]:
+    if os.getenv("OPENAI_PROMPT_CACHE_KEY", "true").lower() in ("1", "true", "yes"):
+        # Routes requests sharing this prompt to the same cache shard, raising the cached-token hit rate
+        create_kwargs["prompt_cache_key"] = f"resume-parser-{prompt_version(prompt)}"
+    # Raw responses expose x-ratelimit-* headers, which keep the adaptive rate limiter in sync
+    limiter = get_rate_limiter("openai", model_name)
+    if on_delta is None:
+        raw = await client.chat.completions.with_raw_response.create(**create_kwargs)
+        limiter.update_from_headers(raw.headers)
+        completion = raw.parse()
+        content = completion.choices[0].message.content
+        usage = _openai_usage(completion.usage)
+    else:
+        raw = await client.chat.completions.with_raw_response.create(
+            stream=True, stream_options=STREAM_OPTIONS, **create_kwargs
+        )
+        limiter.update_from_headers(raw.headers)
+        content, usage = await _collect_stream(raw.parse(), on_delta)
+    parsed_json = _loads_model_json(content, "openai", model_name)
+    return parsed_json, usage or _estimated_usage(prompt, text, content)
+
+
+async def _hf_chat_completion(
+    text: str,
+    model_name: str,
+    provider_for_call: Optional[str],
+    on_delta: Optional[DeltaCallback] = None,
+    prompt: str = EXTRACTION_PROMPT,
+) -> Tuple[Dict[str, Any], TokenUsage]:
     """Single chat completion attempt against a specific provider."""
     logger.info("Calling Hugging Face model '%s' (provider=%s)", model_name, provider_for_call or "default")
     hf_client = get_hf_client(inference_provider=provider_for_call)
 
-    full_prompt = f"{EXTRACTION_PROMPT}\n\nParse this resume:\n\n{text}"
     supports_chat = (
         hasattr(hf_client, "chat")
         and hasattr(hf_client.chat, "completions")
@@ -383,16 +563,25 @@ def _hf_chat_completion(text: str, model_name: str, provider_for_call: Optional[
                 "Upgrade huggingface_hub to >=0.23 and ensure the InferenceClient exposes chat.completions."
             )
 
-        response = hf_client.chat.completions.create(
+        create_kwargs = dict(
             model=model_name,
             messages=[
-                {"role": "system", "content": EXTRACTION_PROMPT},
-                {"role": "user", "content": f"Parse this resume:\n\n{text}"},
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": _user_message(text)},
             ],
             temperature=0.1,
             max_tokens=4000,
             response_format={"type": "json_object"},
         )
+        if on_delta is None:
+            response = await hf_client.chat.completions.create(**create_kwargs)
+            content = response.choices[0].message.content
+            usage = _openai_usage(response.usage)
+        else:
+            content, usage = await _collect_stream(
+                await hf_client.chat.completions.create(stream=True, stream_options=STREAM_OPTIONS, **create_kwargs),
+                on_delta,
+            )
         logger.info("Hugging Face chat completion received for model '%s'", model_name)
     except Exception as e:
         msg = str(e)
@@ -417,8 +606,6 @@ def _hf_chat_completion(text: str, model_name: str, provider_for_call: Optional[
         logger.exception("Hugging Face call failed for model '%s': %s", model_name, msg)
         raise ValueError(f"Hugging Face chat completion failed: {msg}") from e
 
-    content = response.choices[0].message.content
-
     if isinstance(content, list):
         # Providers may return a list of content parts; join text portions only
         content = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
@@ -426,89 +613,114 @@ def _hf_chat_completion(text: str, model_name: str, provider_for_call: Optional[
     if not isinstance(content, str):
         raise ValueError(f"Unexpected Hugging Face response format: {content}")
 
-    content = _strip_code_fences(content)
+    return _loads_model_json(content, "huggingface", model_name), usage or _estimated_usage(prompt, text, content)
 
-    try:
-        parsed_json = json.loads(content)
-    except json.JSONDecodeError as e:
-        # Try to recover by extracting the first JSON object in the text
-        logger.warning("JSON parse failed for Hugging Face response from '%s'; attempting to recover", model_name)
-        # Remove think blocks that some models prepend
-        content_no_think = re.sub(r"<think>.*?</think>", "", content, flags=re.DOTALL).strip()
-        if content_no_think != content:
-            try:
-                parsed_json = json.loads(content_no_think)
-                logger.info("Recovered JSON from Hugging Face response for model '%s' after stripping <think>", model_name)
-                return parsed_json
-            except json.JSONDecodeError:
-                content = content_no_think
-        # Strategy 1: take the substring from first '{' to last '}' (helps if trailing text is appended)
-        first = content.find("{")
-        last = content.rfind("}")
-        if first != -1 and last != -1 and last > first:
-            candidate = content[first : last + 1]
-            try:
-                parsed_json = json.loads(candidate)
-                logger.info("Recovered JSON from Hugging Face response for model '%s' using bracket slice", model_name)
-                return parsed_json
-            except json.JSONDecodeError:
-                pass
-
-        # Strategy 2: regex for the first JSON-like object
-        match = re.search(r"\{.*\}", content, re.DOTALL)
-        if match:
-            try:
-                parsed_json = json.loads(match.group(0))
-                logger.info("Recovered JSON from Hugging Face response for model '%s' using regex extract", model_name)
-                return parsed_json
-            except json.JSONDecodeError:
-                pass
-        raise ValueError(
-            f"Failed to parse JSON from Hugging Face response. Raw content (truncated): {content[:500]}"
-        ) from e
 
-    return parsed_json
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://aiplatform.googleapis.com")
 
+# Opt-in explicit context caching: with GEMINI_CACHE_PARENT set (e.g. projects/<id>/locations/<region>),
+# each system prompt is uploaded once as a cachedContents resource and referenced by name afterwards,
+# so its tokens are billed at the cached rate. Without it Gemini's implicit prefix caching still applies.
+GEMINI_CACHE_PARENT = os.getenv("GEMINI_CACHE_PARENT")
+GEMINI_CACHE_TTL_SECONDS = int(os.getenv("GEMINI_CACHE_TTL_SECONDS", "3600"))
+# Do not retry creating a cache for this long after a failure (e.g. prompt below the minimum cache size)
+GEMINI_CACHE_RETRY_SECONDS = 300
+_gemini_cached_contents: Dict[Tuple[str, str], Tuple[Optional[str], float]] = {}
+# One creation per (model, prompt) at a time, so a burst of cold requests uploads the prompt once
+_gemini_cache_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+
+def _gemini_generate_endpoint(model_name: str) -> str:
+    # Cached contents are regional: requests that reference one must go to the location that holds it
+    if GEMINI_CACHE_PARENT:
+        return f"{GEMINI_API_BASE}/v1/{GEMINI_CACHE_PARENT}/publishers/google/models/{model_name}:generateContent"
+    return f"{GEMINI_API_BASE}/v1/publishers/google/models/{model_name}:generateContent"
+
+
+async def _gemini_cached_content(model_name: str, prompt: str, api_key: str) -> Optional[str]:
+    """Name of a live cachedContents resource holding prompt for model_name, creating it if needed."""
+    if not GEMINI_CACHE_PARENT:
+        return None
+    key = (model_name, prompt_version(prompt))
+    lock = _gemini_cache_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        now = time.time()
+        entry = _gemini_cached_contents.get(key)
+        # Refresh a minute early so a handle never expires mid-request
+        if entry and entry[1] > now + 60:
+            return entry[0]
+        return await _create_gemini_cached_content(key, model_name, prompt, api_key, now)
+
+
+async def _create_gemini_cached_content(
+    key: Tuple[str, str], model_name: str, prompt: str, api_key: str, now: float
+) -> Optional[str]:
+    try:
+        resp = await get_http_client("gemini").post(
+            f"{GEMINI_API_BASE}/v1/{GEMINI_CACHE_PARENT}/cachedContents?key={api_key}",
+            headers={"Content-Type": "application/json"},
+            json={
+                "model": f"{GEMINI_CACHE_PARENT}/publishers/google/models/{model_name}",
+                "systemInstruction": {"parts": [{"text": prompt}]},
+                "ttl": f"{GEMINI_CACHE_TTL_SECONDS}s",
+            },
+        )
+        resp.raise_for_status()
+        name = resp.json()["name"]
+        _gemini_cached_contents[key] = (name, now + GEMINI_CACHE_TTL_SECONDS)
+        logger.info("Created Gemini cached content %s for %s", name, model_name)
+        return name
+    except Exception as e:
+        logger.warning("Gemini context cache unavailable for %s, sending the full prompt: %s", model_name, e)
+        _gemini_cached_contents[key] = (None, now + GEMINI_CACHE_RETRY_SECONDS)
+        return None
 
-def _call_gemini(text: str, model_name: str) -> Dict[str, Any]:
-    def _parse_content_text(content: str, source: str) -> Dict[str, Any]:
-        content = content or ""
-        content_clean = _strip_code_fences(content)
-        if not content_clean:
-            raise ValueError(f"Empty response from Gemini ({source})")
-        try:
-            return json.loads(content_clean)
-        except json.JSONDecodeError as e:
-            raise ValueError(
-                f"Failed to parse JSON from Gemini response ({source}). Raw content (truncated): {content_clean[:500]}"
-            ) from e
 
+async def _call_gemini(
+    text: str, model_name: str, prompt: str = EXTRACTION_PROMPT
+) -> Tuple[Dict[str, Any], TokenUsage]:
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key or api_key == "your_gemini_api_key_here":
         raise ValueError("GEMINI_API_KEY not set. Please set it in backend/.env file")
 
     logger.info("Gemini API key call to %s via Vertex REST", model_name)
     try:
-        endpoint = f"https://aiplatform.googleapis.com/v1/publishers/google/models/{model_name}:generateContent"
+        endpoint = _gemini_generate_endpoint(model_name)
         payload = {
             "contents": [
                 {
                     "role": "user",
-                    "parts": [{"text": f"Parse this resume:\n\n{text}"}],
+                    "parts": [{"text": _user_message(text)}],
                 }
             ],
-            "system_instruction": {"parts": [{"text": EXTRACTION_PROMPT}]},
             "generation_config": {
                 "temperature": 0.1,
                 "response_mime_type": "application/json",
             },
         }
-        resp = requests.post(
+        cached_content = await _gemini_cached_content(model_name, prompt, api_key)
+        if cached_content:
+            payload["cachedContent"] = cached_content
+        else:
+            payload["system_instruction"] = {"parts": [{"text": prompt}]}
+        resp = await get_http_client("gemini").post(
             f"{endpoint}?key={api_key}",
             headers={"Content-Type": "application/json"},
             json=payload,
-            timeout=120,
         )
+        if cached_content and resp.status_code in (400, 403, 404):
+            # The cache expired or was deleted server-side: back off from it like a failed creation (so
+            # concurrent requests do not each re-upload the prompt) and resend the full prompt
+            logger.warning("Gemini cached content %s rejected (%s); retrying without it", cached_content, resp.status_code)
+            retry_at = time.time() + GEMINI_CACHE_RETRY_SECONDS
+            _gemini_cached_contents[(model_name, prompt_version(prompt))] = (None, retry_at)
+            del payload["cachedContent"]
+            payload["system_instruction"] = {"parts": [{"text": prompt}]}
+            resp = await get_http_client("gemini").post(
+                f"{endpoint}?key={api_key}",
+                headers={"Content-Type": "application/json"},
+                json=payload,
+            )
         logger.info("Gemini API key call status: %s", resp.status_code)
         resp.raise_for_status()
         data = resp.json()
@@ -517,17 +729,15 @@ def _call_gemini(text: str, model_name: str) -> Dict[str, Any]:
             raise ValueError(f"Empty candidates from Gemini ({data})")
         text_parts = candidates[0].get("content", {}).get("parts", [])
         combined = "".join(p.get("text", "") for p in text_parts if isinstance(p, dict))
-        return _parse_content_text(combined, "api-key")
+        usage = _gemini_usage(data.get("usageMetadata")) or _estimated_usage(prompt, text, combined)
+        return _loads_model_json(combined, "gemini", model_name), usage
     except Exception as e:
         logger.exception("Gemini API key call failed for model %s: %s", model_name, e)
         raise ValueError(f"Gemini chat completion failed: {str(e)}") from e
 
 
-def _call_huggingface(text: str, model_name: str, inference_provider: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Call Hugging Face Inference Client chat completions API with provider priority fallback.
-    Based on: https://huggingface.co/docs/inference-providers/en/tasks/chat-completion
-    """
+def _hf_provider_candidates(model_name: str, inference_provider: Optional[str] = None) -> List[Optional[str]]:
+    """Inference providers to try for a model, in priority order; None (HF routing) comes last."""
     candidates: List[Optional[str]] = []
 
     def _add_candidate(p: Optional[str]):
@@ -556,51 +766,432 @@ def _call_huggingface(text: str, model_name: str, inference_provider: Optional[s
             _add_candidate(p)
 
     _add_candidate(None)
+    return candidates
+
+
+async def _call_huggingface(
+    text: str,
+    model_name: str,
+    inference_provider: Optional[str] = None,
+    on_delta: Optional[DeltaCallback] = None,
+    prompt: str = EXTRACTION_PROMPT,
+) -> Tuple[Dict[str, Any], TokenUsage]:
+    """
+    Call Hugging Face Inference Client chat completions API with provider priority fallback.
+    Based on: https://huggingface.co/docs/inference-providers/en/tasks/chat-completion
+    """
+    candidates = _hf_provider_candidates(model_name, inference_provider)
+
+    hedge_mode = os.getenv("HUGGINGFACE_HEDGE_MODE", "off").strip().lower()
+    # Streaming deltas from parallel attempts would interleave, so streamed calls stay sequential
+    if hedge_mode in ("fixed", "p95") and on_delta is None and len(candidates) > 1:
+        return await _call_huggingface_hedged(text, model_name, candidates, hedge_mode, prompt)
 
     errors: List[str] = []
+    failures: List[BaseException] = []
     for provider in candidates:
         try:
-            return _hf_chat_completion(text, model_name, provider)
+            return await _timed_hf_attempt(text, model_name, provider, on_delta, prompt)
         except ValueError as e:
             errors.append(f"{provider or 'auto'}: {e}")
+            failures.append(e)
+            metrics.HF_PROVIDER_FALLBACKS.inc(model=model_name, inference_provider=provider or "auto")
             continue
 
-    raise ValueError(
+    raise _hf_exhausted_error(model_name, candidates, errors) from _hf_exhausted_cause(failures)
+
+
+def _hf_exhausted_error(model_name: str, candidates: List[Optional[str]], errors: List[str]) -> ValueError:
+    return ValueError(
         f"All Hugging Face provider attempts failed for {model_name}. "
         f"Tried: {', '.join(str(p or 'auto') for p in candidates)}. "
         f"Errors: {' | '.join(errors)}"
     )
 
 
-async def parse_with_model(text: str, spec: ModelSpec) -> ParsedModelResult:
+def _hf_exhausted_cause(failures: List[BaseException]) -> Optional[BaseException]:
     """
-    Run parsing for a single model/provider pair.
+    Cause to chain onto the final error. When every candidate was rate limited it is the last 429, so
+    the rate limiter backs off and re-queues the call; otherwise the last failure that was not a 429
+    (re-queueing would just repeat a hard error).
     """
+    hard_failures = [failure for failure in failures if rate_limit_retry_after(failure) is None]
+    if hard_failures:
+        return hard_failures[-1]
+    return failures[-1] if failures else None
+
+
+async def _timed_hf_attempt(
+    text: str,
+    model_name: str,
+    provider: Optional[str],
+    on_delta: Optional[DeltaCallback] = None,
+    prompt: str = EXTRACTION_PROMPT,
+) -> Tuple[Dict[str, Any], TokenUsage]:
+    """Single provider attempt that records successful latencies for hedge-delay estimation."""
     started = time.perf_counter()
+    completion = await _hf_chat_completion(text, model_name, provider, on_delta, prompt)
+    key = (model_name.lower(), provider)
+    if key not in _hf_latencies:
+        _hf_latencies[key] = deque(maxlen=200)
+    _hf_latencies[key].append(time.perf_counter() - started)
+    return completion
+
+
+def _hf_hedge_delay(model_name: str, provider: Optional[str], hedge_mode: str) -> float:
+    """Seconds to wait on a running attempt before starting the next provider in parallel."""
+    fixed_delay = float(os.getenv("HUGGINGFACE_HEDGE_DELAY_MS", "5000")) / 1000.0
+    if hedge_mode == "p95":
+        samples = _hf_latencies.get((model_name.lower(), provider))
+        if samples and len(samples) >= HF_HEDGE_MIN_SAMPLES:
+            ordered = sorted(samples)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return fixed_delay
+
+
+async def _call_huggingface_hedged(
+    text: str, model_name: str, candidates: List[Optional[str]], hedge_mode: str, prompt: str = EXTRACTION_PROMPT
+) -> Tuple[Dict[str, Any], TokenUsage]:
+    """
+    Start the preferred provider; if it has not answered within the hedge delay, start the next
+    candidate in parallel (up to HUGGINGFACE_HEDGE_MAX_PARALLEL at once). A failed attempt triggers
+    the next candidate immediately. The first valid JSON wins and the remaining attempts are cancelled.
+    """
+    max_parallel = max(1, int(os.getenv("HUGGINGFACE_HEDGE_MAX_PARALLEL", "2")))
+    pending: Dict[asyncio.Task, Optional[str]] = {}
+    errors: List[str] = []
+    failures: List[BaseException] = []
+    next_index = 0
+    last_started: Optional[str] = None
+
+    def _launch() -> None:
+        nonlocal next_index, last_started
+        provider = candidates[next_index]
+        next_index += 1
+        last_started = provider
+        pending[asyncio.create_task(_timed_hf_attempt(text, model_name, provider, prompt=prompt))] = provider
+
+    _launch()
+    try:
+        while pending:
+            can_hedge = next_index < len(candidates) and len(pending) < max_parallel
+            timeout = _hf_hedge_delay(model_name, last_started, hedge_mode) if can_hedge else None
+            done, _ = await asyncio.wait(pending.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                logger.info(
+                    "Hedging Hugging Face call for '%s': %s slow after %.2fs, starting %s",
+                    model_name,
+                    last_started or "auto",
+                    timeout,
+                    candidates[next_index] or "auto",
+                )
+                metrics.HF_HEDGES.inc(model=model_name, inference_provider=candidates[next_index] or "auto")
+                _launch()
+                continue
+            for task in done:
+                provider = pending.pop(task)
+                try:
+                    return task.result()
+                except ValueError as e:
+                    errors.append(f"{provider or 'auto'}: {e}")
+                    failures.append(e)
+                    metrics.HF_PROVIDER_FALLBACKS.inc(model=model_name, inference_provider=provider or "auto")
+                    # Replace the failed attempt right away instead of waiting out the hedge delay
+                    if next_index < len(candidates) and len(pending) < max_parallel:
+                        _launch()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    raise _hf_exhausted_error(model_name, candidates, errors) from _hf_exhausted_cause(failures)
+
+
+def _cache_key_for(text: str, spec: ModelSpec, sectioned: bool = False) -> str:
+    # Sectioned parses use different prompts, so they are cached separately from whole-document parses
+    prompt = SECTIONED_PROMPT_VERSION if sectioned else EXTRACTION_PROMPT
+    return make_cache_key(
+        text,
+        spec.provider.value,
+        spec.model_name,
+        spec.inference_provider,
+        prompt,
+    )
+
+
+def parse_with_rules(text: str) -> ParsedModelResult:
+    """
+    Instant rule-based extraction (contact info, skills, summary and section boundaries).
+    No model call and no cost; detected sections are returned in raw_response.
+    """
+    started = time.perf_counter()
+    extraction = extract_with_rules(text)
+    parsed_json = extraction.to_resume_json()
+    try:
+        resume = _json_to_resume(parsed_json)
+    except ValidationError:
+        # Regex matches can still fail strict validation (e.g. EmailStr); drop contact fields rather than fail
+        parsed_json["contact_info"]["email"] = None
+        resume = _json_to_resume(parsed_json)
+    latency_ms = int((time.perf_counter() - started) * 1000)
+    return ParsedModelResult(
+        provider=ModelProvider.RULES,
+        model_name="rule-based",
+        resume=resume,
+        confidence=resume.confidence_score,
+        latency_ms=latency_ms,
+        api_latency_ms=0,
+        cost_usd=0.0,
+        raw_response={"sections": extraction.sections_json()},
+    )
+
+
+def rule_fallback_enabled() -> bool:
+    return os.getenv("RULE_BASED_FALLBACK", "true").lower() in ("1", "true", "yes")
+
+
+def provider_warmup_enabled() -> bool:
+    return os.getenv("PROVIDER_WARMUP", "true").lower() in ("1", "true", "yes")
+
+
+async def warm_up_providers(specs: List[ModelSpec]) -> List[str]:
+    """
+    Build the pooled clients the given models will use, so the first parse does not pay for SDK
+    imports and client construction. SDKs are imported in a worker thread to keep the event loop
+    responsive; models whose provider has no credentials are skipped. Returns the models warmed.
+    """
     loop = asyncio.get_running_loop()
+    warmed: List[str] = []
+    for spec in specs:
+        try:
+            if spec.provider == ModelProvider.OPENAI:
+                await loop.run_in_executor(None, importlib.import_module, "openai")
+                get_client()
+            elif spec.provider == ModelProvider.HUGGINGFACE:
+                await loop.run_in_executor(None, importlib.import_module, "huggingface_hub")
+                get_hf_client(_hf_provider_candidates(spec.model_name, spec.inference_provider)[0])
+            elif spec.provider == ModelProvider.GEMINI:
+                if not os.getenv("GEMINI_API_KEY"):
+                    raise ValueError("GEMINI_API_KEY not set")
+                get_http_client("gemini")
+            else:
+                continue
+        except ValueError as e:
+            logger.info("Skipping warm-up for %s:%s: %s", spec.provider.value, spec.model_name, e)
+            continue
+        warmed.append(f"{spec.provider.value}:{spec.model_name}")
+    return warmed
+
 
-    def _caller():
+def _metric_labels(spec: ModelSpec) -> Dict[str, Optional[str]]:
+    return {"provider": spec.provider.value, "model": spec.model_name, "inference_provider": spec.inference_provider}
+
+
+def _record_result_metrics(spec: ModelSpec, result: ParsedModelResult) -> None:
+    labels = _metric_labels(spec)
+    metrics.MODEL_RESULTS.inc(cache_hit=str(result.cache_hit).lower(), **labels)
+    metrics.MODEL_LATENCY_SECONDS.observe(result.latency_ms / 1000.0, **labels)
+    if result.cache_hit:
+        return
+    metrics.MODEL_API_LATENCY_SECONDS.observe((result.api_latency_ms or 0) / 1000.0, **labels)
+    metrics.MODEL_COST_USD.observe(result.cost_usd, **labels)
+    if result.usage:
+        metrics.MODEL_TOKENS.observe(result.usage.prompt_tokens, kind="prompt", **labels)
+        metrics.MODEL_TOKENS.observe(result.usage.completion_tokens, kind="completion", **labels)
+        metrics.MODEL_TOKENS.observe(result.usage.cached_tokens, kind="cached", **labels)
+
+
+async def _call_provider(
+    spec: ModelSpec, text: str, prompt: str = EXTRACTION_PROMPT, on_delta: Optional[DeltaCallback] = None
+) -> Tuple[Dict[str, Any], TokenUsage, int]:
+    """
+    One model call through the shared per provider+model rate limiter.
+    Returns (parsed_json, usage, api_latency_ms); usage is estimated when the provider did not report it.
+    Time spent queued in the limiter is not API latency. 429s shrink the limiter's concurrency and
+    re-queue the call instead of failing it. Transient failures (5xx, timeouts, dropped connections)
+    are retried with exponential backoff, up to TRANSIENT_MAX_RETRIES times, without holding a slot.
+    """
+    async def _caller():
         if spec.provider == ModelProvider.OPENAI:
-            return _call_openai(text, spec.model_name)
+            return await _call_openai(text, spec.model_name, on_delta, prompt)
         elif spec.provider == ModelProvider.HUGGINGFACE:
-            return _call_huggingface(text, spec.model_name, spec.inference_provider)
+            return await _call_huggingface(text, spec.model_name, spec.inference_provider, on_delta, prompt)
         elif spec.provider == ModelProvider.GEMINI:
-            return _call_gemini(text, spec.model_name)
+            return await _call_gemini(text, spec.model_name, prompt)
         else:
             raise ValueError(f"Unsupported provider {spec.provider}")
 
+    limiter = get_rate_limiter(spec.provider.value, spec.model_name)
+    estimated_tokens = (
+        _estimate_tokens_from_text(prompt) + _estimate_tokens_from_text(text) + DEFAULT_OUTPUT_TOKEN_ESTIMATE
+    )
+    max_rate_limit_retries = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "5"))
+    max_transient_retries = int(os.getenv("TRANSIENT_MAX_RETRIES", "3"))
+    attempt = 0
+    transient_attempt = 0
+    labels = _metric_labels(spec)
+    while True:
+        retry_delay = None
+        wait_start = time.perf_counter()
+        async with limiter.acquire(estimated_tokens):
+            api_start = time.perf_counter()
+            metrics.MODEL_QUEUE_WAIT_SECONDS.observe(api_start - wait_start, **labels)
+            try:
+                parsed_json, usage = await _caller()
+            except Exception as e:
+                rate_limit = rate_limit_retry_after(e)
+                if rate_limit is not None:
+                    if attempt >= max_rate_limit_retries:
+                        raise
+                    metrics.MODEL_RATE_LIMITED.inc(**labels)
+                    retry_after, headers = rate_limit
+                    limiter.update_from_headers(headers)
+                    limiter.on_rate_limited(retry_after)
+                    attempt += 1
+                    continue
+                if transient_attempt >= max_transient_retries or not is_transient_error(e):
+                    raise
+                retry_delay = transient_retry_delay(transient_attempt)
+                transient_attempt += 1
+                metrics.MODEL_TRANSIENT_RETRIES.inc(**labels)
+                logger.warning(
+                    "Transient failure from %s, retrying in %.1fs (%s/%s): %s",
+                    spec.model_name,
+                    retry_delay,
+                    transient_attempt,
+                    max_transient_retries,
+                    e,
+                )
+            else:
+                limiter.on_success()
+                if not usage.estimated:
+                    limiter.settle_tokens(estimated_tokens, usage.prompt_tokens + usage.completion_tokens)
+                return parsed_json, usage, int((time.perf_counter() - api_start) * 1000)
+        # Backed off outside the limiter, so other calls can use the slot meanwhile
+        await asyncio.sleep(retry_delay)
+
+
+def _plan_sectioned(text: str, sectioned: Optional[bool]) -> List[SectionChunk]:
+    """
+    Chunks for sectioned extraction, or [] to parse the whole document in one call.
+    sectioned=None means auto: on for texts of at least SECTIONED_MIN_CHARS (SECTIONED_EXTRACTION=auto),
+    SECTIONED_EXTRACTION=off|on forces the default. Documents without recognisable sections are never split.
+    """
+    if sectioned is None:
+        mode = os.getenv("SECTIONED_EXTRACTION", "auto").strip().lower()
+        if mode == "auto":
+            sectioned = len(text) >= int(os.getenv("SECTIONED_MIN_CHARS", "20000"))
+        else:
+            sectioned = mode in ("1", "true", "on", "yes")
+    if not sectioned:
+        return []
+    chunks = plan_section_chunks(text, int(os.getenv("SECTIONED_MAX_CHUNK_CHARS", "12000")))
+    return chunks if len(chunks) > 1 else []
+
+
+async def _parse_sectioned(
+    spec: ModelSpec, chunks: List[SectionChunk]
+) -> Tuple[Dict[str, Any], TokenUsage, int, Optional[float]]:
+    """
+    Send every chunk with its group's sub-prompt in parallel and merge the answers.
+    Returns (merged_json, usage, api_latency_ms, cost_usd); latency is wall time of the parallel calls,
+    so it tracks the slowest chunk rather than the document length.
+    """
     api_start = time.perf_counter()
-    parsed_json = await loop.run_in_executor(None, _caller)
+    responses = await asyncio.gather(
+        *[_call_provider(spec, chunk.text, SECTION_PROMPTS[chunk.group]) for chunk in chunks]
+    )
     api_latency_ms = int((time.perf_counter() - api_start) * 1000)
+    results = [parsed for parsed, _, _ in responses]
+    merged = merge_section_results(chunks, results)
+
+    usages = [usage for _, usage, _ in responses]
+    costs = [
+        _estimate_cost(spec.provider.value, spec.model_name, spec.inference_provider, usage) for usage in usages
+    ]
+    cost_usd = None if any(cost is None for cost in costs) else round(sum(costs), 6)
+    merged["sectioned_calls"] = [
+        {
+            "group": chunk.group,
+            "sections": chunk.sections,
+            "chars": len(chunk.text),
+            "api_latency_ms": latency,
+            "usage": usage.model_dump(),
+        }
+        for chunk, (_, usage, latency) in zip(chunks, responses)
+    ]
+    logger.info(
+        "Sectioned parse with %s: %s chunks, longest %s chars, %sms",
+        spec.model_name,
+        len(chunks),
+        max(len(chunk.text) for chunk in chunks),
+        api_latency_ms,
+    )
+    return merged, sum_usage(usages), api_latency_ms, cost_usd
 
-    resume = _json_to_resume(parsed_json)
-    total_latency_ms = int((time.perf_counter() - started) * 1000)
 
-    # Estimate cost when rates are known
-    prompt_text = f"{EXTRACTION_PROMPT}\n\nParse this resume:\n\n{text}"
-    cost_usd = _estimate_cost(spec.provider.value, spec.model_name, spec.inference_provider, prompt_text, parsed_json)
+async def parse_with_model(
+    text: str,
+    spec: ModelSpec,
+    use_cache: bool = True,
+    on_delta: Optional[DeltaCallback] = None,
+    sectioned: Optional[bool] = None,
+) -> ParsedModelResult:
+    """
+    Run parsing for a single model/provider pair.
+    Results are served from / stored in the parse result cache unless use_cache is False;
+    output cut off at max_tokens is never stored.
+    on_delta, if given, receives partial output as it streams (OpenAI and Hugging Face only;
+    Gemini, sectioned parses and cache hits deliver only the final result).
+    Long resumes are split by section and extracted in parallel (see _plan_sectioned).
+    """
+    if spec.provider == ModelProvider.RULES:
+        # Cheap enough that caching or rate limiting would only add overhead
+        result = parse_with_rules(text)
+        _record_result_metrics(spec, result)
+        return result
+
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    chunks = _plan_sectioned(text, sectioned)
+
+    cache = get_result_cache() if use_cache else None
+    cache_key = _cache_key_for(text, spec, sectioned=bool(chunks)) if cache else None
+    if cache:
+        cached = await loop.run_in_executor(None, cache.get, cache_key)
+        result = None
+        if cached is not None:
+            try:
+                # Validated straight from the stored JSON, without an intermediate dict
+                result = ParsedModelResult.model_validate_json(cached)
+            except ValidationError:
+                logger.warning("Discarding corrupt parse cache entry %s", cache_key)
+        if result is not None:
+            result.cache_hit = True
+            result.cost_usd = 0.0
+            result.api_latency_ms = 0
+            result.usage = None  # no tokens were spent on this request
+            result.latency_ms = int((time.perf_counter() - started) * 1000)
+            _record_result_metrics(spec, result)
+            return result
 
-    return ParsedModelResult(
+    try:
+        if chunks:
+            parsed_json, usage, api_latency_ms, cost_usd = await _parse_sectioned(spec, chunks)
+        else:
+            parsed_json, usage, api_latency_ms = await _call_provider(spec, text, EXTRACTION_PROMPT, on_delta)
+            # Estimate cost when rates are known
+            cost_usd = _estimate_cost(spec.provider.value, spec.model_name, spec.inference_provider, usage)
+        validation_start = time.perf_counter()
+        resume = _json_to_resume(parsed_json)
+        metrics.MODEL_VALIDATION_SECONDS.observe(time.perf_counter() - validation_start, **_metric_labels(spec))
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        metrics.MODEL_ERRORS.inc(**_metric_labels(spec))
+        raise
+    total_latency_ms = int((time.perf_counter() - started) * 1000)
+
+    result = ParsedModelResult(
         provider=spec.provider,
         model_name=spec.model_name,
         resume=resume,
@@ -608,8 +1199,205 @@ async def parse_with_model(text: str, spec: ModelSpec) -> ParsedModelResult:
         latency_ms=total_latency_ms,
         api_latency_ms=api_latency_ms,
         cost_usd=cost_usd,
+        usage=usage,
         raw_response=parsed_json,
     )
+    _record_result_metrics(spec, result)
+    if cache and resume.output_truncated:
+        # A partial answer should not be served for the cache TTL; the next upload tries again
+        logger.info("Not caching truncated result from %s", spec.model_name)
+    elif cache:
+        try:
+            await loop.run_in_executor(None, cache.set, cache_key, result.model_dump_json())
+        except Exception as e:
+            # A broken cache must never fail an otherwise successful parse
+            logger.warning("Failed to store parse result in cache: %s", e)
+    return result
+
+
+async def parse_with_models(
+    text: str,
+    specs: List[ModelSpec],
+    use_cache: bool = True,
+    fallback: Optional[bool] = None,
+    sectioned: Optional[bool] = None,
+) -> Tuple[List[ParsedModelResult], List[ModelError]]:
+    """
+    Run all requested models concurrently, splitting successes from per-model errors.
+    If every model fails and fallback is enabled (default: RULE_BASED_FALLBACK env, on),
+    the rule-based result is returned alongside the errors instead of nothing.
+    """
+    responses = await asyncio.gather(
+        *[parse_with_model(text, spec, use_cache=use_cache, sectioned=sectioned) for spec in specs],
+        return_exceptions=True,
+    )
+
+    results: List[ParsedModelResult] = []
+    errors: List[ModelError] = []
+    for spec, result in zip(specs, responses):
+        if isinstance(result, Exception):
+            logger.error("Model call failed for provider=%s model=%s: %s", spec.provider, spec.model_name, result)
+            errors.append(
+                ModelError(
+                    provider=spec.provider,
+                    model_name=spec.model_name,
+                    message=str(result),
+                )
+            )
+        else:
+            results.append(result)
+
+    if fallback is None:
+        fallback = rule_fallback_enabled()
+    if not results and errors and fallback:
+        logger.warning("All %s model calls failed; returning rule-based fallback result", len(errors))
+        metrics.RULE_FALLBACKS.inc()
+        results.append(parse_with_rules(text))
+    return results, errors
+
+
+def cascade_enabled() -> bool:
+    return os.getenv("CASCADE_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def _model_string(spec: ModelSpec) -> str:
+    provider = spec.provider.value
+    if spec.inference_provider:
+        provider = f"{provider}+{spec.inference_provider}"
+    return f"{provider}:{spec.model_name}"
+
+
+def schema_completeness(resume_data: ResumeData) -> float:
+    """Share of the core schema a resume fills: name, email or phone, experience, education and skills."""
+    contact = resume_data.contact_info
+    filled = [
+        bool(contact.name),
+        bool(contact.email or contact.phone),
+        bool(resume_data.experience),
+        bool(resume_data.education),
+        bool(resume_data.skills),
+    ]
+    return sum(filled) / len(filled)
+
+
+def _escalation_reason(result: ParsedModelResult) -> Optional[str]:
+    """Why a cheap-tier result is not good enough to return, or None to accept it."""
+    resume = result.resume
+    if resume.output_truncated:
+        return "truncated"
+    # Scored here rather than read from the resume: models may fill in confidence_score themselves
+    if calculate_confidence_score(resume) < float(
+        os.getenv("CASCADE_MIN_CONFIDENCE", str(DEFAULT_CASCADE_MIN_CONFIDENCE))
+    ):
+        return "confidence"
+    if schema_completeness(resume) < float(
+        os.getenv("CASCADE_MIN_COMPLETENESS", str(DEFAULT_CASCADE_MIN_COMPLETENESS))
+    ):
+        return "completeness"
+    return None
+
+
+def _total_cost(costs: List[Optional[float]]) -> Optional[float]:
+    return None if any(cost is None for cost in costs) else round(sum(costs), 6)
+
+
+def _expensive_cost_estimate(text: str, specs: List[ModelSpec], cheap: ParsedModelResult) -> Optional[float]:
+    """
+    What the expensive models would have cost for this resume, priced on the cheap call's tokens.
+    Without reported usage the input is sized from its length and the output is the limiter's estimate:
+    a cut-off or sparse cheap answer says little about how much an expensive model would write.
+    """
+    usage = cheap.usage if cheap.usage and not cheap.usage.estimated else None
+    if usage is None:
+        usage = TokenUsage(
+            prompt_tokens=_estimate_tokens_from_text(EXTRACTION_PROMPT)
+            + _estimate_tokens_from_text(_user_message(text)),
+            completion_tokens=DEFAULT_OUTPUT_TOKEN_ESTIMATE,
+            estimated=True,
+        )
+    return _total_cost(
+        [_estimate_cost(spec.provider.value, spec.model_name, spec.inference_provider, usage) for spec in specs]
+    )
+
+
+async def parse_with_cascade(
+    text: str,
+    specs: List[ModelSpec],
+    use_cache: bool = True,
+    fallback: Optional[bool] = None,
+    sectioned: Optional[bool] = None,
+) -> Tuple[List[ParsedModelResult], List[ModelError], Optional[CascadeReport]]:
+    """
+    Cheap-first cascade over specs. The cheap model (CASCADE_CHEAP_MODEL) parses first, and its result
+    is returned alone unless it failed, was cut off, scores below CASCADE_MIN_CONFIDENCE or fills less
+    than CASCADE_MIN_COMPLETENESS of the core schema. Only then do specs run (the expensive tier).
+    The report says which tier answered and what was saved against running only specs. If specs hold
+    nothing but the cheap model, this is parse_with_models and the report is None.
+    """
+    cheap_spec = parse_model_string(os.getenv("CASCADE_CHEAP_MODEL", DEFAULT_CASCADE_CHEAP_MODEL))
+    cheap_key = (cheap_spec.provider, cheap_spec.model_name.lower())
+    expensive = [spec for spec in specs if (spec.provider, spec.model_name.lower()) != cheap_key]
+    if not expensive:
+        results, errors = await parse_with_models(text, specs, use_cache, fallback, sectioned)
+        return results, errors, None
+
+    report = CascadeReport(
+        tier=CascadeTier.CHEAP,
+        cheap_model=_model_string(cheap_spec),
+        expensive_models=[_model_string(spec) for spec in expensive],
+    )
+    errors: List[ModelError] = []
+    cheap: Optional[ParsedModelResult] = None
+    try:
+        cheap = await parse_with_model(text, cheap_spec, use_cache=use_cache, sectioned=sectioned)
+    except Exception as e:
+        logger.warning("Cascade cheap tier %s failed, escalating: %s", report.cheap_model, e)
+        errors.append(ModelError(provider=cheap_spec.provider, model_name=cheap_spec.model_name, message=str(e)))
+        reason = "error"
+    else:
+        reason = _escalation_reason(cheap)
+        report.cheap_confidence = calculate_confidence_score(cheap.resume)
+        report.cheap_completeness = schema_completeness(cheap.resume)
+    # A failed cheap call is not priced; its provider may still bill for it
+    cheap_cost = cheap.cost_usd if cheap else 0.0
+
+    if reason is None:
+        results = [cheap]
+        report.cost_usd = cheap_cost
+        if cheap.cache_hit:
+            # Nothing was spent on either tier; the cache saved the cost, not the cascade
+            report.cost_saved_usd = 0.0
+        else:
+            report.expensive_cost_usd = _expensive_cost_estimate(text, expensive, cheap)
+    else:
+        logger.info("Cascade escalating to %s (%s)", ", ".join(report.expensive_models), reason)
+        report.escalated = True
+        report.escalation_reason = reason
+        results, expensive_errors = await parse_with_models(text, expensive, use_cache, False, sectioned)
+        errors.extend(expensive_errors)
+        if results:
+            report.tier = CascadeTier.EXPENSIVE
+            report.expensive_cost_usd = _total_cost([result.cost_usd for result in results])
+            report.cost_usd = _total_cost([cheap_cost, report.expensive_cost_usd])
+        elif cheap:
+            # A weak answer beats none: the expensive tier failed, so the cheap result stands
+            results = [cheap]
+            report.cost_usd = cheap_cost
+        else:
+            report.tier = None
+            if rule_fallback_enabled() if fallback is None else fallback:
+                logger.warning("Both cascade tiers failed; returning rule-based fallback result")
+                metrics.RULE_FALLBACKS.inc()
+                results = [parse_with_rules(text)]
+
+    if report.cost_usd is not None and report.expensive_cost_usd is not None:
+        report.cost_saved_usd = round(report.expensive_cost_usd - report.cost_usd, 6)
+    metrics.CASCADE_REQUESTS.inc(tier=report.tier.value if report.tier else "none", reason=reason or "accepted")
+    if report.cost_usd is not None:
+        metrics.CASCADE_COST_USD.inc(report.cost_usd, kind="spent")
+    if report.expensive_cost_usd is not None:
+        metrics.CASCADE_COST_USD.inc(report.expensive_cost_usd, kind="expensive")
+    return results, errors, report
 
 
 async def parse_resume(text: str, model_str: str = "openai:gpt-4o") -> ResumeData:
@@ -0,0 +1,237 @@
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Canonical section name -> header spellings (matched case-insensitively, trailing ':' ignored)
+SECTION_HEADERS: Dict[str, List[str]] = {
+    "summary": ["summary", "professional summary", "profile", "about me", "career summary", "overview"],
+    "objective": ["objective", "career objective", "professional objective"],
+    "experience": [
+        "experience",
+        "work experience",
+        "professional experience",
+        "employment",
+        "employment history",
+        "work history",
+        "career history",
+    ],
+    "education": ["education", "academic background", "academic qualifications", "qualifications"],
+    "skills": ["skills", "technical skills", "core competencies", "key skills", "competencies", "technologies"],
+    "certifications": ["certifications", "certificates", "licenses", "licenses and certifications"],
+    "awards": ["awards", "honors", "honours", "awards and honors", "achievements"],
+    "projects": ["projects", "personal projects", "key projects", "selected projects"],
+    "patents": ["patents", "patents and inventions"],
+    "publications": ["publications", "selected publications", "papers"],
+    "languages": ["languages", "language skills"],
+    "references": ["references"],
+    "interests": ["interests", "hobbies", "hobbies and interests"],
+}
+
+_HEADER_LOOKUP = {alias: name for name, aliases in SECTION_HEADERS.items() for alias in aliases}
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+# Fallback when phonenumbers finds nothing: 10-15 digits with common separators
+PHONE_RE = re.compile(r"(?<!\w)(\+?\d[\d\s().-]{8,18}\d)(?!\w)")
+# Employment dates that phone matchers read as numbers: "2018 - 2021", "03/2018 - 05/2020"
+DATE_RANGE_RE = re.compile(r"(?:\d{1,2}[/.])?(?:19|20)\d{2}\s*[-–—]\s*(?:\d{1,2}[/.])?(?:19|20)\d{2}")
+# What ContactInfo accepts as a phone number once formatting is stripped
+PHONE_DIGITS_RE = re.compile(r"\+?\d{10,15}")
+CITY_RE = re.compile(r"^([A-Z][A-Za-z .'-]{1,40}),\s*([A-Z]{2,3}|[A-Z][a-z]+(?: [A-Z][a-z]+)*)\b")
+NAME_RE = re.compile(r"^[A-Z][a-zA-Z'’.-]+(?: [A-Z][a-zA-Z'’.-]*){1,3}$")
+HEADER_CLEAN_RE = re.compile(r"[\s:|_\-–—=*#]+$")
+LIST_SPLIT_RE = re.compile(r"[,;|•·\n]")
+BULLET_RE = re.compile(r"^[\s\-*•·–]+")
+
+# Only the top of the resume is searched for name/city
+HEADER_LINES = 8
+
+# "City, Region" outside a contact line counts as a location only when the region is one of these:
+# any "Word, Word" line (a job title and employer, a skill list) would match otherwise
+REGION_CODES = {
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS",
+    "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC",
+    "ND", "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+    "AB", "BC", "MB", "NB", "NL", "NS", "ON", "PE", "QC", "SK", "UK", "US", "USA", "UAE",
+}
+REGION_NAMES = {
+    "alabama", "alaska", "arizona", "arkansas", "california", "colorado", "connecticut", "delaware",
+    "florida", "georgia", "hawaii", "idaho", "illinois", "indiana", "iowa", "kansas", "kentucky",
+    "louisiana", "maine", "maryland", "massachusetts", "michigan", "minnesota", "mississippi", "missouri",
+    "montana", "nebraska", "nevada", "new hampshire", "new jersey", "new mexico", "new york",
+    "north carolina", "north dakota", "ohio", "oklahoma", "oregon", "pennsylvania", "rhode island",
+    "south carolina", "south dakota", "tennessee", "texas", "utah", "vermont", "virginia", "washington",
+    "west virginia", "wisconsin", "wyoming", "alberta", "british columbia", "manitoba", "ontario", "quebec",
+    "nova scotia", "saskatchewan", "argentina", "australia", "austria", "bangladesh", "belgium", "brazil",
+    "canada", "chile", "china", "colombia", "czech republic", "denmark", "egypt", "england", "finland",
+    "france", "germany", "greece", "hong kong", "hungary", "india", "indonesia", "ireland", "israel",
+    "italy", "japan", "kenya", "malaysia", "mexico", "netherlands", "new zealand", "nigeria", "norway",
+    "pakistan", "peru", "philippines", "poland", "portugal", "romania", "scotland", "singapore",
+    "south africa", "south korea", "spain", "sri lanka", "sweden", "switzerland", "taiwan", "thailand",
+    "turkey", "ukraine", "united arab emirates", "united kingdom", "united states", "vietnam", "wales",
+}
+
+
+@dataclass
+class ResumeSection:
+    name: str
+    header: str
+    start_line: int  # line index of the header
+    end_line: int  # exclusive
+    text: str
+
+
+@dataclass
+class RuleExtraction:
+    contact_info: Dict[str, Optional[str]]
+    sections: List[ResumeSection] = field(default_factory=list)
+    skills: List[str] = field(default_factory=list)
+    languages: List[str] = field(default_factory=list)
+    summary: Optional[str] = None
+    objective: Optional[str] = None
+
+    def to_resume_json(self) -> Dict[str, Any]:
+        """Shape the extraction like the LLM output so it validates as ResumeData."""
+        return {
+            "contact_info": self.contact_info,
+            "skills": [{"name": skill} for skill in self.skills],
+            "languages": self.languages,
+            "summary": self.summary,
+            "objective": self.objective,
+            "extraction_notes": "Rule-based extraction (contact info, skills and section boundaries only)",
+        }
+
+    def sections_json(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": s.name, "header": s.header, "start_line": s.start_line, "end_line": s.end_line}
+            for s in self.sections
+        ]
+
+
+def match_section_header(line: str) -> Optional[str]:
+    """Return the canonical section name if the line looks like a section header."""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    cleaned = HEADER_CLEAN_RE.sub("", stripped).strip().lower()
+    cleaned = cleaned.replace("&", "and")
+    return _HEADER_LOOKUP.get(cleaned)
+
+
+def detect_sections(text: str) -> List[ResumeSection]:
+    """Split resume text into sections at recognised header lines. Text before the first header is 'header'."""
+    lines = text.splitlines()
+    boundaries = []
+    for index, line in enumerate(lines):
+        name = match_section_header(line)
+        if name:
+            boundaries.append((index, name, line.strip()))
+
+    sections: List[ResumeSection] = []
+    first_header = boundaries[0][0] if boundaries else len(lines)
+    if first_header > 0:
+        sections.append(ResumeSection("header", "", 0, first_header, "\n".join(lines[:first_header]).strip()))
+    for position, (start, name, header) in enumerate(boundaries):
+        end = boundaries[position + 1][0] if position + 1 < len(boundaries) else len(lines)
+        sections.append(ResumeSection(name, header, start, end, "\n".join(lines[start + 1 : end]).strip()))
+    return sections
+
+
+def extract_email(text: str) -> Optional[str]:
+    match = EMAIL_RE.search(text)
+    return match.group(0).rstrip(".") if match else None
+
+
+def extract_phone(text: str, region: Optional[str] = None) -> Optional[str]:
+    # Imported on first use; its metadata tables are a noticeable share of API startup time
+    import phonenumbers
+
+    region = region or os.getenv("DEFAULT_PHONE_REGION", "US")
+    # The first candidate is not always the phone: date ranges parse as valid numbers too
+    for match in phonenumbers.PhoneNumberMatcher(text, region, leniency=phonenumbers.Leniency.POSSIBLE):
+        if _is_phone_candidate(match.raw_string):
+            return match.raw_string
+    for match in PHONE_RE.finditer(text):
+        if _is_phone_candidate(match.group(1)):
+            return match.group(1).strip()
+    return None
+
+
+def _is_phone_candidate(raw: str) -> bool:
+    if DATE_RANGE_RE.fullmatch(raw.strip()):
+        return False
+    return PHONE_DIGITS_RE.fullmatch(re.sub(r"[\s\-().]", "", raw)) is not None
+
+
+def extract_name(header_lines: List[str]) -> Optional[str]:
+    for line in header_lines:
+        candidate = line.strip()
+        if not candidate or "@" in candidate or any(ch.isdigit() for ch in candidate):
+            continue
+        if match_section_header(candidate):
+            continue
+        if NAME_RE.match(candidate):
+            return candidate
+    return None
+
+
+def _is_known_region(region: str) -> bool:
+    return region in REGION_CODES or region.lower() in REGION_NAMES
+
+
+def extract_city(header_lines: List[str]) -> Optional[str]:
+    """
+    The city of the first "City, Region" in the header. On a contact line (one that also holds an
+    email or phone number) any region is accepted; elsewhere it must be a known state, province or country.
+    """
+    for line in header_lines:
+        contact_line = "@" in line or extract_phone(line) is not None
+        for part in re.split(r"\s*[|•·]\s*", line.strip()):
+            if "@" in part:
+                continue
+            match = CITY_RE.match(part)
+            if match and (contact_line or _is_known_region(match.group(2))):
+                return match.group(1).strip()
+    return None
+
+
+def _split_list(section_text: str) -> List[str]:
+    items = []
+    seen = set()
+    for raw in LIST_SPLIT_RE.split(section_text):
+        item = BULLET_RE.sub("", raw).strip().rstrip(".")
+        # Skip sentences; list sections are short comma/bullet separated items
+        if not item or len(item) > 60 or item.lower() in seen:
+            continue
+        seen.add(item.lower())
+        items.append(item)
+    return items
+
+
+def extract_with_rules(text: str) -> RuleExtraction:
+    """
+    Fast, deterministic extraction (no LLM): contact info from regexes/phonenumbers,
+    section boundaries from header detection, and skills/languages/summary from those sections.
+    """
+    sections = detect_sections(text)
+    header_lines = [line for line in text.splitlines()[:HEADER_LINES] if line.strip()]
+    by_name: Dict[str, ResumeSection] = {}
+    for section in sections:
+        by_name.setdefault(section.name, section)
+
+    contact_info = {
+        "name": extract_name(header_lines),
+        "email": extract_email(text),
+        "phone": extract_phone(text),
+        "city": extract_city(header_lines),
+    }
+    summary = by_name["summary"].text or None if "summary" in by_name else None
+    objective = by_name["objective"].text or None if "objective" in by_name else None
+    return RuleExtraction(
+        contact_info=contact_info,
+        sections=sections,
+        skills=_split_list(by_name["skills"].text) if "skills" in by_name else [],
+        languages=_split_list(by_name["languages"].text) if "languages" in by_name else [],
+        summary=summary,
+        objective=objective,
+    )
@@ -0,0 +1,196 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from parsers.rule_extractor import detect_sections
+
+# Detected section name -> extraction group. Each group is one sub-prompt with its own schema.
+# Sections mapped to None have no field in ResumeData and are not sent to the model.
+SECTION_GROUPS: Dict[str, Optional[str]] = {
+    "header": "profile",
+    "summary": "profile",
+    "objective": "profile",
+    "skills": "profile",
+    "languages": "profile",
+    "references": "profile",
+    "interests": "profile",
+    "certifications": "profile",
+    "awards": "profile",
+    "experience": "experience",
+    "education": "education",
+    "projects": "projects",
+    "patents": "patents",
+    "publications": None,
+}
+
+# ResumeData fields each group is responsible for
+GROUP_FIELDS: Dict[str, List[str]] = {
+    "profile": [
+        "contact_info",
+        "summary",
+        "objective",
+        "skills",
+        "languages",
+        "references",
+        "certifications",
+        "awards",
+    ],
+    "experience": ["total_experience_years", "total_experience_months", "experience"],
+    "education": ["education"],
+    "projects": ["projects"],
+    "patents": ["patents"],
+}
+
+FIELD_SCHEMAS: Dict[str, str] = {
+    "contact_info": '"contact_info": {"name": "string or null", "phone": "string or null", '
+    '"email": "string or null", "city": "string or null"}',
+    "summary": '"summary": "string or null"',
+    "objective": '"objective": "string or null"',
+    "skills": '"skills": [{"name": "string", "category": "string or null", "proficiency": "string or null"}]',
+    "languages": '"languages": ["string"]',
+    "references": '"references": ["string"]',
+    "certifications": '"certifications": [{"name": "string or null", "issuer": "string or null", '
+    '"issue_date": "string or null", "expiry_date": "string or null", "credential_id": "string or null"}]',
+    "awards": '"awards": [{"title": "string or null", "issuer": "string or null", "date": "string or null", '
+    '"description": "string or null"}]',
+    "total_experience_years": '"total_experience_years": number or null',
+    "total_experience_months": '"total_experience_months": number or null',
+    "experience": '"experience": [{"company": "string or null", "position": "string or null", '
+    '"start_date": "string or null", "end_date": "string or null", "is_current": boolean, '
+    '"summary": "string or null", "achievements": ["string"] or null}]',
+    "education": '"education": [{"degree": "string or null", "field_of_study": "string or null", '
+    '"institution": "string or null", "graduation_year": number or null, "gpa": "string or null", '
+    '"location": "string or null"}]',
+    "projects": '"projects": [{"name": "string or null", "description": "string or null", '
+    '"technologies": ["string"] or null, "start_date": "string or null", "end_date": "string or null", '
+    '"url": "string or null"}]',
+    "patents": '"patents": [{"title": "string or null", "patent_number": "string or null", '
+    '"issue_date": "string or null", "inventors": ["string"] or null, "description": "string or null"}]',
+}
+
+GROUP_INSTRUCTIONS: Dict[str, str] = {
+    "profile": "This is the header and profile part of a resume. Extract contact information, summary, "
+    "objective, skills, languages, references, certifications and awards.",
+    "experience": "This is the work experience part of a resume. Extract every position with its "
+    "achievements, and calculate total years and months of experience across these positions.",
+    "education": "This is the education part of a resume. Extract every degree.",
+    "projects": "This is the projects part of a resume. Extract every project.",
+    "patents": "This is the patents part of a resume. Extract every patent.",
+}
+
+# Split points inside an oversized section: blank lines first, then single newlines
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+
+@dataclass
+class SectionChunk:
+    group: str
+    text: str
+    sections: List[str] = field(default_factory=list)
+
+
+def section_prompt(group: str) -> str:
+    """System prompt for one extraction group, restricted to that group's part of the schema."""
+    schema = ",\n  ".join(FIELD_SCHEMAS[name] for name in GROUP_FIELDS[group])
+    return (
+        "You are an expert resume parser. "
+        f"{GROUP_INSTRUCTIONS[group]}\n\n"
+        "For dates, use YYYY-MM format when possible, or YYYY if only year is available.\n"
+        "Use empty lists for anything not present.\n\n"
+        "Return ONLY valid JSON matching this structure:\n"
+        f"{{\n  {schema}\n}}\n\n"
+        "Return ONLY the JSON object, no additional text or markdown formatting."
+    )
+
+
+SECTION_PROMPTS: Dict[str, str] = {group: section_prompt(group) for group in GROUP_FIELDS}
+
+
+def _split_oversized(text: str, max_chars: int) -> List[str]:
+    """Split text into pieces of at most ~max_chars, preferring paragraph then line boundaries."""
+    if len(text) <= max_chars:
+        return [text]
+    units = _PARAGRAPH_RE.split(text)
+    if any(len(unit) > max_chars for unit in units):
+        units = [line for unit in units for line in unit.split("\n")]
+    pieces: List[str] = []
+    current: List[str] = []
+    size = 0
+    for unit in units:
+        if current and size + len(unit) > max_chars:
+            pieces.append("\n".join(current))
+            current, size = [], 0
+        current.append(unit)
+        size += len(unit) + 1
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def plan_section_chunks(text: str, max_chunk_chars: int) -> List[SectionChunk]:
+    """
+    Group detected sections into one chunk per extraction group; groups longer than
+    max_chunk_chars are split so no single sub-prompt dominates latency.
+    The profile chunk is always present (it carries contact info).
+    """
+    grouped: Dict[str, SectionChunk] = {"profile": SectionChunk("profile", "")}
+    parts: Dict[str, List[str]] = {"profile": []}
+    for section in detect_sections(text):
+        group = SECTION_GROUPS.get(section.name)
+        if group is None:
+            continue
+        if group not in grouped:
+            grouped[group] = SectionChunk(group, "")
+            parts[group] = []
+        grouped[group].sections.append(section.name)
+        body = f"{section.header}\n{section.text}" if section.header else section.text
+        if body.strip():
+            parts[group].append(body)
+
+    chunks: List[SectionChunk] = []
+    for group, chunk in grouped.items():
+        group_text = "\n\n".join(parts[group]).strip()
+        if not group_text and group != "profile":
+            continue
+        for piece in _split_oversized(group_text, max_chunk_chars):
+            chunks.append(SectionChunk(group, piece, list(chunk.sections)))
+    return chunks
+
+
+def merge_section_results(chunks: List[SectionChunk], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine per-chunk JSON into one resume JSON: list fields are concatenated in document order,
+    scalar fields keep the first non-empty value, and experience totals are summed across
+    experience chunks. Distinct extraction notes are kept, and the merge is truncated if any chunk was.
+    """
+    merged: Dict[str, Any] = {}
+    experience_months = 0
+    has_experience_total = False
+    notes: List[str] = []
+    for chunk, result in zip(chunks, results):
+        note = result.get("extraction_notes")
+        if isinstance(note, str) and note.strip() and note.strip() not in notes:
+            notes.append(note.strip())
+        if result.get("output_truncated"):
+            merged["output_truncated"] = True
+        for name in GROUP_FIELDS[chunk.group]:
+            value = result.get(name)
+            if name in ("total_experience_years", "total_experience_months"):
+                continue
+            if isinstance(value, list):
+                merged.setdefault(name, []).extend(value)
+            elif value not in (None, "", {}) and merged.get(name) in (None, "", {}):
+                merged[name] = value
+        if chunk.group == "experience":
+            years = result.get("total_experience_years")
+            months = result.get("total_experience_months")
+            if isinstance(years, (int, float)) or isinstance(months, (int, float)):
+                has_experience_total = True
+                experience_months += int(round((years or 0) * 12 + (months or 0)))
+    if has_experience_total:
+        merged["total_experience_years"] = experience_months // 12
+        merged["total_experience_months"] = experience_months % 12
+    if notes:
+        merged["extraction_notes"] = " ".join(notes)
+    merged.setdefault("contact_info", {})
+    return merged
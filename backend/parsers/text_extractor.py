@@ -1,88 +1,177 @@
+import io
 import os
-from typing import Optional
-import PyPDF2
-from docx import Document
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple, Union, BinaryIO
 
-# pdfplumber is optional (requires Rust compilation, may fail on some platforms)
-try:
-    import pdfplumber
-    PDFPLUMBER_AVAILABLE = True
-except ImportError:
-    PDFPLUMBER_AVAILABLE = False
+from parsers.pdf_engines import iter_pdf_pages, open_pdf, pdf_page_count
 
-def extract_text_from_file(file_path: str, file_ext: str) -> Optional[str]:
+# A file path, raw upload bytes (bytes/bytearray/memoryview) or an open binary stream
+DocumentSource = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+# Text placed between consecutive blocks of a kind when they are joined. Form feeds between pages
+# let the normalizer find running headers/footers.
+BLOCK_SEPARATORS = {'page': '\n\f'}
+
+
+@dataclass
+class TextBlock:
+    """One unit of extracted text and where it came from; position fields not used by a kind are None."""
+    text: str
+    kind: str  # 'page' (PDF), 'paragraph' or 'table_cell' (DOCX), 'line' (TXT)
+    page: Optional[int] = None  # 0-based page index
+    paragraph: Optional[int] = None  # 0-based paragraph index
+    table: Optional[int] = None  # 0-based table index, with the cell's row and column
+    row: Optional[int] = None
+    column: Optional[int] = None
+    line: Optional[int] = None  # 0-based line index
+
+
+@contextmanager
+def _open_binary(source: DocumentSource):
+    """
+    Yield a readable binary stream for any supported source.
+    In-memory sources are wrapped without touching disk; caller-owned streams are rewound
+    and left open, only files opened here are closed.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            yield file
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    elif hasattr(source, 'read'):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        yield source
+    else:
+        raise TypeError(f"Unsupported document source type: {type(source).__name__}")
+
+
+def _read_bytes(source: DocumentSource) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source)
+    with _open_binary(source) as file:
+        return file.read()
+
+
+def iter_text_blocks(source: DocumentSource, file_ext: str) -> Iterator[TextBlock]:
+    """
+    Yield the text of a document block by block (PDF pages, DOCX paragraphs and table cells,
+    TXT lines) as it is extracted, so consumers can start work, or stop, before the whole
+    document has been read. source may be a file path, the raw file bytes, or a binary
+    file-like object.
+    """
+    if file_ext == '.pdf':
+        blocks = iter_pdf_blocks(source)
+    elif file_ext == '.docx':
+        blocks = iter_docx_blocks(source)
+    elif file_ext == '.doc':
+        # Note: .doc files require additional libraries like python-docx2txt or antiword
+        blocks = iter([TextBlock(extract_text_from_doc(source), 'paragraph')])
+    elif file_ext == '.txt':
+        blocks = iter_txt_blocks(source)
+    else:
+        raise ValueError(f"Unsupported file extension: {file_ext}")
+    yield from blocks
+
+def join_text_blocks(blocks: Iterable[TextBlock]) -> str:
+    """Assemble blocks into the document text; the parts are collected in a list and joined once."""
+    parts: List[str] = []
+    for block in blocks:
+        if parts:
+            parts.append(BLOCK_SEPARATORS.get(block.kind, '\n'))
+        parts.append(block.text)
+    return ''.join(parts).strip()
+
+def extract_text_from_file(source: DocumentSource, file_ext: str) -> Optional[str]:
     """
-    Extract text from various file formats
+    Extract text from various file formats.
+    source may be a file path, the raw file bytes, or a binary file-like object.
     """
     try:
-        if file_ext == '.pdf':
-            return extract_text_from_pdf(file_path)
-        elif file_ext == '.docx':
-            return extract_text_from_docx(file_path)
-        elif file_ext == '.doc':
-            # Note: .doc files require additional libraries like python-docx2txt or antiword
-            # For now, we'll try to use docx converter or suggest conversion
-            return extract_text_from_doc(file_path)
-        elif file_ext == '.txt':
-            return extract_text_from_txt(file_path)
-        else:
-            raise ValueError(f"Unsupported file extension: {file_ext}")
+        return join_text_blocks(iter_text_blocks(source, file_ext))
     except Exception as e:
         raise Exception(f"Error extracting text from {file_ext} file: {str(e)}")
 
-def extract_text_from_pdf(file_path: str) -> str:
+def _pdf_blocks(file: BinaryIO, start: int = 0, stop: Optional[int] = None, reader=None) -> Iterator[TextBlock]:
+    for page, text in iter_pdf_pages(file, start=start, stop=stop, reader=reader):
+        yield TextBlock(text, 'page', page=page)
+
+def iter_pdf_blocks(source: DocumentSource) -> Iterator[TextBlock]:
     """
-    Extract text from PDF using pdfplumber (if available) or PyPDF2
+    Yield one block per PDF page that has text, using the cheapest adequate engine
+    (see parsers/pdf_engines.py).
     """
-    text = ""
-    
-    # Try pdfplumber first if available (better for complex layouts)
-    if PDFPLUMBER_AVAILABLE:
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-        except Exception:
-            pass
-    
-    # Use PyPDF2 (always available)
-    if not text.strip():
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-        except Exception as e:
-            raise Exception(f"Failed to extract text from PDF: {str(e)}")
-    
-    return text.strip()
+    try:
+        with _open_binary(source) as file:
+            yield from _pdf_blocks(file)
+    except Exception as e:
+        raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
-def extract_text_from_docx(file_path: str) -> str:
+def extract_text_from_pdf(source: DocumentSource) -> str:
     """
-    Extract text from DOCX file
+    Extract text from PDF with the cheapest adequate engine (see parsers/pdf_engines.py).
+    Pages are separated by form feeds so running headers/footers can be detected later.
+    """
+    return join_text_blocks(iter_pdf_blocks(source))
+
+def extract_pdf_or_count_pages(source: DocumentSource, shard_min_pages: int) -> Tuple[Optional[str], int]:
+    """
+    Extract a PDF in one go, or, when it has more than shard_min_pages pages, only count them.
+    Returns (text, page_count); text is None when the caller should extract page ranges in parallel.
     """
     try:
-        doc = Document(file_path)
-        text_parts = []
+        with _open_binary(source) as file:
+            reader = open_pdf(file)
+            page_count = pdf_page_count(reader)
+            if page_count > shard_min_pages:
+                return None, page_count
+            return join_text_blocks(_pdf_blocks(file, reader=reader)), page_count
+    except Exception as e:
+        raise Exception(f"Failed to extract text from PDF: {str(e)}")
+
+def extract_pdf_page_range(source: DocumentSource, start: int, stop: int) -> List[TextBlock]:
+    """Page blocks for pages [start, stop) that have text."""
+    try:
+        with _open_binary(source) as file:
+            return list(_pdf_blocks(file, start=start, stop=stop))
+    except Exception as e:
+        raise Exception(f"Failed to extract text from PDF pages {start + 1}-{stop}: {str(e)}")
+
+def iter_docx_blocks(source: DocumentSource) -> Iterator[TextBlock]:
+    """
+    Yield non-empty DOCX paragraphs, then non-empty table cells
+    """
+    try:
+        from docx import Document
+
+        with _open_binary(source) as file:
+            doc = Document(file)
         
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_parts.append(paragraph.text)
+        for index, paragraph in enumerate(doc.paragraphs):
+            text = paragraph.text
+            if text.strip():
+                yield TextBlock(text, 'paragraph', paragraph=index)
         
         # Also extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text_parts.append(cell.text)
-        
-        return "\n".join(text_parts)
+        for table_index, table in enumerate(doc.tables):
+            for row_index, row in enumerate(table.rows):
+                for column_index, cell in enumerate(row.cells):
+                    text = cell.text
+                    if text.strip():
+                        yield TextBlock(text, 'table_cell', table=table_index, row=row_index, column=column_index)
     except Exception as e:
         raise Exception(f"Failed to extract text from DOCX: {str(e)}")
 
-def extract_text_from_doc(file_path: str) -> str:
+def extract_text_from_docx(source: DocumentSource) -> str:
+    """
+    Extract text from DOCX file
+    """
+    return join_text_blocks(iter_docx_blocks(source))
+
+def extract_text_from_doc(source: DocumentSource) -> str:
     """
     Extract text from DOC file
     Note: This is a basic implementation. For better results, consider using:
@@ -97,23 +186,38 @@ def extract_text_from_doc(file_path: str) -> str:
         "You can install python-docx2txt for better .doc support."
     )
 
-def extract_text_from_txt(file_path: str) -> str:
-    """
-    Extract text from TXT file
-    """
+def _universal_newlines(text: str) -> str:
+    # Match what text-mode open() used to do for files read from disk
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+def _decode_txt(source: DocumentSource) -> str:
+    try:
+        data = _read_bytes(source)
+    except Exception as e:
+        raise Exception(f"Failed to extract text from TXT: {str(e)}")
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
+        return _universal_newlines(data.decode('utf-8'))
     except UnicodeDecodeError:
         # Try with different encoding
         try:
-            with open(file_path, 'r', encoding='latin-1') as file:
-                return file.read()
+            return _universal_newlines(data.decode('latin-1'))
         except Exception as e:
             raise Exception(f"Failed to extract text from TXT: {str(e)}")
-    except Exception as e:
-        raise Exception(f"Failed to extract text from TXT: {str(e)}")
-
-
 
+def iter_txt_blocks(source: DocumentSource) -> Iterator[TextBlock]:
+    """
+    Yield a TXT file line by line (blank lines included, so joining restores the text)
+    """
+    text = _decode_txt(source)
+    start = 0
+    for index in range(text.count('\n') + 1):
+        end = text.find('\n', start)
+        end = len(text) if end < 0 else end
+        yield TextBlock(text[start:end], 'line', line=index)
+        start = end + 1
 
+def extract_text_from_txt(source: DocumentSource) -> str:
+    """
+    Extract text from TXT file
+    """
+    return _decode_txt(source).strip()
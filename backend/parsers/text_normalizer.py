@@ -0,0 +1,152 @@
+import math
+import os
+import re
+import time
+import unicodedata
+from collections import Counter
+from typing import List, Tuple
+
+from models.resume_models import TextNormalization
+
+# Page separator emitted by extract_text_from_pdf; lets us find repeated page headers/footers
+PAGE_BREAK = "\f"
+
+# Lines checked at the top and bottom of each page for repeated headers/footers
+PAGE_EDGE_LINES = 2
+
+HYPHEN_BREAK_RE = re.compile(r"(\w)-\n[ \t]*([a-z])")
+INLINE_SPACE_RE = re.compile(r"[ \t\u00a0\u2000-\u200b\u3000]+")
+# Explicit page labels ('Page 2', 'Page 2 of 3', '2 of 3'), also when part of a running header
+PAGE_LABEL_RE = re.compile(r"page\s*\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?|\b\d{1,3}\s+of\s+\d{1,3}\b", re.IGNORECASE)
+# A whole line that is a page number: a page label, '2/3' or '- 2 -'
+PAGE_NUMBER_RE = re.compile(
+    r"(?:page\s*)?\d{1,3}\s*(?:of|/)\s*\d{1,3}|page\s*\d{1,3}|[-–—]\s*\d{1,3}\s*[-–—]",
+    re.IGNORECASE,
+)
+BOILERPLATE_RE = re.compile(
+    r"references?\s+(?:are\s+)?available\s+(?:up)?on\s+request\.?"
+    r"|(?:curriculum\s+vitae|r[eé]sum[eé]|cv)"
+    r"|confidential"
+    r"|(?:this\s+)?page\s+(?:is\s+)?intentionally\s+left\s+blank\.?"
+    r"|[•·▪◦●■□\-*_=~.]+",
+    re.IGNORECASE,
+)
+
+
+def normalization_enabled() -> bool:
+    return os.getenv("TEXT_NORMALIZATION", "true").lower() in ("1", "true", "yes")
+
+
+def _approx_tokens(text: str) -> int:
+    # Same ~4 characters per token heuristic the parser uses for cost estimates
+    return max(1, int(len(text) / 4))
+
+
+def _edge_key(line: str) -> str:
+    # Page labels inside running headers change per page; other digits (dates, years) are content
+    return PAGE_LABEL_RE.sub("page #", INLINE_SPACE_RE.sub(" ", line).strip().lower())
+
+
+def _edge_positions(lines: List[str]) -> List[int]:
+    """Indices of the first and last PAGE_EDGE_LINES non-empty lines of a page."""
+    positions = [index for index, line in enumerate(lines) if line.strip()]
+    return sorted(set(positions[:PAGE_EDGE_LINES] + positions[-PAGE_EDGE_LINES:]))
+
+
+def _is_page_furniture(line: str, page_number: int) -> bool:
+    """A page number or boilerplate line. A bare number only counts when it is this page's number."""
+    line = INLINE_SPACE_RE.sub(" ", line).strip()
+    return bool(
+        line == str(page_number) or PAGE_NUMBER_RE.fullmatch(line) or BOILERPLATE_RE.fullmatch(line)
+    )
+
+
+def _strip_repeated_page_edges(pages: List[str]) -> Tuple[List[str], int]:
+    """
+    Drop lines that recur at the top or bottom of most pages (running headers/footers).
+    The first page is left alone, since a running header usually repeats the candidate's name.
+    """
+    if len(pages) < 2:
+        return pages, 0
+    page_lines = [page.split("\n") for page in pages]
+    edge_counts: Counter = Counter()
+    for lines in page_lines:
+        edge_counts.update({_edge_key(lines[index]) for index in _edge_positions(lines)})
+    threshold = max(2, math.ceil(len(pages) / 2))
+    repeated = {key for key, count in edge_counts.items() if count >= threshold and key}
+    if not repeated:
+        return pages, 0
+
+    removed = 0
+    cleaned_pages = [pages[0]]
+    for lines in page_lines[1:]:
+        edge_positions = set(_edge_positions(lines))
+        kept = []
+        for index, line in enumerate(lines):
+            if index in edge_positions and _edge_key(line) in repeated:
+                removed += 1
+                continue
+            kept.append(line)
+        cleaned_pages.append("\n".join(kept))
+    return cleaned_pages, removed
+
+
+def _strip_page_furniture(pages: List[str]) -> Tuple[List[str], int]:
+    """Drop page numbers and boilerplate among the first and last lines of each page."""
+    removed = 0
+    cleaned_pages = []
+    for page_number, page in enumerate(pages, start=1):
+        lines = page.split("\n")
+        dropped = {index for index in _edge_positions(lines) if _is_page_furniture(lines[index], page_number)}
+        removed += len(dropped)
+        cleaned_pages.append("\n".join(line for index, line in enumerate(lines) if index not in dropped))
+    return cleaned_pages, removed
+
+
+def normalize_resume_text(text: str, paged: bool = False) -> Tuple[str, TextNormalization]:
+    """
+    Shrink extracted resume text before it is sent to the models:
+    - Unicode NFKC (PDF ligatures, full-width characters, odd spaces) and soft-hyphen removal
+    - for paged documents (PDFs, or text with page breaks): running page headers/footers dropped,
+      and page numbers and boilerplate lines ('References available upon request', a bare 'Resume'
+      title, rules) dropped from the edges of each page
+    - words hyphenated across line breaks rejoined
+    - whitespace runs and blank-line runs collapsed
+    Lines in the body of a page are never dropped, so numbers in tables and date ranges survive.
+    Returns the normalized text and a TextNormalization report.
+    """
+    started = time.perf_counter()
+    original = text
+    text = unicodedata.normalize("NFKC", text).replace("\u00ad", "")
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    pages = text.split(PAGE_BREAK)
+    header_footer_lines = dropped = 0
+    if paged or len(pages) > 1:
+        pages, header_footer_lines = _strip_repeated_page_edges(pages)
+        pages, dropped = _strip_page_furniture(pages)
+    text = "\n".join(pages)
+    text, rejoined = HYPHEN_BREAK_RE.subn(r"\1\2", text)
+
+    kept_lines: List[str] = []
+    for raw_line in text.split("\n"):
+        line = INLINE_SPACE_RE.sub(" ", raw_line).strip()
+        if not line and (not kept_lines or not kept_lines[-1]):
+            continue
+        kept_lines.append(line)
+    text = "\n".join(kept_lines).strip()
+
+    tokens_before = _approx_tokens(original)
+    tokens_after = _approx_tokens(text)
+    return text, TextNormalization(
+        original_chars=len(original),
+        normalized_chars=len(text),
+        tokens_before=tokens_before,
+        tokens_after=tokens_after,
+        tokens_saved=max(0, tokens_before - tokens_after),
+        header_footer_lines_removed=header_footer_lines,
+        boilerplate_lines_removed=dropped,
+        hyphenations_rejoined=rejoined,
+        normalization_ms=round((time.perf_counter() - started) * 1000, 2),
+    )
+
@@ -0,0 +1,165 @@
+import os
+import gzip
+import logging
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# brotli is optional (`pip install brotli`, or brotlicffi on PyPy); gzip is always available
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+BROTLI_AVAILABLE = brotli is not None
+
+logger = logging.getLogger("uvicorn.error")
+
+DEFAULT_ENCODINGS = "br,gzip"
+DEFAULT_MIN_BYTES = 1024
+# Mid-range levels: JSON compresses nearly as well as at the maximum for a fraction of the CPU
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 5
+# Bodies this large are compressed in a worker thread; smaller ones take less time than the hand-off
+DEFAULT_THREAD_MIN_BYTES = 64 * 1024
+
+
+def is_compressible(content_type: str) -> bool:
+    """Text and JSON/XML media types; event streams are excluded so events are never buffered."""
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in ("application/json", "application/javascript", "application/xml")
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}; a coding with q=0 is refused."""
+    accepted: Dict[str, float] = {}
+    for part in header.lower().split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compress complete text/JSON responses of at least minimum_size bytes with the first of encodings
+    the client accepts. Streaming responses (Server-Sent Events) and bodies that already carry a
+    Content-Encoding pass through untouched, so events are never held back in a compressor.
+    Bodies of thread_min_size bytes or more are compressed off the event loop. Every compressible
+    response carries Vary: Accept-Encoding, compressed or not, so shared caches keep the variants apart.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Sequence[str] = ("br", "gzip"),
+        minimum_size: int = DEFAULT_MIN_BYTES,
+        gzip_level: int = DEFAULT_GZIP_LEVEL,
+        brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+        thread_min_size: int = DEFAULT_THREAD_MIN_BYTES,
+    ) -> None:
+        compressors: Dict[str, Callable[[bytes], bytes]] = {
+            "gzip": lambda body: gzip.compress(body, compresslevel=gzip_level, mtime=0),
+        }
+        if BROTLI_AVAILABLE:
+            compressors["br"] = lambda body: brotli.compress(body, quality=brotli_quality)
+        unknown = [encoding for encoding in encodings if encoding not in ("br", "gzip")]
+        if unknown:
+            raise ValueError(f"Unsupported response encodings {unknown}. Use br and/or gzip.")
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_min_size = thread_min_size
+        # Server preference order; br is dropped when brotli is not installed
+        self.compressors = {encoding: compressors[encoding] for encoding in encodings if encoding in compressors}
+
+    def _negotiate(self, scope: Scope) -> Optional[str]:
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        for encoding in self.compressors:
+            if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+                return encoding
+        return None
+
+    async def _compress(self, encoding: str, body: bytes) -> bytes:
+        compress = self.compressors[encoding]
+        if len(body) >= self.thread_min_size:
+            return await anyio.to_thread.run_sync(compress, body)
+        return compress(body)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.compressors:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._negotiate(scope)
+        start_message: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Held back until the first body message shows whether to compress
+                start_message = message
+                return
+            if message["type"] == "http.response.body" and start_message is not None:
+                initial, start_message = start_message, None
+                headers = MutableHeaders(raw=initial["headers"])
+                body = message.get("body", b"")
+                if is_compressible(headers.get("content-type", "")):
+                    # The response depends on Accept-Encoding even when this one goes out uncompressed
+                    headers.add_vary_header("Accept-Encoding")
+                    if (
+                        encoding is not None
+                        and not message.get("more_body", False)
+                        and "content-encoding" not in headers
+                        and len(body) >= self.minimum_size
+                    ):
+                        compressed = await self._compress(encoding, body)
+                        headers["Content-Encoding"] = encoding
+                        headers["Content-Length"] = str(len(compressed))
+                        message = {**message, "body": compressed}
+                await send(initial)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+
+def compression_settings() -> Optional[Dict[str, Any]]:
+    """
+    CompressionMiddleware arguments from the environment, or None when compression is off.
+    RESPONSE_COMPRESSION lists encodings in preference order (default 'br,gzip'; 'none' disables);
+    RESPONSE_COMPRESSION_MIN_BYTES, RESPONSE_GZIP_LEVEL, RESPONSE_BROTLI_QUALITY and
+    RESPONSE_COMPRESSION_THREAD_MIN_BYTES tune it.
+    """
+    setting = os.getenv("RESPONSE_COMPRESSION", DEFAULT_ENCODINGS).strip().lower()
+    if setting in ("none", "off", "false", ""):
+        return None
+    encodings = [encoding.strip() for encoding in setting.split(",") if encoding.strip()]
+    if "br" in encodings and not BROTLI_AVAILABLE:
+        logger.info("brotli is not installed; responses are compressed with gzip only")
+    return {
+        "encodings": encodings,
+        "minimum_size": int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", str(DEFAULT_MIN_BYTES))),
+        "gzip_level": int(os.getenv("RESPONSE_GZIP_LEVEL", str(DEFAULT_GZIP_LEVEL))),
+        "brotli_quality": int(os.getenv("RESPONSE_BROTLI_QUALITY", str(DEFAULT_BROTLI_QUALITY))),
+        "thread_min_size": int(os.getenv("RESPONSE_COMPRESSION_THREAD_MIN_BYTES", str(DEFAULT_THREAD_MIN_BYTES))),
+    }
@@ -0,0 +1,256 @@
+import os
+import time
+import asyncio
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Tuple
+
+from parsers.text_extractor import (
+    extract_pdf_or_count_pages,
+    extract_pdf_page_range,
+    extract_text_from_file,
+    join_text_blocks,
+)
+from services import metrics
+
+logger = logging.getLogger("uvicorn.error")
+
+# Seconds a terminated worker gets to exit before it is killed
+WORKER_TERMINATE_GRACE_SECONDS = 2.0
+
+
+class ExtractionQueueFull(Exception):
+    """Raised when the extraction pool already has its maximum number of queued jobs."""
+
+
+def _default_pool_size() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+class _Worker:
+    """One extraction worker process, as a single-process executor created on first use."""
+
+    def __init__(self):
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.jobs = 0
+
+
+class ExtractionPool:
+    """
+    Runs CPU-bound text extraction (pdfplumber/PyPDF2/python-docx) in worker processes
+    so a slow document cannot stall the event loop.
+
+    - pool_size: number of worker processes (0 runs extraction in the default thread pool instead)
+    - queue_depth: jobs allowed to wait for a free worker before new ones are rejected
+    - timeout_seconds: limit per worker call, measured from when a worker picks the call up (time
+      queued behind busy workers does not count); a call that runs over it cannot be cancelled, so
+      the one worker running it is terminated and replaced
+    - max_jobs_per_worker: a worker process is replaced after this many calls to cap memory
+      growth from leaky parsers
+    - shard_min_pages: PDFs with more pages are split into page ranges extracted in parallel
+      by the same workers (0 disables sharding)
+    - shard_pages: target pages per shard; a document never uses more shards than workers
+    """
+
+    def __init__(
+        self,
+        pool_size: int,
+        queue_depth: int,
+        timeout_seconds: float,
+        max_jobs_per_worker: int,
+        shard_min_pages: int = 0,
+        shard_pages: int = 8,
+    ):
+        self.pool_size = pool_size
+        self.queue_depth = queue_depth
+        self.timeout_seconds = timeout_seconds
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.shard_min_pages = shard_min_pages
+        self.shard_pages = max(1, shard_pages)
+        # Each worker is a single-process executor, so a stuck call can be stopped without touching
+        # the calls running on other workers. A call holds its worker from submission to completion.
+        self._workers = [_Worker() for _ in range(max(0, pool_size))]
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for worker in self._workers:
+            self._idle.put_nowait(worker)
+        self._slots = asyncio.Semaphore(max(1, pool_size) + queue_depth)
+        self._in_flight = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.recycles = 0
+        self.sharded = 0
+        self.workers_terminated = 0
+
+    def _executor_for(self, worker: "_Worker") -> ProcessPoolExecutor:
+        if worker.executor is not None and self.max_jobs_per_worker and worker.jobs >= self.max_jobs_per_worker:
+            # The worker is idle (we hold it), so its process exits once shut down
+            worker.executor.shutdown(wait=False)
+            worker.executor = None
+            self.recycles += 1
+        if worker.executor is None:
+            worker.executor = ProcessPoolExecutor(max_workers=1)
+            worker.jobs = 0
+        worker.jobs += 1
+        return worker.executor
+
+    def _terminate_worker(self, worker: "_Worker") -> None:
+        """Stop the process running a call that can no longer be waited for; the next call gets a new one."""
+        executor, worker.executor = worker.executor, None
+        if executor is None:
+            return
+        # ProcessPoolExecutor has no public way to stop a running task; its worker processes are
+        # internal, and shutdown() forgets them, so they are collected first
+        processes = [process for process in (executor._processes or {}).values() if process.is_alive()]
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        self.workers_terminated += len(processes)
+        asyncio.get_running_loop().run_in_executor(None, self._reap_workers, processes)
+
+    @staticmethod
+    def _reap_workers(processes: List) -> None:
+        for process in processes:
+            process.join(WORKER_TERMINATE_GRACE_SECONDS)
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+    async def _run_on_worker(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run fn(*args) in a worker process, waiting for an idle worker first. Raises asyncio.TimeoutError
+        when the call runs longer than timeout_seconds; its worker is then terminated.
+        """
+        worker = await self._idle.get()
+        try:
+            future = self._executor_for(worker).submit(fn, *args)
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout_seconds or None)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                # Timed out, or the caller gave up: a call that already started keeps its process busy
+                if not future.done():
+                    self._terminate_worker(worker)
+                    logger.warning("Terminated an extraction worker running %s", getattr(fn, "__name__", fn))
+                raise
+            except BrokenProcessPool:
+                # The process died on its own (e.g. out of memory); replace it
+                self._terminate_worker(worker)
+                raise
+        finally:
+            self._idle.put_nowait(worker)
+
+    @property
+    def queue_size(self) -> int:
+        return max(0, self._in_flight - max(1, self.pool_size))
+
+    def _page_shards(self, page_count: int) -> List[Tuple[int, int]]:
+        shards = max(1, min(self.pool_size, math.ceil(page_count / self.shard_pages)))
+        size = math.ceil(page_count / shards)
+        return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+    async def _run_extraction(self, source, file_ext: str) -> Optional[str]:
+        if self.pool_size <= 0:
+            # Threads cannot be stopped, so a timed-out extraction keeps its thread until it finishes
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(
+                loop.run_in_executor(None, extract_text_from_file, source, file_ext),
+                timeout=self.timeout_seconds or None,
+            )
+        if file_ext != ".pdf" or self.shard_min_pages <= 0 or self.pool_size < 2:
+            return await self._run_on_worker(extract_text_from_file, source, file_ext)
+
+        # One worker counts pages (and extracts short PDFs outright); long ones fan out as page ranges
+        text, page_count = await self._run_on_worker(extract_pdf_or_count_pages, source, self.shard_min_pages)
+        if text is not None:
+            return text
+        self.sharded += 1
+        shards = await asyncio.gather(
+            *[
+                self._run_on_worker(extract_pdf_page_range, source, start, stop)
+                for start, stop in self._page_shards(page_count)
+            ]
+        )
+        return join_text_blocks(block for shard in shards for block in shard)
+
+    async def extract(self, source, file_ext: str, block: bool = False) -> Tuple[Optional[str], int]:
+        """
+        Extract text in the pool. Returns (text, extraction_ms).
+        Raises ExtractionQueueFull when the queue is saturated (unless block=True, used by batch
+        jobs that should wait for a slot) and asyncio.TimeoutError on timeout.
+        """
+        if not block and self._slots.locked():
+            self.rejected += 1
+            raise ExtractionQueueFull(
+                f"Extraction queue is full ({self._in_flight} jobs in flight). Try again shortly."
+            )
+
+        wait_start = time.perf_counter()
+        async with self._slots:
+            self._in_flight += 1
+            started = time.perf_counter()
+            metrics.EXTRACTION_QUEUE_WAIT_SECONDS.observe(started - wait_start, file_type=file_ext)
+            try:
+                try:
+                    text = await self._run_extraction(source, file_ext)
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    logger.warning("Extraction of a %s file timed out after %ss", file_ext, self.timeout_seconds)
+                    raise
+                self.completed += 1
+                elapsed = time.perf_counter() - started
+                metrics.EXTRACTION_SECONDS.observe(elapsed, file_type=file_ext)
+                return text, int(elapsed * 1000)
+            finally:
+                self._in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.pool_size,
+            "queue_depth": self.queue_depth,
+            "in_flight": self._in_flight,
+            "queued": self.queue_size,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "recycles": self.recycles,
+            "sharded": self.sharded,
+            "workers_terminated": self.workers_terminated,
+        }
+
+    def shutdown(self) -> None:
+        for worker in self._workers:
+            if worker.executor is not None:
+                worker.executor.shutdown(wait=False, cancel_futures=True)
+                worker.executor = None
+
+
+_extraction_pool: Optional[ExtractionPool] = None
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Lazy initialization of the extraction pool from EXTRACTION_* environment variables."""
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = ExtractionPool(
+            pool_size=int(os.getenv("EXTRACTION_POOL_SIZE", str(_default_pool_size()))),
+            queue_depth=int(os.getenv("EXTRACTION_QUEUE_DEPTH", "32")),
+            timeout_seconds=float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "30")),
+            max_jobs_per_worker=int(os.getenv("EXTRACTION_MAX_JOBS_PER_WORKER", "100")),
+            shard_min_pages=int(os.getenv("PDF_SHARD_MIN_PAGES", "16")),
+            shard_pages=int(os.getenv("PDF_SHARD_PAGES", "8")),
+        )
+        logger.info(
+            "Extraction pool initialized: size=%s queue_depth=%s",
+            _extraction_pool.pool_size,
+            _extraction_pool.queue_depth,
+        )
+    return _extraction_pool
+
+
+def shutdown_extraction_pool() -> None:
+    global _extraction_pool
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown()
+        _extraction_pool = None
@@ -0,0 +1,123 @@
+import os
+import sys
+import inspect
+import logging
+from typing import Any, Callable, Dict, Hashable
+
+import httpx
+
+logger = logging.getLogger("uvicorn.error")
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+
+def _env_int(provider: str, name: str, default: int) -> int:
+    value = os.getenv(f"{name}_{provider.upper().replace('-', '_')}") or os.getenv(name)
+    return int(value) if value else default
+
+
+def pool_limits(provider: str) -> httpx.Limits:
+    """
+    Connection pool limits for a provider. HTTP_POOL_MAX_CONNECTIONS / HTTP_POOL_MAX_KEEPALIVE set the
+    defaults; suffix them with the provider (e.g. HTTP_POOL_MAX_CONNECTIONS_GEMINI) to override per provider.
+    """
+    return httpx.Limits(
+        max_connections=_env_int(provider, "HTTP_POOL_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS),
+        max_keepalive_connections=_env_int(provider, "HTTP_POOL_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE),
+        keepalive_expiry=float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", str(DEFAULT_KEEPALIVE_EXPIRY_SECONDS))),
+    )
+
+
+class ClientRegistry:
+    """
+    Process-wide registry of long-lived provider clients, so connections (TCP + TLS) are reused
+    across requests instead of being re-established per call.
+
+    Clients are created on the event loop thread without awaiting, so concurrent requests cannot
+    race to build duplicates. The underlying httpx pools are safe for concurrent use.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Hashable, Any] = {}
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        client = self._clients.get(key)
+        if client is None:
+            client = factory()
+            self._clients[key] = client
+            logger.info("Created pooled client %s", key)
+        return client
+
+    def keys(self):
+        return list(self._clients.keys())
+
+    async def close_all(self) -> None:
+        clients, self._clients = self._clients, {}
+        for key, client in clients.items():
+            close = getattr(client, "aclose", None) or getattr(client, "close", None)
+            if close is None:
+                continue
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning("Failed to close client %s: %s", key, e)
+
+
+client_registry = ClientRegistry()
+
+
+def get_http_client(provider: str, timeout: float = 120.0) -> httpx.AsyncClient:
+    """Shared keep-alive HTTP client for providers called over plain REST (e.g. Gemini)."""
+    return client_registry.get_or_create(
+        ("http", provider),
+        lambda: httpx.AsyncClient(timeout=timeout, limits=pool_limits(provider)),
+    )
+
+
+_hf_client_factory_installed = False
+
+
+def install_hf_client_factory() -> bool:
+    """
+    Make huggingface_hub build its async HTTP clients with pool_limits("huggingface").
+    AsyncInferenceClient takes no httpx limits of its own; every instance opens its HTTP client
+    through the library's client factory. The library's default client is used as a template, so
+    its event hooks, redirects and timeout are kept, along with whichever httpx package it is built on.
+    Returns False when huggingface_hub is not installed or has no client factory.
+    """
+    global _hf_client_factory_installed
+    if _hf_client_factory_installed:
+        return True
+    try:
+        from huggingface_hub import get_async_session, set_async_client_factory
+    except ImportError:
+        return False
+
+    template = get_async_session()
+    client_cls = type(template)
+    limits_cls = getattr(sys.modules[client_cls.__module__.split(".")[0]], "Limits")
+
+    def _factory():
+        limits = pool_limits("huggingface")
+        return client_cls(
+            event_hooks=template.event_hooks,
+            follow_redirects=template.follow_redirects,
+            timeout=template.timeout,
+            limits=limits_cls(
+                max_connections=limits.max_connections,
+                max_keepalive_connections=limits.max_keepalive_connections,
+                keepalive_expiry=limits.keepalive_expiry,
+            ),
+        )
+
+    set_async_client_factory(_factory)
+    _hf_client_factory_installed = True
+    return True
+
+
+async def close_clients() -> None:
+    await client_registry.close_all()
@@ -0,0 +1,340 @@
+import os
+import time
+import uuid
+import asyncio
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from models.resume_models import JobState, JobStatus, ParseResponse
+from services import metrics
+
+logger = logging.getLogger("uvicorn.error")
+
+# Identifies this process as the owner of the jobs it claims (several uvicorn workers may share one store)
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class JobStore:
+    """
+    SQLite-backed store for background parse jobs.
+    Claiming is done inside an IMMEDIATE transaction so concurrent workers never run the same job.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " priority INTEGER NOT NULL DEFAULT 0,"
+            " filename TEXT,"
+            " models TEXT,"
+            " use_cache INTEGER NOT NULL DEFAULT 1,"
+            " text TEXT,"
+            " extraction_ms INTEGER,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " worker_id TEXT,"
+            " heartbeat_at REAL,"
+            " created_at REAL NOT NULL,"
+            " started_at REAL,"
+            " finished_at REAL,"
+            " result TEXT,"
+            " error TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(status, priority DESC, created_at)")
+
+    def create(
+        self,
+        text: str,
+        models: Optional[str],
+        priority: int = 0,
+        filename: Optional[str] = None,
+        use_cache: bool = True,
+        extraction_ms: Optional[int] = None,
+    ) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, priority, filename, models, use_cache, text, extraction_ms, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, JobState.QUEUED.value, priority, filename, models, int(use_cache), text, extraction_ms, time.time()),
+            )
+        return job_id
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """Atomically move the highest-priority, oldest queued job to running and return it."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY priority DESC, created_at ASC LIMIT 1",
+                    (JobState.QUEUED.value,),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, worker_id = ?, heartbeat_at = ?, started_at = ?,"
+                    " attempts = attempts + 1 WHERE id = ?",
+                    (JobState.RUNNING.value, WORKER_ID, now, now, row["id"]),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        job = dict(row)
+        job["attempts"] += 1
+        return job
+
+    def finish(self, job_id: str, status: JobState, result: Optional[str] = None, error: Optional[str] = None) -> None:
+        # result is the ParseResponse JSON, stored as is.
+        # Only transition jobs still running, so a concurrent cancel is not overwritten.
+        # The resume text is dropped once a job is terminal; it is only needed to run the job.
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, text = NULL"
+                " WHERE id = ? AND status = ?",
+                (
+                    status.value,
+                    result,
+                    error,
+                    time.time(),
+                    job_id,
+                    JobState.RUNNING.value,
+                ),
+            )
+
+    def cancel(self, job_id: str) -> Optional[JobState]:
+        """Cancel a queued or running job. Returns the state the job was in, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            previous = JobState(row["status"])
+            if previous in (JobState.QUEUED, JobState.RUNNING):
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, text = NULL WHERE id = ?",
+                    (JobState.CANCELLED.value, time.time(), job_id),
+                )
+            return previous
+
+    def heartbeat(self, job_ids) -> None:
+        if not job_ids:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?",
+                [(time.time(), job_id, JobState.RUNNING.value) for job_id in job_ids],
+            )
+
+    def requeue_stale(self, stale_after_seconds: float, max_attempts: int) -> int:
+        """
+        Re-queue running jobs whose worker stopped heart-beating (crash or restart).
+        Jobs that already used max_attempts are failed instead to avoid poison-job loops.
+        """
+        cutoff = time.time() - stale_after_seconds
+        with self._lock:
+            failed = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, text = NULL"
+                " WHERE status = ? AND heartbeat_at < ? AND attempts >= ?",
+                (
+                    JobState.FAILED.value,
+                    f"Job abandoned after {max_attempts} attempts",
+                    time.time(),
+                    JobState.RUNNING.value,
+                    cutoff,
+                    max_attempts,
+                ),
+            ).rowcount
+            requeued = self._conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = NULL WHERE status = ? AND heartbeat_at < ?",
+                (JobState.QUEUED.value, JobState.RUNNING.value, cutoff),
+            ).rowcount
+        if failed:
+            logger.warning("Failed %s abandoned jobs that exceeded %s attempts", failed, max_attempts)
+        return requeued
+
+    def purge_finished(self, older_than_seconds: float) -> int:
+        cutoff = time.time() - older_than_seconds
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?, ?) AND finished_at < ?",
+                (JobState.COMPLETED.value, JobState.FAILED.value, JobState.CANCELLED.value, cutoff),
+            ).rowcount
+
+    def get(self, job_id: str) -> Optional[JobStatus]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, priority, filename, models, attempts, created_at, started_at,"
+                " finished_at, extraction_ms, result, error FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return JobStatus(
+            job_id=row["id"],
+            status=JobState(row["status"]),
+            priority=row["priority"],
+            filename=row["filename"],
+            models=row["models"],
+            attempts=row["attempts"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            extraction_ms=row["extraction_ms"],
+            result=ParseResponse.model_validate_json(row["result"]) if row["result"] else None,
+            error=row["error"],
+        )
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JobScheduler:
+    """
+    In-process worker pool that drains the job store.
+    Workers sleep until a job is submitted (or the poll interval elapses, to pick up jobs
+    submitted by other processes sharing the store).
+    """
+
+    def __init__(self, store: JobStore, workers: int, poll_interval: float = 2.0):
+        self.store = store
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_after_seconds = float(os.getenv("JOB_STALE_SECONDS", "60"))
+        self.max_attempts = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+        self.retention_seconds = float(os.getenv("JOB_RETENTION_SECONDS", str(24 * 3600)))
+        self._wakeup = asyncio.Event()
+        self._tasks: list = []
+        self._running: Dict[str, asyncio.Task] = {}
+
+    async def start(self) -> None:
+        requeued = await asyncio.to_thread(self.store.requeue_stale, self.stale_after_seconds, self.max_attempts)
+        if requeued:
+            logger.info("Re-queued %s in-flight jobs from a previous run", requeued)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._maintenance()))
+        self._wakeup.set()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Jobs interrupted here stay 'running' and are re-queued once their heartbeat goes stale
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def cancel(self, job_id: str) -> Optional[JobState]:
+        previous = await asyncio.to_thread(self.store.cancel, job_id)
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        return previous
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                job = await asyncio.to_thread(self.store.claim_next)
+            except Exception as e:
+                logger.exception("Job worker %s failed to claim a job: %s", index, e)
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._run_job(job))
+            self._running[job["id"]] = task
+            try:
+                await task
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    # The worker itself is being stopped
+                    task.cancel()
+                    raise
+                logger.info("Job %s cancelled", job["id"])
+            finally:
+                self._running.pop(job["id"], None)
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        # Imported here to keep the job store importable without the parser stack
+        from parsers.resume_parser import cascade_enabled, parse_model_specs, parse_with_cascade, parse_with_models
+
+        job_id = job["id"]
+        metrics.JOB_QUEUE_WAIT_SECONDS.observe(max(0.0, time.time() - job["created_at"]))
+        logger.info("Running job %s (priority=%s attempt=%s)", job_id, job["priority"], job["attempts"])
+        try:
+            specs = parse_model_specs(job["models"])
+            text = job["text"] or ""
+            cascade = None
+            if cascade_enabled():
+                results, errors, cascade = await parse_with_cascade(text, specs, use_cache=bool(job["use_cache"]))
+            else:
+                results, errors = await parse_with_models(text, specs, use_cache=bool(job["use_cache"]))
+            response = ParseResponse(
+                results=results, errors=errors, extraction_ms=job["extraction_ms"], cascade=cascade
+            )
+            status = JobState.COMPLETED if results else JobState.FAILED
+            error = None if results else "All model calls failed"
+            await asyncio.to_thread(self.store.finish, job_id, status, response.model_dump_json(), error)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("Job %s failed: %s", job_id, e)
+            await asyncio.to_thread(self.store.finish, job_id, JobState.FAILED, None, str(e))
+
+    async def _maintenance(self) -> None:
+        interval = max(1.0, self.stale_after_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.store.heartbeat, list(self._running.keys()))
+                requeued = await asyncio.to_thread(
+                    self.store.requeue_stale, self.stale_after_seconds, self.max_attempts
+                )
+                if requeued:
+                    logger.warning("Re-queued %s stale jobs", requeued)
+                    self._wakeup.set()
+                await asyncio.to_thread(self.store.purge_finished, self.retention_seconds)
+            except Exception as e:
+                logger.exception("Job maintenance failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running_here": len(self._running),
+            "jobs": self.store.counts(),
+        }
+
+
+_scheduler: Optional[JobScheduler] = None
+
+
+def get_job_scheduler() -> JobScheduler:
+    """Lazy initialization of the job store and scheduler from JOB_* environment variables."""
+    global _scheduler
+    if _scheduler is None:
+        store = JobStore(os.getenv("JOB_STORE_PATH", "/tmp/resume_parser_jobs.sqlite3"))
+        _scheduler = JobScheduler(store, workers=int(os.getenv("JOB_WORKERS", "4")))
+    return _scheduler
@@ -0,0 +1,31 @@
+"""
+JSON decoding and encoding for the parse hot path: model output, cached results and responses.
+
+orjson is used when installed (optional, `pip install orjson`). Without it, pydantic-core's JSON
+parser and serializer are used; they ship with pydantic and decode resume-sized documents about
+twice as fast as the standard json module.
+"""
+from typing import Any, Union
+
+from pydantic_core import from_json, to_json
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON document. Raises ValueError on invalid JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return from_json(data)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode value as compact UTF-8 JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return to_json(value)
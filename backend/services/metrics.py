@@ -0,0 +1,249 @@
+import bisect
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("uvicorn.error")
+
+# Label sets allowed per metric before new ones are dropped (model names come from request parameters)
+METRICS_MAX_SERIES = int(os.getenv("METRICS_MAX_SERIES", "500"))
+
+LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000)
+COST_BUCKETS_USD = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.dropped_series = 0
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Optional[str]]) -> LabelValues:
+        return tuple(str(labels.get(name) or "") for name in self.label_names)
+
+    def _admit(self, series: dict, key: LabelValues) -> bool:
+        if key in series:
+            return True
+        if len(series) >= METRICS_MAX_SERIES:
+            self.dropped_series += 1
+            return False
+        return True
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Optional[str]) -> None:
+        key = self._key(labels)
+        with self._lock:
+            if self._admit(self._values, key):
+                self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Optional[str]) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; observe() is a bisect plus three additions under a lock."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str], buckets: Sequence[float]):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last slot is +Inf), sum, count]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: Optional[float], **labels: Optional[str]) -> None:
+        if value is None:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if not self._admit(self._series, key):
+                    return
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+                labels = _format_labels(self.label_names, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name: str, documentation: str, label_names: Sequence[str], buckets: Sequence[float]
+    ) -> Histogram:
+        metric = Histogram(name, documentation, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        dropped = 0
+        for metric in self._metrics:
+            lines.extend(metric.render())
+            dropped += metric.dropped_series
+        lines.append("# HELP resume_metrics_dropped_series_total Observations dropped by the METRICS_MAX_SERIES cap")
+        lines.append("# TYPE resume_metrics_dropped_series_total counter")
+        lines.append(f"resume_metrics_dropped_series_total {dropped}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+MODEL_LABELS = ("provider", "model", "inference_provider")
+
+EXTRACTION_SECONDS = registry.histogram(
+    "resume_extraction_seconds", "Text extraction time per uploaded file", ("file_type",), LATENCY_BUCKETS_SECONDS
+)
+EXTRACTION_QUEUE_WAIT_SECONDS = registry.histogram(
+    "resume_extraction_queue_wait_seconds",
+    "Time spent waiting for an extraction pool slot",
+    ("file_type",),
+    LATENCY_BUCKETS_SECONDS,
+)
+REQUEST_SECONDS = registry.histogram(
+    "resume_parse_request_seconds",
+    "End-to-end /api/parse latency (extraction plus all model calls), by response status",
+    ("file_type", "status"),
+    LATENCY_BUCKETS_SECONDS,
+)
+MODEL_API_LATENCY_SECONDS = registry.histogram(
+    "resume_model_api_latency_seconds", "Model API call latency (api_latency_ms)", MODEL_LABELS, LATENCY_BUCKETS_SECONDS
+)
+MODEL_LATENCY_SECONDS = registry.histogram(
+    "resume_model_latency_seconds",
+    "End-to-end per-model parse latency (latency_ms), including cache lookups and rate-limit waits",
+    MODEL_LABELS,
+    LATENCY_BUCKETS_SECONDS,
+)
+MODEL_QUEUE_WAIT_SECONDS = registry.histogram(
+    "resume_model_queue_wait_seconds",
+    "Time a model call waited in the per provider+model rate limiter",
+    MODEL_LABELS,
+    LATENCY_BUCKETS_SECONDS,
+)
+JOB_QUEUE_WAIT_SECONDS = registry.histogram(
+    "resume_job_queue_wait_seconds", "Time background jobs spent queued before a worker claimed them", (),
+    LATENCY_BUCKETS_SECONDS,
+)
+MODEL_VALIDATION_SECONDS = registry.histogram(
+    "resume_model_validation_seconds",
+    "Time spent turning model JSON into a validated ResumeData",
+    MODEL_LABELS,
+    LATENCY_BUCKETS_SECONDS,
+)
+MODEL_TOKENS = registry.histogram(
+    "resume_model_tokens",
+    "Tokens per parse by kind (prompt, completion, cached)",
+    MODEL_LABELS + ("kind",),
+    TOKEN_BUCKETS,
+)
+MODEL_COST_USD = registry.histogram(
+    "resume_model_cost_usd", "Estimated cost per parse in USD", MODEL_LABELS, COST_BUCKETS_USD
+)
+MODEL_RESULTS = registry.counter(
+    "resume_model_results_total", "Successful model parses", MODEL_LABELS + ("cache_hit",)
+)
+MODEL_ERRORS = registry.counter("resume_model_errors_total", "Failed model parses", MODEL_LABELS)
+MODEL_RATE_LIMITED = registry.counter(
+    "resume_model_rate_limited_total", "429 responses that were re-queued by the rate limiter", MODEL_LABELS
+)
+MODEL_TRANSIENT_RETRIES = registry.counter(
+    "resume_model_transient_retries_total", "5xx, timeout and connection failures that were retried", MODEL_LABELS
+)
+MODEL_JSON_RECOVERIES = registry.counter(
+    "resume_model_json_recovered_total",
+    "Model outputs whose JSON was extracted from surrounding text or repaired after a max_tokens cutoff",
+    ("provider", "model", "method"),
+)
+HF_PROVIDER_FALLBACKS = registry.counter(
+    "resume_hf_provider_fallbacks_total",
+    "Hugging Face inference provider attempts that failed and fell through to the next provider",
+    ("model", "inference_provider"),
+)
+HF_HEDGES = registry.counter(
+    "resume_hf_hedges_total",
+    "Hedged Hugging Face attempts started because the running provider was slow",
+    ("model", "inference_provider"),
+)
+CASCADE_REQUESTS = registry.counter(
+    "resume_cascade_requests_total",
+    "Cheap-first cascade parses by the tier that answered and why the cheap tier was escalated",
+    ("tier", "reason"),
+)
+CASCADE_COST_USD = registry.counter(
+    "resume_cascade_cost_usd_total",
+    "Cascade cost in USD: spent on both tiers, and the estimate for running only the expensive models",
+    ("kind",),
+)
+RULE_FALLBACKS = registry.counter(
+    "resume_rule_fallbacks_total", "Requests answered by the rule-based fallback after every model failed"
+)
+
+
+def render_metrics() -> str:
+    return registry.render()
@@ -0,0 +1,311 @@
+import os
+import re
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger("uvicorn.error")
+
+# Default number of in-flight model calls allowed per provider+model in this worker
+DEFAULT_PROVIDER_CONCURRENCY = {
+    "openai": 16,
+    "huggingface": 8,
+    "gemini": 8,
+}
+
+# Assumed completion size when reserving tokens against a TPM budget before the call
+DEFAULT_OUTPUT_TOKEN_ESTIMATE = 1500
+
+# Wait applied after a 429 without a usable Retry-After header
+DEFAULT_RATE_LIMIT_BACKOFF_SECONDS = 2.0
+
+# Retries of transient failures (5xx, timeouts, dropped connections): the first waits
+# TRANSIENT_RETRY_BASE_SECONDS, each later one twice as long, up to TRANSIENT_RETRY_MAX_SECONDS
+TRANSIENT_RETRY_BASE_SECONDS = 0.5
+TRANSIENT_RETRY_MAX_SECONDS = 8.0
+TRANSIENT_STATUS_CODES = {408, 500, 502, 503, 504}
+# Exception types (matched by name anywhere in the cause chain) for timeouts and connection failures
+# in httpx and the provider SDKs, none of which need importing here
+TRANSIENT_EXCEPTION_NAMES = {
+    "TimeoutException",
+    "TransportError",
+    "ConnectError",
+    "ReadError",
+    "RemoteProtocolError",
+    "APIConnectionError",
+    "APITimeoutError",
+    "TimeoutError",
+}
+
+
+def _env_for(name: str, provider: str, model_name: Optional[str] = None) -> Optional[str]:
+    """Look up NAME_<PROVIDER>_<MODEL>, then NAME_<PROVIDER>, then NAME."""
+    candidates = []
+    if model_name:
+        model_key = re.sub(r"[^A-Za-z0-9]+", "_", model_name).upper()
+        candidates.append(f"{name}_{provider.upper()}_{model_key}")
+    candidates.extend([f"{name}_{provider.upper()}", name])
+    for key in candidates:
+        value = os.getenv(key)
+        if value:
+            return value
+    return None
+
+
+def provider_concurrency(provider: str, model_name: Optional[str] = None) -> int:
+    """
+    Concurrency ceiling for a provider, overridable with PROVIDER_CONCURRENCY_<PROVIDER>
+    (e.g. PROVIDER_CONCURRENCY_OPENAI=32) or PROVIDER_CONCURRENCY_<PROVIDER>_<MODEL>.
+    """
+    env_value = _env_for("PROVIDER_CONCURRENCY", provider, model_name)
+    if env_value:
+        return max(1, int(env_value))
+    return DEFAULT_PROVIDER_CONCURRENCY.get(provider, 8)
+
+
+def _parse_reset_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse OpenAI-style reset durations ('1s', '6m0s', '250ms') or plain seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    matched = False
+    for amount, unit in re.findall(r"([\d.]+)(ms|h|m|s)", value):
+        matched = True
+        amount = float(amount)
+        total += {"ms": amount / 1000.0, "s": amount, "m": amount * 60, "h": amount * 3600}[unit]
+    return total if matched else None
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at capacity per minute."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be taken (0 if available now). Oversized requests wait for a full bucket."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        """Consume amount (negative refunds); may go below zero so overspend delays later callers."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - min(amount, self.capacity))
+
+    def clamp(self, remaining: float) -> None:
+        """Never believe we have more budget than the provider says is left."""
+        self._refill()
+        self.tokens = min(self.tokens, float(remaining))
+
+
+class ProviderLimiter:
+    """
+    Per provider+model admission control:
+    - RPM and TPM token buckets (from RATE_LIMIT_RPM_* / RATE_LIMIT_TPM_* env vars, unlimited if unset)
+    - an AIMD concurrency limit: halved on every 429, grown by ~1 per limit successful calls
+    - a pause window from Retry-After / x-ratelimit-reset-* headers when the provider reports exhaustion
+
+    Callers that cannot be admitted yet are queued instead of failing.
+    """
+
+    def __init__(self, provider: str, model_name: str):
+        self.provider = provider
+        self.model_name = model_name
+        self.max_concurrency = provider_concurrency(provider, model_name)
+        self.concurrency_limit = float(self.max_concurrency)
+        rpm = _env_for("RATE_LIMIT_RPM", provider, model_name)
+        tpm = _env_for("RATE_LIMIT_TPM", provider, model_name)
+        self.requests = TokenBucket(float(rpm)) if rpm else None
+        self.tokens = TokenBucket(float(tpm)) if tpm else None
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.waiting = 0
+        self.rate_limited = 0
+        self.admitted = 0
+        self._condition = asyncio.Condition()
+
+    def _admission_wait(self, estimated_tokens: int) -> float:
+        """0 if a call can start now, otherwise seconds to wait (or a short poll when concurrency-bound)."""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= max(1, int(self.concurrency_limit)):
+            return 1.0  # woken early by release()
+        waits = [0.0]
+        if self.requests:
+            waits.append(self.requests.wait_time(1))
+        if self.tokens:
+            waits.append(self.tokens.wait_time(estimated_tokens))
+        return max(waits)
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int):
+        async with self._condition:
+            self.waiting += 1
+            try:
+                while True:
+                    wait = self._admission_wait(estimated_tokens)
+                    if wait <= 0:
+                        break
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self.waiting -= 1
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(estimated_tokens)
+            self.in_flight += 1
+            self.admitted += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def settle_tokens(self, reserved: int, used: int) -> None:
+        """Replace the pre-call token reservation with the provider-reported usage."""
+        if self.tokens:
+            self.tokens.take(used - reserved)
+
+    def on_success(self) -> None:
+        # Additive increase: about +1 to the limit per `limit` successful calls
+        if self.concurrency_limit < self.max_concurrency:
+            self.concurrency_limit = min(
+                float(self.max_concurrency), self.concurrency_limit + 1.0 / max(1.0, self.concurrency_limit)
+            )
+
+    def on_rate_limited(self, retry_after: Optional[float]) -> None:
+        # Multiplicative decrease and a pause so queued callers do not stampede the provider
+        self.rate_limited += 1
+        self.concurrency_limit = max(1.0, self.concurrency_limit / 2.0)
+        pause = retry_after if retry_after is not None else DEFAULT_RATE_LIMIT_BACKOFF_SECONDS
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+        logger.warning(
+            "Rate limited by %s/%s: concurrency limit now %.1f, pausing %.1fs",
+            self.provider,
+            self.model_name,
+            self.concurrency_limit,
+            pause,
+        )
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """Sync budgets with x-ratelimit-* response headers (OpenAI and compatible providers)."""
+        if not headers:
+            return
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            if remaining is None:
+                continue
+            try:
+                remaining_value = float(remaining)
+            except ValueError:
+                continue
+            if bucket is not None:
+                bucket.clamp(remaining_value)
+            if remaining_value <= 0:
+                reset = _parse_reset_seconds(headers.get(f"x-ratelimit-reset-{kind}"))
+                if reset:
+                    self.paused_until = max(self.paused_until, time.monotonic() + reset)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "model_name": self.model_name,
+            "concurrency_limit": round(self.concurrency_limit, 2),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.waiting,
+            "rpm_limit": self.requests.capacity if self.requests else None,
+            "rpm_available": round(self.requests.tokens, 1) if self.requests else None,
+            "tpm_limit": self.tokens.capacity if self.tokens else None,
+            "tpm_available": round(self.tokens.tokens, 1) if self.tokens else None,
+            "paused_for_seconds": round(max(0.0, self.paused_until - time.monotonic()), 2),
+            "rate_limited": self.rate_limited,
+            "admitted": self.admitted,
+        }
+
+
+_limiters: Dict[Tuple[str, str], ProviderLimiter] = {}
+
+
+def get_rate_limiter(provider: str, model_name: str) -> ProviderLimiter:
+    """Shared limiter for a provider+model, used by single, batch, streaming and background parses."""
+    key = (provider.lower(), model_name.lower())
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = ProviderLimiter(key[0], model_name)
+        _limiters[key] = limiter
+    return limiter
+
+
+def rate_limiter_stats() -> list:
+    return [limiter.stats() for limiter in _limiters.values()]
+
+
+def rate_limit_retry_after(exc: BaseException) -> Optional[Tuple[Optional[float], Optional[Mapping[str, str]]]]:
+    """
+    If exc (or anything in its cause chain) is an HTTP 429, return (retry_after_seconds, headers).
+    Works for openai.RateLimitError, httpx.HTTPStatusError and huggingface_hub HTTP errors.
+    """
+    seen = set()
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        response = getattr(current, "response", None)
+        status = getattr(current, "status_code", None) or getattr(response, "status_code", None)
+        if status == 429:
+            headers = getattr(response, "headers", None)
+            retry_after = None
+            if headers is not None:
+                retry_after = _parse_reset_seconds(headers.get("retry-after")) or _parse_reset_seconds(
+                    headers.get("x-ratelimit-reset-requests")
+                )
+            return retry_after, headers
+        current = current.__cause__ or current.__context__
+    return None
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """
+    True if exc (or anything in its cause chain) is a failure worth retrying as is: a 408 or 5xx
+    response, a timeout or a connection error. 429s are not included; see rate_limit_retry_after.
+    """
+    seen = set()
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        response = getattr(current, "response", None)
+        status = getattr(current, "status_code", None) or getattr(response, "status_code", None)
+        if status in TRANSIENT_STATUS_CODES:
+            return True
+        if any(cls.__name__ in TRANSIENT_EXCEPTION_NAMES for cls in type(current).__mro__):
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+def transient_retry_delay(attempt: int) -> float:
+    """Seconds to wait before retry number attempt (0-based) of a transient failure."""
+    return min(TRANSIENT_RETRY_MAX_SECONDS, TRANSIENT_RETRY_BASE_SECONDS * (2**attempt))
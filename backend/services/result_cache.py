@@ -0,0 +1,261 @@
+import os
+import re
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("uvicorn.error")
+
+DEFAULT_CACHE_MAX_ENTRIES = 1000
+DEFAULT_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+
+# Bumped whenever the key derivation changes, so entries stored under the old scheme are not served
+KEY_VERSION = "2"
+
+
+def _normalize_for_key(text: str) -> str:
+    # Whitespace differences between extractions of the same file should not miss the cache. Case is
+    # kept: names, acronyms and emails differ only by case, and models extract them as written.
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def prompt_version(prompt: str) -> str:
+    """Short stable fingerprint of a prompt so prompt edits invalidate cached results."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+
+
+def make_cache_key(
+    text: str,
+    provider: str,
+    model_name: str,
+    inference_provider: Optional[str],
+    prompt: str,
+) -> str:
+    """
+    Content-addressed key: normalized resume text + model spec + prompt version.
+    """
+    text_hash = hashlib.sha256(_normalize_for_key(text).encode("utf-8")).hexdigest()
+    spec_part = "|".join(
+        [
+            provider.lower(),
+            model_name.lower(),
+            (inference_provider or "").lower(),
+            prompt_version(prompt),
+        ]
+    )
+    return f"v{KEY_VERSION}:{text_hash}:{spec_part}"
+
+
+class ResultCache:
+    """
+    Base class for parse result caches. Values are JSON documents (serialized ParsedModelResult),
+    so a hit is validated straight from the string and nothing is re-encoded on store.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES, ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._set(key, value)
+
+    def _get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def size(self) -> int:
+        raise NotImplementedError
+
+    def _expired(self, stored_at: float) -> bool:
+        return bool(self.ttl_seconds) and (time.time() - stored_at) > self.ttl_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend_name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "size": self.size(),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    backend_name = "base"
+
+
+class MemoryResultCache(ResultCache):
+    """In-process LRU cache with TTL expiry."""
+
+    backend_name = "memory"
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES, ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS):
+        super().__init__(max_entries, ttl_seconds)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self._expired(stored_at):
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResultCache(ResultCache):
+    """
+    On-disk cache so results survive restarts and are shared by workers on the same host.
+    Eviction is least-recently-accessed once max_entries is exceeded.
+    """
+
+    backend_name = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+    ):
+        super().__init__(max_entries, ttl_seconds)
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parse_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_parse_cache_accessed ON parse_cache(accessed_at)")
+        self._conn.commit()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM parse_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if self._expired(stored_at):
+                self._conn.execute("DELETE FROM parse_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.evictions += 1
+                return None
+            self._conn.execute("UPDATE parse_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return value
+
+    def _set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.ttl_seconds:
+                cur = self._conn.execute("DELETE FROM parse_cache WHERE stored_at < ?", (now - self.ttl_seconds,))
+                self.evictions += max(cur.rowcount, 0)
+            if self.max_entries:
+                cur = self._conn.execute(
+                    "DELETE FROM parse_cache WHERE key IN ("
+                    " SELECT key FROM parse_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self.evictions += max(cur.rowcount, 0)
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM parse_cache")
+            self._conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_initialized = False
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Lazy initialization of the process-wide parse result cache.
+    PARSE_CACHE_BACKEND selects 'memory' (default), 'sqlite' or 'none'.
+    """
+    global _result_cache, _result_cache_initialized
+    if _result_cache_initialized:
+        return _result_cache
+
+    backend = os.getenv("PARSE_CACHE_BACKEND", "memory").strip().lower()
+    max_entries = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", str(DEFAULT_CACHE_MAX_ENTRIES)))
+    ttl_seconds = float(os.getenv("PARSE_CACHE_TTL_SECONDS", str(DEFAULT_CACHE_TTL_SECONDS)))
+
+    if backend in ("none", "off", "disabled", ""):
+        _result_cache = None
+    elif backend == "sqlite":
+        path = os.getenv("PARSE_CACHE_PATH", "/tmp/resume_parser_cache.sqlite3")
+        _result_cache = SQLiteResultCache(path, max_entries=max_entries, ttl_seconds=ttl_seconds)
+    elif backend == "memory":
+        _result_cache = MemoryResultCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    else:
+        raise ValueError(f"Unsupported PARSE_CACHE_BACKEND '{backend}'. Use memory, sqlite or none.")
+
+    logger.info("Parse result cache backend=%s", _result_cache.backend_name if _result_cache else "disabled")
+    _result_cache_initialized = True
+    return _result_cache
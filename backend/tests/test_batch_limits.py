@@ -0,0 +1,68 @@
+import io
+import zipfile
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import main
+
+
+def _zip(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in entries.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def no_member_reads(monkeypatch):
+    def _read(self, *args, **kwargs):
+        raise AssertionError("zip member read before the limits were checked")
+
+    monkeypatch.setattr(zipfile.ZipFile, "read", _read)
+
+
+def test_zip_entry_count_checked_before_reading(no_member_reads):
+    archive = _zip({f"cv{i}.txt": "x" for i in range(4)})
+
+    with pytest.raises(HTTPException) as excinfo:
+        main._expand_batch_upload("cvs.zip", archive, max_files=3)
+
+    assert excinfo.value.status_code == 413
+
+
+def test_zip_total_size_checked_before_reading(no_member_reads):
+    # Compresses to a few KB but declares 4 MB uncompressed
+    archive = _zip({"a.txt": b"0" * 2_000_000, "b.txt": b"0" * 2_000_000})
+
+    with pytest.raises(HTTPException) as excinfo:
+        main._expand_batch_upload("cvs.zip", archive, max_bytes=3_000_000)
+
+    assert excinfo.value.status_code == 413
+
+
+def test_zip_within_limits_is_expanded():
+    archive = _zip({"a.txt": "resume a", "notes.md": "skipped", "__MACOSX/a.txt": "skipped"})
+
+    assert main._expand_batch_upload("cvs.zip", archive) == [("cvs.zip:a.txt", b"resume a")]
+
+
+def test_oversized_direct_upload_is_rejected(monkeypatch):
+    monkeypatch.setattr(main, "BATCH_MAX_FILE_BYTES", 100)
+    client = TestClient(main.app)
+
+    response = client.post("/api/parse/batch", files=[("files", ("big.txt", b"x" * 101, "text/plain"))])
+
+    assert response.status_code == 413
+
+
+def test_batch_total_bytes_enforced(monkeypatch):
+    monkeypatch.setattr(main, "BATCH_MAX_TOTAL_BYTES", 150)
+    client = TestClient(main.app)
+    files = [("files", (f"cv{i}.txt", b"x" * 60, "text/plain")) for i in range(3)]
+
+    response = client.post("/api/parse/batch", files=files)
+
+    assert response.status_code == 413
@@ -0,0 +1,57 @@
+import asyncio
+
+from models.resume_models import ContactInfo, ModelProvider, ParsedModelResult, ResumeData, TokenUsage
+from parsers import resume_parser
+
+EXPENSIVE = resume_parser.parse_model_string("openai:gpt-4o")
+TEXT = "Jane Doe\njane@example.com\n+1 415 555 0100\n" + "Experience and education details. " * 100
+
+
+def _cheap_result(cache_hit=False, usage=None):
+    resume = ResumeData(
+        contact_info=ContactInfo(name="Jane Doe", email="jane@example.com", phone="+1 415 555 0100"),
+        experience=[{"company": "Acme", "title": "Engineer"}],
+        education=[{"institution": "MIT", "degree": "BSc"}],
+        skills=[{"name": "Python"}],
+    )
+    return ParsedModelResult(
+        provider=ModelProvider.HUGGINGFACE,
+        model_name="openai/gpt-oss-120b",
+        resume=resume,
+        cost_usd=0.0 if cache_hit else 0.0001,
+        usage=usage,
+        raw_response={"padding": "x" * 50_000},
+        cache_hit=cache_hit,
+    )
+
+
+def _run_cascade(monkeypatch, cheap):
+    # Accept the cheap answer: these tests are about its cost accounting, not the quality gates
+    monkeypatch.setenv("CASCADE_MIN_CONFIDENCE", "0")
+    monkeypatch.setenv("CASCADE_MIN_COMPLETENESS", "0")
+    async def parse_with_model(text, spec, use_cache=True, sectioned=None):
+        return cheap
+
+    monkeypatch.setattr(resume_parser, "parse_with_model", parse_with_model)
+    return asyncio.run(resume_parser.parse_with_cascade(TEXT, [EXPENSIVE]))
+
+
+def test_cache_hit_on_cheap_tier_saves_nothing(monkeypatch):
+    results, _, report = _run_cascade(monkeypatch, _cheap_result(cache_hit=True))
+
+    assert results[0].cache_hit
+    assert report.expensive_cost_usd is None
+    assert report.cost_saved_usd == 0.0
+
+
+def test_estimate_without_usage_comes_from_input_length(monkeypatch):
+    _, _, report = _run_cascade(monkeypatch, _cheap_result(usage=None))
+
+    usage = TokenUsage(
+        prompt_tokens=resume_parser._estimate_tokens_from_text(resume_parser.EXTRACTION_PROMPT)
+        + resume_parser._estimate_tokens_from_text(resume_parser._user_message(TEXT)),
+        completion_tokens=resume_parser.DEFAULT_OUTPUT_TOKEN_ESTIMATE,
+    )
+    expected = resume_parser._estimate_cost("openai", "gpt-4o", None, usage)
+    assert report.expensive_cost_usd == expected
+    assert report.cost_saved_usd == round(expected - 0.0001, 6)
@@ -0,0 +1,78 @@
+import anyio
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from services import compression
+from services.compression import CompressionMiddleware
+
+LARGE = {"items": ["resume"] * 20_000}
+
+
+async def _small(request):
+    return JSONResponse({"ok": True})
+
+
+async def _large(request):
+    return JSONResponse(LARGE)
+
+
+async def _binary(request):
+    return Response(b"\0" * 4096, media_type="application/octet-stream")
+
+
+async def _events(request):
+    return PlainTextResponse("x" * 4096, media_type="text/event-stream")
+
+
+def _client(**settings):
+    app = Starlette(
+        routes=[
+            Route("/small", _small),
+            Route("/large", _large),
+            Route("/binary", _binary),
+            Route("/events", _events),
+        ]
+    )
+    return TestClient(CompressionMiddleware(app, encodings=("gzip",), **settings))
+
+
+def test_vary_is_set_even_when_not_compressed():
+    client = _client()
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    refused = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    for response in (small, refused):
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_non_text_responses_are_left_alone():
+    client = _client()
+
+    for path in ("/binary", "/events"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert "vary" not in response.headers
+
+
+def test_large_bodies_are_compressed_in_a_thread(monkeypatch):
+    offloaded = []
+    run_sync = anyio.to_thread.run_sync
+
+    async def recording_run_sync(func, *args, **kwargs):
+        offloaded.append(len(args[0]))
+        return await run_sync(func, *args, **kwargs)
+
+    monkeypatch.setattr(compression.anyio.to_thread, "run_sync", recording_run_sync)
+    client = _client(thread_min_size=64 * 1024)
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == LARGE
+    assert offloaded and offloaded[0] >= 64 * 1024
+    client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert len(offloaded) == 1
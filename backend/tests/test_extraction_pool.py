@@ -0,0 +1,78 @@
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from services.extraction_pool import ExtractionPool
+
+
+class SleepingPool(ExtractionPool):
+    """Runs time.sleep(source) in the pool's workers instead of extracting a document."""
+
+    async def _run_extraction(self, source, file_ext):
+        await self._run_on_worker(time.sleep, source)
+        return "text"
+
+
+def _live_workers() -> int:
+    return len(multiprocessing.active_children())
+
+
+def test_timeouts_do_not_leak_worker_processes():
+    pool = SleepingPool(pool_size=1, queue_depth=4, timeout_seconds=0.5, max_jobs_per_worker=100)
+
+    async def run():
+        for _ in range(3):
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.extract(60, ".pdf")
+        text, _ = await pool.extract(0, ".pdf")
+        assert text == "text"
+
+    try:
+        asyncio.run(run())
+        deadline = time.monotonic() + 10
+        while _live_workers() > pool.pool_size and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert _live_workers() <= pool.pool_size
+        assert pool.stats()["timeouts"] == 3
+        assert pool.stats()["workers_terminated"] == 3
+    finally:
+        pool.shutdown()
+
+
+def test_queued_jobs_do_not_time_out_behind_busy_workers():
+    pool = SleepingPool(pool_size=2, queue_depth=8, timeout_seconds=1.0, max_jobs_per_worker=100)
+
+    async def run():
+        # Six 0.7s jobs on two workers take ~2.1s in total, but no single job runs for a second
+        return await asyncio.gather(*[pool.extract(0.7, ".pdf", block=True) for _ in range(6)])
+
+    try:
+        results = asyncio.run(run())
+        assert [text for text, _ in results] == ["text"] * 6
+        assert pool.stats()["timeouts"] == 0
+        assert pool.stats()["workers_terminated"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_timeout_terminates_only_the_stuck_worker():
+    pool = SleepingPool(pool_size=2, queue_depth=4, timeout_seconds=1.0, max_jobs_per_worker=100)
+
+    async def run():
+        stuck = asyncio.create_task(pool.extract(60, ".pdf"))
+        await asyncio.sleep(0.5)
+        # Running on the other worker when the stuck job's timeout expires
+        healthy = asyncio.create_task(pool.extract(0.9, ".pdf"))
+        with pytest.raises(asyncio.TimeoutError):
+            await stuck
+        text, _ = await healthy
+        assert text == "text"
+
+    try:
+        asyncio.run(run())
+        assert pool.stats()["timeouts"] == 1
+        assert pool.stats()["workers_terminated"] == 1
+    finally:
+        pool.shutdown()
@@ -0,0 +1,69 @@
+import asyncio
+
+from parsers import resume_parser
+
+
+class _Response:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _GeminiStub:
+    """Answers cachedContents creation and generateContent, rejecting cached handles with a 404."""
+
+    def __init__(self):
+        self.created = 0
+        self.generate_urls = []
+
+    async def post(self, url, headers=None, json=None):
+        await asyncio.sleep(0.01)
+        if "/cachedContents" in url:
+            self.created += 1
+            return _Response(200, {"name": f"cachedContents/{self.created}"})
+        self.generate_urls.append(url)
+        if "cachedContent" in json:
+            return _Response(404, {})
+        return _Response(200, {"candidates": [{"content": {"parts": [{"text": '{"contact_info": {}}'}]}}]})
+
+
+def _use_stub(monkeypatch):
+    stub = _GeminiStub()
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(resume_parser, "GEMINI_CACHE_PARENT", "projects/p/locations/europe-west4")
+    monkeypatch.setattr(resume_parser, "get_http_client", lambda name: stub)
+    monkeypatch.setattr(resume_parser, "_gemini_cached_contents", {})
+    monkeypatch.setattr(resume_parser, "_gemini_cache_locks", {})
+    return stub
+
+
+def test_concurrent_cold_calls_create_one_cache(monkeypatch):
+    stub = _use_stub(monkeypatch)
+
+    async def run():
+        return await asyncio.gather(
+            *[resume_parser._gemini_cached_content("gemini-2.0-flash", "prompt", "test-key") for _ in range(5)]
+        )
+
+    assert asyncio.run(run()) == ["cachedContents/1"] * 5
+    assert stub.created == 1
+
+
+def test_rejected_cache_is_not_recreated_per_call(monkeypatch):
+    stub = _use_stub(monkeypatch)
+
+    async def run():
+        for _ in range(3):
+            await resume_parser._call_gemini("resume", "gemini-2.0-flash", "prompt")
+
+    asyncio.run(run())
+    assert stub.created == 1
+    regional = f"{resume_parser.GEMINI_API_BASE}/v1/projects/p/locations/europe-west4/publishers/google/models/"
+    assert stub.generate_urls and all(url.startswith(regional) for url in stub.generate_urls)
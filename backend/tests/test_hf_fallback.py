@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from parsers import resume_parser
+from services.provider_limits import rate_limit_retry_after
+
+MODEL = "meta-llama/Llama-3.1-8B-Instruct"
+
+
+class _Response:
+    def __init__(self, status_code, headers):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = _Response(status_code, headers or {})
+
+
+def _failing_attempts(monkeypatch, statuses):
+    remaining = list(statuses)
+
+    async def attempt(text, model_name, provider, on_delta=None, prompt=None):
+        status = remaining.pop(0) if remaining else statuses[-1]
+        try:
+            raise _HTTPError(status, {"retry-after": "7"})
+        except _HTTPError as e:
+            raise ValueError(f"Hugging Face chat completion failed: {e}") from e
+
+    monkeypatch.setattr(resume_parser, "_timed_hf_attempt", attempt)
+
+
+@pytest.mark.parametrize("hedge_mode", ["off", "fixed"])
+def test_all_candidates_rate_limited_keeps_the_429(monkeypatch, hedge_mode):
+    monkeypatch.setenv("HUGGINGFACE_HEDGE_MODE", hedge_mode)
+    _failing_attempts(monkeypatch, [429])
+
+    with pytest.raises(ValueError) as excinfo:
+        asyncio.run(resume_parser._call_huggingface("text", MODEL))
+
+    retry_after, _ = rate_limit_retry_after(excinfo.value)
+    assert retry_after == 7
+
+
+@pytest.mark.parametrize("hedge_mode", ["off", "fixed"])
+def test_hard_failure_is_not_reported_as_rate_limited(monkeypatch, hedge_mode):
+    monkeypatch.setenv("HUGGINGFACE_HEDGE_MODE", hedge_mode)
+    _failing_attempts(monkeypatch, [400, 429])
+
+    with pytest.raises(ValueError) as excinfo:
+        asyncio.run(resume_parser._call_huggingface("text", MODEL))
+
+    assert rate_limit_retry_after(excinfo.value) is None
@@ -0,0 +1,18 @@
+import pytest
+
+from services.http_clients import install_hf_client_factory
+
+huggingface_hub = pytest.importorskip("huggingface_hub")
+
+
+def test_hf_async_clients_use_pool_limits(monkeypatch):
+    monkeypatch.setenv("HTTP_POOL_MAX_CONNECTIONS_HUGGINGFACE", "7")
+    monkeypatch.setenv("HTTP_POOL_MAX_KEEPALIVE_HUGGINGFACE", "3")
+
+    assert install_hf_client_factory()
+    client = huggingface_hub.get_async_session()
+
+    pool = client._transport._pool
+    assert (pool._max_connections, pool._max_keepalive_connections) == (7, 3)
+    # The library's own request/response hooks are kept
+    assert client.event_hooks["response"]
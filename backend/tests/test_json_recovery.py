@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from parsers.json_recovery import EXACT, EXTRACTED, REPAIRED, recover_json_object
+from parsers.resume_parser import _json_to_resume
+
+RESUME = {
+    "contact_info": {"name": "Jane Roe", "email": "jane@example.com"},
+    "education": [{"degree": "BS", "institution": "UCLA", "graduation_year": 2011}],
+    "experience": [{"company": "Acme", "position": "Engineer", "achievements": ["Cut latency by 30%."]}],
+    "skills": [{"name": "Python", "category": "Technical"}, {"name": "Go", "category": "Technical"}],
+    "summary": "Backend engineer.",
+}
+
+
+def test_exact_and_fenced_output():
+    content = json.dumps(RESUME)
+    assert recover_json_object(content) == (RESUME, EXACT)
+    assert recover_json_object(f"```json\n{content}\n```") == (RESUME, EXACT)
+
+
+def test_object_inside_prose_and_think_block():
+    content = f"<think>Looks like {{a resume}}.</think>Here it is: {json.dumps(RESUME)}\nDates are {{approximate}}."
+    assert recover_json_object(content) == (RESUME, EXTRACTED)
+
+
+def test_cut_inside_list_item_drops_the_item():
+    content = json.dumps(RESUME)
+    cut = content.index('"name": "Go"') + len('"name": "G')
+    value, how = recover_json_object(content[:cut])
+    assert how == REPAIRED
+    assert value["skills"] == [{"name": "Python", "category": "Technical"}]
+    _json_to_resume(value)
+
+
+def test_cut_before_required_field_drops_the_item():
+    content = '{"contact_info": {"name": "Jane Roe"}, "skills": [{"name": "Python"}, {"category": "Technical",'
+    value, _ = recover_json_object(content)
+    assert value["skills"] == [{"name": "Python"}]
+    _json_to_resume(value)
+
+
+def test_cut_inside_number_drops_the_number():
+    content = '{"contact_info": {"name": "Jane Roe"}, "total_experience_years": 12, "education": [{"degree": "BS", "graduation_year": 20'
+    value, how = recover_json_object(content)
+    assert how == REPAIRED
+    assert value["total_experience_years"] == 12
+    assert value["education"] == []
+
+
+def test_cut_after_a_backslash_drops_the_string():
+    content = '{"contact_info": {"name": "Jane Roe"}, "summary": "Built the \\'
+    value, how = recover_json_object(content)
+    assert how == REPAIRED
+    assert value == {"contact_info": {"name": "Jane Roe"}}
+
+
+def test_every_cut_point_validates():
+    resume = {**RESUME, "summary": 'Led the "Atlas" migration (C:\\data\\atlas).\nBackend engineer.'}
+    content = json.dumps(resume, indent=2)
+    for cut in range(content.index('"education"'), len(content) - 1):
+        value, _ = recover_json_object(content[:cut])
+        _json_to_resume(value)
+
+
+def test_no_object():
+    with pytest.raises(ValueError):
+        recover_json_object("I could not parse this resume {sorry}.")
@@ -0,0 +1,72 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from models.resume_models import TokenUsage
+from parsers import resume_parser
+from services import provider_limits
+
+
+def _status_error(status_code):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status_code, request=request)
+    return openai.APIStatusError(f"HTTP {status_code}", response=response, body=None)
+
+
+def _answers(monkeypatch, *outcomes):
+    calls = []
+    remaining = list(outcomes)
+
+    async def call_openai(text, model_name, on_delta=None, prompt=None):
+        calls.append(model_name)
+        outcome = remaining.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome, TokenUsage(prompt_tokens=10, completion_tokens=10)
+
+    monkeypatch.setattr(resume_parser, "_call_openai", call_openai)
+    monkeypatch.setattr(provider_limits, "TRANSIENT_RETRY_BASE_SECONDS", 0.01)
+    return calls
+
+
+def _parse():
+    spec = resume_parser.parse_model_string("openai:gpt-4o")
+    return asyncio.run(resume_parser.parse_with_model("resume text", spec, use_cache=False, sectioned=False))
+
+
+def test_503_then_success_still_parses(monkeypatch):
+    calls = _answers(monkeypatch, _status_error(503), {"contact_info": {"name": "Jane Doe"}})
+
+    result = _parse()
+
+    assert result.resume.contact_info.name == "Jane Doe"
+    assert len(calls) == 2
+
+
+def test_connection_errors_are_retried(monkeypatch):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    calls = _answers(
+        monkeypatch, openai.APIConnectionError(request=request), {"contact_info": {"name": "Jane Doe"}}
+    )
+
+    assert _parse().resume.contact_info.name == "Jane Doe"
+    assert len(calls) == 2
+
+
+def test_client_errors_are_not_retried(monkeypatch):
+    calls = _answers(monkeypatch, _status_error(400), {"contact_info": {"name": "Jane Doe"}})
+
+    with pytest.raises(openai.APIStatusError):
+        _parse()
+    assert len(calls) == 1
+
+
+def test_transient_retries_are_bounded(monkeypatch):
+    monkeypatch.setenv("TRANSIENT_MAX_RETRIES", "2")
+    calls = _answers(monkeypatch, *[_status_error(502) for _ in range(4)])
+
+    with pytest.raises(openai.APIStatusError):
+        _parse()
+    assert len(calls) == 3
@@ -0,0 +1,13 @@
+from fastapi.testclient import TestClient
+
+import main
+from services import metrics
+
+
+def test_failed_parse_requests_are_timed():
+    client = TestClient(main.app)
+
+    response = client.post("/api/parse", files={"file": ("resume.exe", b"binary", "application/octet-stream")})
+
+    assert response.status_code == 400
+    assert 'resume_parse_request_seconds_count{file_type=".exe",status="400"} 1' in metrics.render_metrics()
@@ -0,0 +1,41 @@
+import asyncio
+
+from models.resume_models import TokenUsage
+from parsers import resume_parser
+from services.result_cache import MemoryResultCache, make_cache_key
+
+
+def _key(text):
+    return make_cache_key(text, "openai", "gpt-4o", None, "prompt")
+
+
+def test_whitespace_differences_share_a_key():
+    assert _key("Jane Doe\n\n  jane@example.com ") == _key("Jane Doe jane@example.com")
+
+
+def test_case_differences_get_their_own_key():
+    assert _key("Skills: SQL, AWS") != _key("skills: sql, aws")
+
+
+def test_truncated_results_are_not_cached(monkeypatch):
+    cache = MemoryResultCache(max_entries=10, ttl_seconds=60)
+    answers = [
+        '{"contact_info": {"name": "Jane Doe"}, "skills": [{"name": "Python"}, {"na',
+        '{"contact_info": {"name": "Jane Doe"}, "skills": [{"name": "Python"}, {"name": "Go"}]}',
+    ]
+
+    async def call_provider(spec, text, prompt, on_delta=None):
+        parsed = resume_parser._loads_model_json(answers.pop(0), "openai", spec.model_name)
+        return parsed, TokenUsage(prompt_tokens=10, completion_tokens=10), 5
+
+    monkeypatch.setattr(resume_parser, "get_result_cache", lambda: cache)
+    monkeypatch.setattr(resume_parser, "_call_provider", call_provider)
+    spec = resume_parser.parse_model_string("openai:gpt-4o")
+
+    async def run():
+        return [await resume_parser.parse_with_model("resume text", spec, sectioned=False) for _ in range(3)]
+
+    truncated, fresh, cached = asyncio.run(run())
+    assert truncated.resume.output_truncated and not truncated.cache_hit
+    assert not fresh.cache_hit and len(fresh.resume.skills) == 2
+    assert cached.cache_hit and len(cached.resume.skills) == 2
@@ -0,0 +1,43 @@
+import pytest
+
+from parsers.resume_parser import parse_with_rules
+from parsers.rule_extractor import extract_city, extract_phone
+
+
+@pytest.mark.parametrize(
+    "header, city",
+    [
+        (["Jane Doe", "Austin, TX 78701"], "Austin"),
+        (["Jane Doe", "Berlin, Germany"], "Berlin"),
+        (["Jane Doe", "Boston, USA"], "Boston"),
+        # Any region is taken on a line that also carries contact details
+        (["Jane Doe", "Springfield, Somewhere | jane@example.com | +1 415 555 0100"], "Springfield"),
+    ],
+)
+def test_city_from_location_lines(header, city):
+    assert extract_city(header) == city
+
+
+@pytest.mark.parametrize(
+    "line",
+    ["Senior Engineer, Google", "Python, Django", "Acme Corp, Marketing Department", "Chicago, Illinois Tech"],
+)
+def test_word_comma_word_lines_are_not_cities(line):
+    assert extract_city(["Jane Doe", line]) is None
+
+
+def test_employment_dates_do_not_make_a_contact_line():
+    assert extract_city(["Jane Doe", "Senior Engineer, Google 2018 - 2021"]) is None
+
+
+def test_phone_after_a_date_range():
+    assert extract_phone("Acme 03/2018 - 05/2020\nPhone: 415-555-0100") == "415-555-0100"
+    assert extract_phone("Engineer, Acme 2018 - 2021") is None
+
+
+def test_rule_based_contact_info_skips_dates():
+    text = "Jane Doe\nAcme Corp, Widgets 2018 - 2021\nPhone: (415) 555-2671\n" + "Experience at Acme. " * 5
+    contact = parse_with_rules(text).resume.contact_info
+
+    assert contact.city is None
+    assert contact.phone == "(415) 555-2671"
@@ -0,0 +1,37 @@
+from parsers.resume_parser import TRUNCATED_OUTPUT_NOTE, _escalation_reason, _json_to_resume, _loads_model_json
+from parsers.section_chunker import SectionChunk, merge_section_results
+from models.resume_models import ModelProvider, ParsedModelResult
+
+
+def _chunks():
+    return [SectionChunk("profile", "..."), SectionChunk("experience", "..."), SectionChunk("education", "...")]
+
+
+def test_merge_keeps_distinct_notes_and_truncation():
+    cut = _loads_model_json('{"experience": [{"company": "Acme", "title": "Eng"}, {"comp', "mock", "m")
+    results = [
+        {"contact_info": {"name": "Ada"}, "extraction_notes": "No phone number found"},
+        cut,
+        {"education": [], "extraction_notes": "No phone number found"},
+    ]
+
+    merged = merge_section_results(_chunks(), results)
+
+    assert merged["output_truncated"] is True
+    assert merged["extraction_notes"] == f"No phone number found {TRUNCATED_OUTPUT_NOTE}"
+
+
+def test_truncation_escalates_even_with_the_models_own_notes():
+    cut = _loads_model_json('{"contact_info": {"name": "Ada"}, "extraction_notes": "Dates unclear", "skills": [', "m", "m")
+    resume = _json_to_resume(cut)
+    result = ParsedModelResult(provider=ModelProvider.OPENAI, model_name="m", resume=resume)
+
+    assert resume.output_truncated
+    assert resume.extraction_notes != TRUNCATED_OUTPUT_NOTE
+    assert _escalation_reason(result) == "truncated"
+
+
+def test_complete_output_is_not_flagged():
+    parsed = _loads_model_json('{"contact_info": {}, "output_truncated": true}', "m", "m")
+
+    assert parsed["output_truncated"] is False
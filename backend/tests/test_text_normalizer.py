@@ -0,0 +1,41 @@
+from parsers.text_normalizer import PAGE_BREAK, normalize_resume_text
+
+
+def _pdf_text(pages):
+    return PAGE_BREAK.join("\n".join(lines) for lines in pages)
+
+
+def test_date_ranges_at_page_edges_are_kept():
+    text = _pdf_text(
+        [
+            ["Jane Roe", "Senior Engineer, Acme", "2018 - 2020", "Built the billing platform.", "2018 - 2020"],
+            ["2015 - 2017", "Engineer, Globex", "Maintained the data pipeline.", "2015 - 2017"],
+        ]
+    )
+    normalized, report = normalize_resume_text(text, paged=True)
+    assert normalized.count("2018 - 2020") == 2
+    assert normalized.count("2015 - 2017") == 2
+    assert report.header_footer_lines_removed == 0
+
+
+def test_running_header_and_page_numbers_are_dropped():
+    text = _pdf_text(
+        [
+            ["Jane Roe - Page 1", "Summary", "Backend engineer.", "Confidential", "1"],
+            ["Jane Roe - Page 2", "Experience", "Acme, 2018 - 2020", "Page 2 of 2"],
+        ]
+    )
+    normalized, _ = normalize_resume_text(text, paged=True)
+    assert "Jane Roe - Page 2" not in normalized
+    assert "Jane Roe - Page 1" in normalized  # the first page keeps its header
+    assert "Page 2 of 2" not in normalized
+    assert "Confidential" not in normalized
+    assert "\n1\n" not in f"\n{normalized}\n"
+    assert "Acme, 2018 - 2020" in normalized
+
+
+def test_docx_table_numbers_are_kept():
+    text = "Skills\nPython\n5\nGo\n3\nKubernetes\n10\nResume\nReferences available upon request"
+    normalized, report = normalize_resume_text(text)
+    assert normalized.split("\n") == text.split("\n")
+    assert report.boilerplate_lines_removed == 0